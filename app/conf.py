@@ -20,11 +20,53 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DECIDER_LOG = "./decider.log"
     LOG_LEVEL = "INFO"
+    LOG_ASYNC = True  # log handlers (config/logging.json) are written to from a background thread, off requests
+    LOG_JSON = False  # one JSON object per line, with request_id / user_email / route_title fields
     START_QUESTION = "What is the adversary trying to do?"
     BASE_TECHNIQUE_ANSWER = (
         "There was **not enough context** to identify a sub-technique, but the **base technique still applies**."
     )
     WTF_CSRF_TIME_LIMIT = None
+    # response compression (app/utils/compression.py) - bodies under COMPRESS_MIN_SIZE bytes are sent as-is
+    COMPRESS_RESPONSES = True
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_CACHE_BYTES = 32 * 1024 * 1024
+    # fill caches (kiosk mode's answer card MiniSearch indexes) at startup - in the uWSGI master, shared by workers
+    WARM_CACHES = True
+    # DB connection pool of each worker process (app/utils/db/engine.py) - uWSGI runs 4 threads per worker
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 5
+    DB_POOL_TIMEOUT = 10  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = 30 * 60  # seconds before a connection is replaced
+    DB_POOL_PRE_PING = True  # test connections on checkout - rides out a Postgres restart
+    # Postgres limits set on each connection, in milliseconds (0 = none)
+    DB_STATEMENT_TIMEOUT = 0
+    DB_IDLE_IN_TRANSACTION_TIMEOUT = 0
+    # connecting through PgBouncer (transaction pooling) - the app-side pool is disabled, limits set per transaction
+    DB_PGBOUNCER = False
+    # seconds between pool statistics log lines (0 = never)
+    DB_POOL_STATS_INTERVAL = 5 * 60
+    # per-request SQL statement counting (app/utils/db/query_counter.py) - logged at DEBUG, over these as WARNING
+    QUERY_COUNTING = True
+    QUERY_BUDGET = 20  # statements in one request
+    QUERY_REPEAT_LIMIT = 5  # runs of the same statement in one request - a likely N+1 (lazy loads in a loop)
+    # Prometheus metrics (app/utils/metrics.py), served to the listed addresses / networks, or logged-in admins
+    METRICS_ENABLED = True
+    METRICS_PATH = "/metrics"
+    METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+    METRICS_DIR = None  # per-process metric files, shared by workers - None makes a temporary one at startup
+    METRICS_FLUSH_INTERVAL = 5  # seconds between writes of a worker's metric file
+    # slow query log (app/utils/db/slow_queries.py) - off unless a path is given, e.g. "./slow_queries.log"
+    SLOW_QUERY_LOG = None
+    SLOW_QUERY_THRESHOLD = 0.5  # seconds
+    SLOW_QUERY_EXPLAIN_SAMPLE = 0.1  # fraction of slow reads re-run under EXPLAIN (ANALYZE, BUFFERS) for a plan
+    SLOW_QUERY_EXPLAIN_TIMEOUT = 30 * 1000  # statement_timeout (ms) of the EXPLAIN connection
+    # on-demand request profiling (app/utils/profiler.py) - development / staging only
+    PROFILING_ENABLED = False
+    PROFILE_HEADER = "X-Decider-Profile"  # header, or query arg below, of "1" (cProfile) or "sampling" (pyinstrument)
+    PROFILE_QUERY_ARG = "_profile"
+    PROFILE_DIR = "./profiles"
+    PROFILE_WINDOW = 5 * 60  # seconds of each per-endpoint aggregate
 
 
 class DefaultConfig(Config):
@@ -53,6 +95,9 @@ class KioskConfig(Config):
     """
 
     KIOSK_MODE = True
+    # read-only page loads - nothing legitimate runs anywhere near this long
+    DB_STATEMENT_TIMEOUT = 15 * 1000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT = 60 * 1000
     SQLALCHEMY_DATABASE_URI = sqlalch.engine.URL.create(
         drivername="postgresql",
         username=DB_KIOSK_NAME,
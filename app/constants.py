@@ -1,4 +1,7 @@
 import os
 
 current_dir = os.path.dirname(os.path.realpath(__file__))
-BUILD_SOURCES_DIR = os.path.join(current_dir, "../config/build_sources")
+DEFAULT_BUILD_SOURCES_DIR = os.path.join(current_dir, "../config/build_sources")
+
+# build actions can be pointed at another sources dir (e.g. one from app.utils.db.actions.generate_sources)
+BUILD_SOURCES_DIR = os.getenv("BUILD_SOURCES_DIR", DEFAULT_BUILD_SOURCES_DIR)
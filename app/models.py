@@ -82,7 +82,7 @@ class AttackVersion(db.Model):
 class Platform(db.Model):
     uid = db.Column(db.Integer, primary_key=True, autoincrement=True)
     internal_name = db.Column(db.Text, nullable=False)  # ex: office_365 (space-free unique identifier for backend)
-    readable_name = db.Column(db.Text, nullable=False)  # ex: Office 365
+    readable_name = db.Column(db.Text, nullable=False, unique=True)  # ex: Office 365
 
 
 class Tactic(db.Model):
@@ -119,7 +119,7 @@ class Technique(db.Model):
 
 class Aka(db.Model):
     uid = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    term = db.Column(db.Text, nullable=False)
+    term = db.Column(db.Text, nullable=False, unique=True)
 
 
 class Blurb(db.Model):
@@ -188,6 +188,19 @@ class Cart(db.Model):
     cart_content = db.Column(EncryptedType(db.Text, CART_ENC_KEY, AesGcmEngine), nullable=False)
 
 
+class HeldCart(db.Model):
+    """A Cart set aside while its version is reinstalled (FULL_BUILD_MODE=reconcile / --resume) - rows are copied
+    as-is (still encrypted), and have no FKs, as their version is removed and re-added in the meantime
+    """
+
+    cart_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user = db.Column(db.Text, nullable=False)
+    attack_version = db.Column(db.Text, nullable=False)
+    last_modified = db.Column(db.DateTime, nullable=False)
+    cart_name = db.Column(db.Text, nullable=False)
+    cart_content = db.Column(db.Text, nullable=False)
+
+
 class DataSource(db.Model):
     uid = db.Column(db.Integer, primary_key=True, autoincrement=True)
     attack_version = db.Column(db.Text, db.ForeignKey("attack_version.version"), nullable=False)
@@ -205,3 +218,21 @@ class DataComponent(db.Model):
     parent_ds_id = db.Column(db.Text, nullable=False)
     internal_name = db.Column(db.Text, nullable=False)
     readable_name = db.Column(db.Text, nullable=False)
+
+
+class BuildCheckpoint(db.Model):
+    """A full_build stage that has completed (been committed), so a failed build can be resumed after it
+    stage : "tables", "roles", "users", "<version>/attack", "<version>/akas", .., "<version>/done", "carts", ..
+    """
+
+    stage = db.Column(db.Text, primary_key=True)
+    completed_at = db.Column(db.DateTime, nullable=False)
+
+
+class VersionSource(db.Model):
+    """Hash of the source files (ATT&CK, Tree, optionals) an installed version was built from
+    used by FULL_BUILD_MODE=reconcile to only reinstall versions whose sources have changed
+    """
+
+    version = db.Column(db.Text, primary_key=True)
+    source_hash = db.Column(db.Text, nullable=False)
@@ -32,7 +32,7 @@ def admin_user_get():
     logger.debug("querying all Users / Roles")
     users = db.session.query(User).order_by(asc(User.id)).all()
     roles = db.session.query(Role).order_by(asc(Role.role_id)).all()
-    logger.debug(f"got {len(users)} Users and {len(roles)} Roles")
+    logger.debug("got %s Users and %s Roles", len(users), len(roles))
 
     logger.info("serving page")
     return render_template("/edit/users.html", users=users, roles=roles, cur_user_id=current_user.id)
@@ -90,7 +90,7 @@ def admin_user_post():
     db.session.add(new_user)
 
     # attempt to commit
-    logger.debug(f"attempting to create a new user [Role: {new_user_role.name}] {email}")
+    logger.debug("attempting to create a new user [Role: %s] %s", new_user_role.name, email)
     try:
         db.session.commit()
 
@@ -153,7 +153,7 @@ def admin_user_patch():
         return jsonify(message="The role and password haven't been changed."), 400
 
     # get old Role name to form descriptive logs
-    logger.debug(f"querying old Role name of {user.email}")
+    logger.debug("querying old Role name of %s", user.email)
     old_role_obj = Role.query.filter_by(role_id=user.role_id).first()
 
     # log statement portions that describe what changed
@@ -169,7 +169,7 @@ def admin_user_patch():
         hashed_pass = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
         user.password = hashed_pass.decode("utf-8")
 
-    logger.debug(f"attempting to update {user.email}'s details: {role_change}{pass_change}")
+    logger.debug("attempting to update %s's details: %s%s", user.email, role_change, pass_change)
     try:
         db.session.commit()
 
@@ -222,7 +222,7 @@ def admin_user_delete():
 
     # clear carts and the user for this email
     db.session.query(Cart).filter(Cart.user == email).delete()
-    logger.debug(f"attempting to delete the Carts of {user_to_delete.email}")
+    logger.debug("attempting to delete the Carts of %s", user_to_delete.email)
     try:
         db.session.commit()
         logger.info(f"successfully deleted the Carts of {user_to_delete.email}")
@@ -233,7 +233,7 @@ def admin_user_delete():
         return jsonify(message="Failed to delete their carts, user deletion cancelled - please retry"), 500
 
     db.session.query(User).filter(User.email == email).delete()
-    logger.debug(f"attempting to delete {user_to_delete.email}")
+    logger.debug("attempting to delete %s", user_to_delete.email)
     try:
         db.session.commit()
         logger.info(f"successfully deleted {user_to_delete.email}")
@@ -11,9 +11,12 @@ from app.routes.utils import (
     is_tech_id,
     outgoing_markdown,
     trim_keys,
+    minisearch_index,
+    html_text_content,
     DictValidator,
 )
 from app.routes.utils import ErrorDuringAJAXRoute, wrap_exceptions_as
+from app.utils.json_provider import json_bytes_response
 
 from flask import Blueprint, request, current_app, jsonify, g, url_for
 
@@ -22,10 +25,16 @@ from sqlalchemy import asc, func, distinct, and_, or_, literal_column
 from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.orm.util import aliased
 
+from functools import lru_cache
+import hashlib
+
 logger = logging.getLogger(__name__)
 
 api_ = Blueprint("api_", __name__)
 
+# browser cache lifetime of prebuilt MiniSearch indexes (1 week) - revalidated via ETag after
+MINISEARCH_MAX_AGE = 7 * 24 * 60 * 60
+
 
 @api_.route("/api/versions", methods=["GET"])
 @wrap_exceptions_as(ErrorDuringAJAXRoute)
@@ -38,7 +47,7 @@ def get_versions():
     version_objs = db.session.query(AttackVersion).all()
     version_strs = [v.version for v in version_objs]
 
-    logger.debug(f"got {len(version_strs)} versions installed: {', '.join(version_strs)}")
+    logger.debug("got %s versions installed: %s", len(version_strs), ", ".join(version_strs))
 
     return jsonify(version_strs), 200
 
@@ -76,7 +85,7 @@ def get_mismappings():
         .filter(Technique.attack_version == version)
     ).all()
 
-    logger.debug(f"got {len(mismappings)} Mismappings")
+    logger.debug("got %s Mismappings", len(mismappings))
 
     # converts the query objects to an array
     mismappings = [
@@ -137,7 +146,7 @@ def get_tactics():
         .group_by(Tactic.uid)
     ).all()
 
-    logger.debug(f"got {len(tactics)} Tactics")
+    logger.debug("got %s Tactics", len(tactics))
 
     dictified = [
         {
@@ -201,7 +210,7 @@ def get_techniques():
         .group_by(Technique.uid)
     ).all()
 
-    logger.debug(f"got {len(techs_tacts_platforms)} Techniques")
+    logger.debug("got %s Techniques", len(techs_tacts_platforms))
 
     dictified = [
         {
@@ -247,7 +256,7 @@ def user_version_change():
 
     # update
     try:
-        logger.debug(f"attempt to update version in-use {version_change_text}")
+        logger.debug("attempt to update version in-use %s", version_change_text)
         current_user.last_attack_ver = data["new_version"]
         db.session.commit()
 
@@ -279,11 +288,11 @@ def techid_to_valid_tactid_map(version):
         return jsonify(message="ATT&CK version malformed"), 400
 
     # validate existence
-    logger.debug(f"Checking ATT&CK version existence: {version}")
+    logger.debug("Checking ATT&CK version existence: %s", version)
     if AttackVersion.query.get(version) is None:
         logger.error(f"Checking ATT&CK version existence: {version} - doesn't exist")
         return jsonify(message="ATT&CK version doesn't exist"), 404
-    logger.debug(f"Checking ATT&CK version existence: {version} - it exists")
+    logger.debug("Checking ATT&CK version existence: %s - it exists", version)
 
     # query valid Tactic for each Tech
     logger.debug("Running query for all TechID -> (1st)TactID")
@@ -368,7 +377,7 @@ def answers_api():
             400,
         )
 
-    logger.debug(f"got {len(answers)} answer cards")
+    logger.debug("got %s answer cards", len(answers))
     return jsonify(answers), 200
 
 
@@ -388,7 +397,7 @@ def answers_api_start(args):
     _, _, version_context = args
 
     # query Tactics, their # of children, and their associated platforms / data sources
-    logger.debug(f"querying start -> Tactic answer cards under ATT&CK {version_context}")
+    logger.debug("querying start -> Tactic answer cards under ATT&CK %s", version_context)
     items = (
         db.session.query(
             Tactic,
@@ -410,6 +419,12 @@ def answers_api_start(args):
         .group_by(Tactic.uid)
     ).all()
 
+    return start_answer_cards(items, version_context)
+
+
+def start_answer_cards(items, version_context):
+    """Forms the Tactic answer cards from answers_api_start()'s query rows (Tactic, num, platforms, data_sources)"""
+
     # form answers
     answers = [
         {
@@ -448,7 +463,7 @@ def answers_api_tactic(args):
     index, _, version_context = args
 
     # query Techniques, their # of children, and their associated platforms / data sources
-    logger.debug(f"querying Tactic ({index}) -> Technique answer cards under ATT&CK {version_context}")
+    logger.debug("querying Tactic (%s) -> Technique answer cards under ATT&CK %s", index, version_context)
     technique_alias = aliased(Technique)
     items = (
         db.session.query(
@@ -473,6 +488,14 @@ def answers_api_tactic(args):
         .group_by(Technique.uid)
     ).all()
 
+    return tactic_answer_cards(items, index, version_context)
+
+
+def tactic_answer_cards(items, index, version_context):
+    """Forms the Technique answer cards from answers_api_tactic()'s query rows
+    (Technique, num, platforms, data_sources)
+    """
+
     # form answers
     answers = [
         {
@@ -519,8 +542,10 @@ def answers_api_technique(args):
 
     # query base Technique, its SubTechniques, their # of children, and their associated platforms / data sources
     logger.debug(
-        f"querying Technique ({index}) -> Sub-Technique answer cards "
-        f"in the context of Tactic {tactic_context} under ATT&CK {version_context}"
+        "querying Technique (%s) -> Sub-Technique answer cards in the context of Tactic %s under ATT&CK %s",
+        index,
+        tactic_context,
+        version_context,
     )
     technique_alias = aliased(Technique)
     items = (
@@ -556,6 +581,14 @@ def answers_api_technique(args):
         .group_by(Technique.uid, technique_alias.uid)
     ).all()
 
+    return technique_answer_cards(items, tactic_context, version_context)
+
+
+def technique_answer_cards(items, tactic_context, version_context):
+    """Forms the SubTechnique (+ Technique) answer cards from answers_api_technique()'s query rows
+    (Technique, sub, platforms, data_sources)
+    """
+
     # form answers
     answers = []
     for technique, sub, platforms, data_sources in items:
@@ -588,13 +621,105 @@ def answers_api_technique(args):
     return answers
 
 
+# ---------------------------------------------------------------------------------------------------------------------
+# Answer Card MiniSearch Index [GET]
+
+# fields the frontend's MiniSearch searches answer cards by (its MiniSearch.loadJSON options must match)
+ANSWER_CARD_MINISEARCH_FIELDS = ["label", "content_text"]
+
+
+def build_answers_minisearch_json(args):
+    """Returns the serialized MiniSearch index (JSON bytes) of the answer cards at a node, and its ETag
+
+    - args = (index, tactic_context, version_context) as used by the answers_api_* functions
+    """
+    index = args[0]
+    if index == "start":
+        answers = answers_api_start(args)
+    elif is_tact_id(index):
+        answers = answers_api_tactic(args)
+    else:
+        answers = answers_api_technique(args)
+
+    # documents as decider.js forms them from answer cards
+    documents = [
+        {
+            "id": answer["id"],
+            "label": f"{answer['name']} [{answer['id']}]",
+            "content_text": html_text_content(answer["content"]),
+        }
+        for answer in answers
+    ]
+    body = current_app.json.dumps_bytes(minisearch_index(documents, ANSWER_CARD_MINISEARCH_FIELDS))
+    return body, hashlib.sha256(body).hexdigest()
+
+
+# cards are fixed per version in kiosk mode, so an index is built once per process and kept
+# (outside of kiosk mode, answers can be edited and versions reinstalled - indexes are built per request there)
+answers_minisearch_json = lru_cache(maxsize=256)(build_answers_minisearch_json)
+
+
+@api_.route("/api/minisearch/<version>/<path:node>", methods=["GET"])
+@wrap_exceptions_as(ErrorDuringAJAXRoute)
+def answers_minisearch(version, node):
+    """Provides a prebuilt MiniSearch index of the answer cards at a node of the question tree
+
+    node
+    - start         : the root of the tree (Tactic cards)
+    - TA[0-9]{4}    : a Tactic (Technique cards)
+    - TA[0-9]{4}/T[0-9]{4} : a Technique under a Tactic (SubTechnique cards)
+
+    Served with long-lived cache headers + an ETag in kiosk mode, as the cards of a version don't change there
+    - otherwise served privately, revalidated via the ETag on every use (answers can be edited)
+    Loaded with MiniSearch.loadJSON instead of indexing the cards in the browser
+
+    url-based request: .../api/minisearch/VERSION/NODE
+    JSON response
+    """
+    g.route_title = "Get Answer Card MiniSearch Index"
+
+    # validate version
+    if not is_attack_version(version):
+        logger.error("request failed - version field malformed")
+        return jsonify(message="ATT&CK version malformed"), 400
+
+    # validate node
+    node_parts = node.strip("/").split("/")
+    if (node_parts == ["start"]) or ((len(node_parts) == 1) and is_tact_id(node_parts[0])):
+        args = (node_parts[0], "", version)
+    elif (len(node_parts) == 2) and is_tact_id(node_parts[0]) and is_base_tech_id(node_parts[1]):
+        args = (node_parts[1], node_parts[0], version)
+    else:
+        logger.error("request failed - node malformed")
+        return jsonify(message='node must be "start", a Tactic ID, or a Tactic ID/Technique ID.'), 400
+
+    # validate existence
+    if AttackVersion.query.get(version) is None:
+        logger.error(f"Checking ATT&CK version existence: {version} - doesn't exist")
+        return jsonify(message="ATT&CK version doesn't exist"), 404
+
+    kiosk_mode = current_app.config.get("KIOSK_MODE")
+    body, etag = answers_minisearch_json(args) if kiosk_mode else build_answers_minisearch_json(args)
+
+    response = json_bytes_response(body)
+    response.set_etag(etag)
+    if kiosk_mode:
+        response.cache_control.public = True
+        response.cache_control.max_age = MINISEARCH_MAX_AGE
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    logger.info("sending MiniSearch index")
+    return response.make_conditional(request)
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 def version_has_co_ocs_data(version):
     """Returns a bool on if the given ATT&CK version has CoOccurrence data for it in the DB"""
 
-    logger.debug(f"checking if ATT&CK {version} has CoOccurrence data or not")
+    logger.debug("checking if ATT&CK %s has CoOccurrence data or not", version)
     exists = (
         db.session.query(Technique.attack_version)
         .filter(Technique.attack_version == version)
@@ -634,7 +759,7 @@ def cooccurrences_api():
         return jsonify(message="Tech_IDs must be a list of strings with a length of 1+."), 400
     tech_ids = set(tech_ids)
 
-    logger.debug(f"requesting CoOccurrences for {len(tech_ids)} Techniques under ATT&CK {version}")
+    logger.debug("requesting CoOccurrences for %s Techniques under ATT&CK %s", len(tech_ids), version)
 
     # check that version exists
     version_obj = AttackVersion.query.get(version)
@@ -686,7 +811,7 @@ def cooccurrences_api():
                 ),
                 "score": score,
             }
-    logger.debug(f"got {len(implied_techs)} CoOccurrences")
+    logger.debug("got %s CoOccurrences", len(implied_techs))
 
     # make into list and order score descending
     implied_techs = list(implied_techs.values())
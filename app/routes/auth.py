@@ -104,7 +104,7 @@ def login_post():
     user.session_token = str(uuid4())
 
     try:
-        logger.debug(f"attempting to set {email}'s session token on DB")
+        logger.debug("attempting to set %s's session token on DB", email)
         db.session.commit()
         logger.info(f"successfully set {email}'s session token on DB")
 
@@ -136,7 +136,7 @@ def logout():
     # Remove session keys set by Flask-Principal
     for key in ("identity.name", "identity.auth_type"):
         session.pop(key, None)
-    logger.debug(f"session keys removed ({user_email})")
+    logger.debug("session keys removed (%s)", user_email)
 
     # Tell Flask-Principal the user is anonymous
     identity_changed.send(current_app._get_current_object(), identity=AnonymousIdentity())
@@ -61,7 +61,7 @@ def edit_mismapping_get():
     version_pick = VersionPicker()
     version_pick.set_vars()
     version = version_pick.cur_version
-    logger.debug(f"using ATT&CK {version}")
+    logger.debug("using ATT&CK %s", version)
 
     original = dict(original=None, original_techname=None, version=version, index=index)
 
@@ -116,16 +116,16 @@ def edit_mismapping_post():
             logger.error("request failed - malformed ATT&CK version provided")
             return jsonify(message="'version' field malformed"), 400
 
-        logger.debug(f"querying existence of version {arg_version}")
+        logger.debug("querying existence of version %s", arg_version)
 
     version_pick = VersionPicker(version=arg_version)
     if not version_pick.is_valid:
         logger.error(f"request failed - version {arg_version} does not exists")
         return version_pick.get_invalid_message()
     if arg_version:
-        logger.debug(f"requested version {arg_version} - it exists")
+        logger.debug("requested version %s - it exists", arg_version)
     else:
-        logger.debug(f"VersionPicker provided version {version_pick.cur_version}")
+        logger.debug("VersionPicker provided version %s", version_pick.cur_version)
 
     mismap_id = mismap.get("id")
 
@@ -162,12 +162,12 @@ def edit_mismapping_post():
             last_id = 0
         else:
             last_id = last_mismap.uid
-        logger.debug(f"query done - it's {last_id}")
+        logger.debug("query done - it's %s", last_id)
 
         # get the proper uids of the specified techniques
         original_tech_id = original
         logger.debug(
-            f"resolving existence of original Tech ({original_tech_id}) under ATT&CK {version_pick.cur_version}"
+            "resolving existence of original Tech (%s) under ATT&CK %s", original_tech_id, version_pick.cur_version
         )
         original = (
             db.session.query(Technique)
@@ -184,7 +184,7 @@ def edit_mismapping_post():
         # uid for the corrected technique
         corrected_tech_id = corrected
         logger.debug(
-            f"resolving existence of corrected Tech ({corrected_tech_id}) under ATT&CK {version_pick.cur_version}"
+            "resolving existence of corrected Tech (%s) under ATT&CK %s", corrected_tech_id, version_pick.cur_version
         )
         corrected = (
             db.session.query(Technique)
@@ -218,17 +218,18 @@ def edit_mismapping_post():
             logger.error("request failed - malformed (non-int) Mismapping ID provided")
             return jsonify(message="Mismapping ID was not an integer as expected"), 400
 
-        logger.debug(f"querying for existing Mismapping to update mismap_id={mismap_id}")
+        logger.debug("querying for existing Mismapping to update mismap_id=%s", mismap_id)
         mismap_obj = db.session.query(Mismapping).filter(Mismapping.uid == mismap_id).first()
         if mismap_obj is None:
-            logger.debug(f"request failed - could not locate existing Mismapping #{mismap_id}")
+            logger.debug("request failed - could not locate existing Mismapping #%s", mismap_id)
             return jsonify(message="Original could not be found"), 404
-        logger.debug(f"successfully located existing Mismapping #{mismap_id}")
+        logger.debug("successfully located existing Mismapping #%s", mismap_id)
 
         corrected_tech_id = corrected
         logger.debug(
-            f"querying existence of corrected Technique ({corrected_tech_id}) "
-            f"under ATT&CK {version_pick.cur_version}"
+            "querying existence of corrected Technique (%s) under ATT&CK %s",
+            corrected_tech_id,
+            version_pick.cur_version,
         )
         corrected = (
             db.session.query(Technique)
@@ -248,7 +249,7 @@ def edit_mismapping_post():
 
     # write new Mismapping / updates to an existing one
     try:
-        logger.debug(f"attempting to write Mismapping #{mismap_obj.uid}")
+        logger.debug("attempting to write Mismapping #%s", mismap_obj.uid)
         db.session.commit()
         logger.info(f"successfully wrote Mismapping #{mismap_obj.uid}")
 
@@ -301,10 +302,10 @@ def edit_mismapping_delete():
         return jsonify(message="Mismapping ID not an integer as expected"), 400
 
     try:
-        logger.debug(f"attempting to delete Mismapping #{mismap_id}")
+        logger.debug("attempting to delete Mismapping #%s", mismap_id)
         db.session.query(Mismapping).filter(Mismapping.uid == mismap_id).delete()
         db.session.commit()
-        logger.debug(f"successfully deleted Mismapping #{mismap_id}")
+        logger.debug("successfully deleted Mismapping #%s", mismap_id)
 
     except Exception:
         db.session.rollback()
@@ -370,7 +371,7 @@ def edit_tree_api_get():
             logger.error("failed - request has a malformed 'version' field")
             return jsonify(message="Malformed 'version' field"), 400
 
-        logger.debug(f"checking existence of specified version {arg_version}")
+        logger.debug("checking existence of specified version %s", arg_version)
 
     version_pick = VersionPicker(version=arg_version)
     if not version_pick.is_valid:
@@ -380,7 +381,7 @@ def edit_tree_api_get():
     if arg_version:
         logger.debug("requested ATT&CK version exists")
     else:
-        logger.debug(f"VersionPicker provided version {version_pick.cur_version}")
+        logger.debug("VersionPicker provided version %s", version_pick.cur_version)
 
     # retrieve the type of content
     selected_content = request.args.get("selected_content")
@@ -456,12 +457,12 @@ def edit_tree_api_post():
         logger.error("failed - request had a missing / malformed version field")
         return jsonify(message="'version' field missing / malformed"), 400
 
-    logger.debug(f"checking validity of specified version: {version}")
+    logger.debug("checking validity of specified version: %s", version)
     version_pick = VersionPicker(version=version)
     if not version_pick.is_valid:
         logger.error(f"failed - checking validity of specified version: {version} - it does not exists")
         return version_pick.get_invalid_message()
-    logger.debug(f"checking validity of specified version: {version} - it exists")
+    logger.debug("checking validity of specified version: %s - it exists", version)
 
     # get a tactic or technique
     item = get_tact_or_tech(item_id, version)
@@ -574,27 +575,27 @@ def audit_tree_content(version):
         return render_template("status_codes/404.html"), 404
 
     # validate existence
-    logger.debug(f"Checking ATT&CK version existence: {version}")
+    logger.debug("Checking ATT&CK version existence: %s", version)
     if not VersionPicker(version).set_vars():
         logger.error(f"Checking ATT&CK version existence: {version} - doesn't exist")
         return render_template("status_codes/404.html"), 404
-    logger.debug(f"Checking ATT&CK version existence: {version} - it exists")
+    logger.debug("Checking ATT&CK version existence: %s - it exists", version)
 
     # -----------------------------------------------------------------------------------------------------------------
     SubTechnique = aliased(Technique)
 
-    logger.debug(f"Querying all Tactics in ATT&CK {version}")
+    logger.debug("Querying all Tactics in ATT&CK %s", version)
     tactics: List[Tactic] = db.session.query(Tactic).filter(Tactic.attack_version == version).all()
-    logger.debug(f"Got {len(tactics)} Tactics")
+    logger.debug("Got %s Tactics", len(tactics))
 
-    logger.debug(f"Querying all Techniques in ATT&CK {version}")
+    logger.debug("Querying all Techniques in ATT&CK %s", version)
     techniques_subcnt = (
         db.session.query(Technique, func.count(distinct(SubTechnique.uid)))
         .filter(Technique.attack_version == version)
         .group_by(Technique.uid)
         .outerjoin(SubTechnique, SubTechnique.parent_uid == Technique.uid)
     ).all()
-    logger.debug(f"Got {len(techniques_subcnt)} Techniques")
+    logger.debug("Got %s Techniques", len(techniques_subcnt))
 
     base_techs_subcnt = [
         [technique, sub_count] for technique, sub_count in techniques_subcnt if ("." not in technique.tech_id)
@@ -711,13 +712,13 @@ def get_tact_or_tech(index, version):
     """
 
     if is_tact_id(index):
-        logger.debug(f"querying Tactic {index} in ATT&CK {version}")
+        logger.debug("querying Tactic %s in ATT&CK %s", index, version)
         tact = db.session.query(Tactic).filter(and_(Tactic.attack_version == version, Tactic.tact_id == index)).first()
         logger.debug("query done")
         return tact
 
     else:
-        logger.debug(f"querying Technique {index} in ATT&CK {version}")
+        logger.debug("querying Technique %s in ATT&CK %s", index, version)
         tech = (
             db.session.query(Technique)
             .filter(and_(Technique.attack_version == version, Technique.tech_id == index))
@@ -765,7 +766,7 @@ def set_tact_or_tech_qna(item, value, field_type):
     ret = {"name": outgoing_markdown(escaped_val), "index": index}
 
     try:
-        logger.debug(f"attempting to write {field_type} of {type_id} under {item.attack_version}")
+        logger.debug("attempting to write %s of %s under %s", field_type, type_id, item.attack_version)
         db.session.commit()
         logger.info(f"successfully wrote {field_type} of {type_id} under {item.attack_version}")
         return ret
@@ -798,7 +799,7 @@ def get_tree(index, version):
     # if user is on a tactic, retrieve the list of techniques
     if is_tact_id(index):
         # tactic root
-        logger.debug(f"querying Tactic {index} under ATT&CK {version}")
+        logger.debug("querying Tactic %s under ATT&CK %s", index, version)
         node = db.session.query(Tactic).filter(and_(Tactic.attack_version == version, Tactic.tact_id == index)).first()
         logger.debug("query done")
 
@@ -808,7 +809,7 @@ def get_tree(index, version):
         technique_alias = aliased(Technique)
 
         # technique children
-        logger.debug(f"querying Techniques under Tactic {index} under ATT&CK {version}")
+        logger.debug("querying Techniques under Tactic %s under ATT&CK %s", index, version)
         query = (
             db.session.query(Technique, func.count(technique_alias.uid))
             .filter(and_(Technique.attack_version == version, Technique.parent_uid == None))
@@ -819,7 +820,7 @@ def get_tree(index, version):
             .group_by(Technique.uid)
             .order_by(Technique.tech_id)
         ).all()
-        logger.debug(f"got {len(query)} Techniques")
+        logger.debug("got %s Techniques", len(query))
 
         for technique, count in query:
             tree.append((technique.tech_id, technique.tech_answer, technique.tech_name, count))
@@ -833,19 +834,19 @@ def get_tree(index, version):
         question = current_app.config["START_QUESTION"]
 
         # tactic children
-        logger.debug(f"querying Tactics under root 'start' under ATT&CK {version}")
+        logger.debug("querying Tactics under root 'start' under ATT&CK %s", version)
         tree = [
             (tactic.tact_id, tactic.tact_answer, tactic.tact_name, 0)
             for tactic in (
                 db.session.query(Tactic).filter(Tactic.attack_version == version).order_by(Tactic.uid)
             ).all()
         ]
-        logger.debug(f"got {len(tree)} Tactics")
+        logger.debug("got %s Tactics", len(tree))
 
     # the user is on a technique, so query for subtechniques
     elif re.match(r"^TA[0-9]{4}\.T[0-9]{4}$", index):
         # base technique root
-        logger.debug(f"querying Technique {index} under ATT&CK {version}")
+        logger.debug("querying Technique %s under ATT&CK %s", index, version)
         node = (
             db.session.query(Technique)
             .filter(
@@ -864,7 +865,7 @@ def get_tree(index, version):
         technique_alias = aliased(Technique)
 
         # sub-technique children
-        logger.debug(f"querying SubTechniques under Technique {index} under ATT&CK {version}")
+        logger.debug("querying SubTechniques under Technique %s under ATT&CK %s", index, version)
         query = (
             # techniques in current version
             db.session.query(Technique)
@@ -875,7 +876,7 @@ def get_tree(index, version):
             # ordered by their tech_id
             .order_by(Technique.tech_id)
         ).all()
-        logger.debug(f"got {len(query)} SubTechniques")
+        logger.debug("got %s SubTechniques", len(query))
 
         for technique in query:
             tree.append((technique.tech_id, technique.tech_answer, technique.tech_name, 0))
@@ -934,7 +935,7 @@ def get_missing_content(version):
         .join(technique_alias, technique_alias.parent_uid == Technique.uid)
     )
 
-    logger.debug(f"querying missing content for Tech -> SubTech cards ({version})")
+    logger.debug("querying missing content for Tech -> SubTech cards (%s)", version)
 
     # technique level content is when accessing the technique question and subtech answer
     technique_level_content = (
@@ -967,7 +968,7 @@ def get_missing_content(version):
 
     logger.debug("query done")
 
-    logger.debug(f"querying missing content for Tactic -> Technique cards ({version})")
+    logger.debug("querying missing content for Tactic -> Technique cards (%s)", version)
 
     # tactic level content is when accessing the tactic question and the tech answers
     tactic_level_content = (
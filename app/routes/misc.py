@@ -40,7 +40,7 @@ def suggestions(version):
         logger.error("failed - request has a malformed ATT&CK version")
         return render_template("status_codes/404.html"), 404
 
-    logger.debug(f"checking if version {version} exists")
+    logger.debug("checking if version %s exists", version)
     if not VersionPicker(version=version).set_vars():
         logger.error("requested ATT&CK version does not exist")
         return render_template("status_codes/404.html"), 404
@@ -32,7 +32,7 @@ def profile():
     logger.debug("querying user's carts")
     carts = Cart.query.filter_by(user=current_user.email).order_by(desc(Cart.last_modified)).all()
     cart_list = [{"id": c.cart_id, "name": c.cart_name, "version": c.attack_version} for c in carts]
-    logger.debug(f"got {len(cart_list)} Carts")
+    logger.debug("got %s Carts", len(cart_list))
 
     logger.info("serving profile page")
     return render_template(
@@ -173,7 +173,7 @@ def load_cart():
         return jsonify(message="Cart ID was not an integer."), 400
 
     # cart existence check
-    logger.debug(f"querying for existence of Cart with ID {cart_id}")
+    logger.debug("querying for existence of Cart with ID %s", cart_id)
     cart = Cart.query.filter_by(cart_id=cart_id).first()
     if cart is None:
         logger.error(f"failed - Cart with ID {cart_id} does not exist")
@@ -216,7 +216,7 @@ def delete_cart():
         return jsonify(message="Cart ID was not an integer."), 400
 
     # cart existence check
-    logger.debug(f"querying for existence of Cart with ID {cart_id}")
+    logger.debug("querying for existence of Cart with ID %s", cart_id)
     cart = Cart.query.filter_by(cart_id=cart_id).first()
     if cart is None:
         logger.error(f"failed - Cart with ID {cart_id} does not exist")
@@ -257,7 +257,7 @@ def get_carts():
     logger.debug("querying user's carts")
     carts = Cart.query.filter_by(user=current_user.email).order_by(desc(Cart.last_modified)).all()
     cart_list = [{"id": c.cart_id, "name": c.cart_name, "version": c.attack_version} for c in carts]
-    logger.debug(f"got {len(cart_list)} Carts")
+    logger.debug("got %s Carts", len(cart_list))
 
     logger.info("serving user a list of the saved Carts they have")
     return jsonify(cart_list), 200
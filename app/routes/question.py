@@ -106,7 +106,7 @@ def crumb_bar(ids, version_context):
 
     # tactic if present
     if len(ids) > 1:
-        logger.debug(f"Crumb Bar: querying Tactic by ID {ids[1]} ({version_context})")
+        logger.debug("Crumb Bar: querying Tactic by ID %s (%s)", ids[1], version_context)
         tactic = db.session.query(Tactic).filter_by(tact_id=ids[1], attack_version=version_context).first()
 
         if tactic is None:
@@ -127,7 +127,7 @@ def crumb_bar(ids, version_context):
             logger.error("Crumb Bar: failed - request had one or more malformed Techniques")
             return None
 
-        logger.debug(f"Crumb Bar: querying Techs by IDs {ids[2:]} ({version_context})")
+        logger.debug("Crumb Bar: querying Techs by IDs %s (%s)", ids[2:], version_context)
         techniques = (
             db.session.query(Technique).filter(
                 and_(
@@ -164,7 +164,7 @@ def get_mismappings(index, version):
     returns a list[dict] as described in the comprehension below
     """
 
-    logger.debug(f"Tech Mismappings: querying mismaps of {index} ({version})")
+    logger.debug("Tech Mismappings: querying mismaps of %s (%s)", index, version)
 
     corrected_tech = aliased(Technique)
     mismappings = (
@@ -178,7 +178,7 @@ def get_mismappings(index, version):
         )
     ).all()
 
-    logger.debug(f"got {len(mismappings)} mismaps")
+    logger.debug("got %s mismaps", len(mismappings))
 
     return [
         {
@@ -210,7 +210,7 @@ def get_tech_and_subs(index, tactic_context, version_context):
     # Get base Technique, query Technique & Subs
     base_technique = index.split(".")[0]
 
-    logger.debug(f"querying Tech & Subs of {base_technique} ({version_context})")
+    logger.debug("querying Tech & Subs of %s (%s)", base_technique, version_context)
     tech_and_subs = (
         db.session.query(Technique)
         .filter(Technique.tech_id.contains(base_technique))  # get all entries for base_technique
@@ -219,7 +219,7 @@ def get_tech_and_subs(index, tactic_context, version_context):
     ).all()
 
     number_of_subs = sum(1 for t in tech_and_subs if ("." in t.tech_id))
-    logger.debug(f"got {number_of_subs} sub-Techs")
+    logger.debug("got %s sub-Techs", number_of_subs)
 
     # Get current selected Technique and its place in
     # the Technique/Subs list; Make dict for Jinja template
@@ -265,7 +265,7 @@ def get_examples(index, version):
     ]
     """
 
-    logger.debug(f"querying CTI examples of {index} ({version})")
+    logger.debug("querying CTI examples of %s (%s)", index, version)
     blurbs = (
         db.session.query(
             Blurb.sentence,
@@ -276,7 +276,7 @@ def get_examples(index, version):
         .order_by(asc(Blurb.sentence))
         .group_by(Blurb.sentence)
     ).all()
-    logger.debug(f"got {len(blurbs)} examples")
+    logger.debug("got %s examples", len(blurbs))
 
     examples = [
         {
@@ -322,11 +322,11 @@ def question_page_vars(cur_node, index, tactic_context, version_context):
     """
 
     # Get version - make platform filters for it
-    logger.debug(f"querying Platforms and Data Sources in version {version_context}")
+    logger.debug("querying Platforms and Data Sources in version %s", version_context)
     ver = AttackVersion.query.get(version_context)
     ver_platforms = ver.platforms
     ver_data_sources = ver.data_sources
-    logger.debug(f"got {len(ver_platforms)} Platforms and {len(ver_data_sources)} Data Sources")
+    logger.debug("got %s Platforms and %s Data Sources", len(ver_platforms), len(ver_data_sources))
 
     platform_filters = checkbox_filters_component(
         "platform",
@@ -377,7 +377,7 @@ def success_page_vars(index, tactic_context, version_context):
     technique, tech_and_subs = get_tech_and_subs(index, tactic_context, version_context)
 
     # get tactics, platforms, and akas for the current technique
-    logger.debug(f"querying Tactics, Platforms, and AKAs of {index} ({version_context})")
+    logger.debug("querying Tactics, Platforms, and AKAs of %s (%s)", index, version_context)
     _, tact_ids_names, platforms, akas = (
         db.session.query(
             Technique,  # 0
@@ -399,7 +399,7 @@ def success_page_vars(index, tactic_context, version_context):
         .outerjoin(Aka, technique_aka_map.c.aka == Aka.uid)
         .group_by(Technique.uid)
     ).first()
-    logger.debug(f"got {len(tact_ids_names)} Tactics, {len(platforms)} Platforms, and {len(akas)} AKAs")
+    logger.debug("got %s Tactics, %s Platforms, and %s AKAs", len(tact_ids_names), len(platforms), len(akas))
 
     # generate dropdown options for tactic selector
     #   this allows selecting which tactic the technique gets added to the cart under
@@ -445,7 +445,7 @@ def question_start_page(version):
         logger.error("failed - request had a malformed ATT&CK version")
         return render_template("status_codes/404.html"), 404
 
-    logger.debug(f"querying existence of version {version}")
+    logger.debug("querying existence of version %s", version)
     version_pick = VersionPicker(version=version)
     if not version_pick.set_vars():
         logger.error("requested ATT&CK version does not exist")
@@ -455,7 +455,7 @@ def question_start_page(version):
     if version:
         logger.debug("requested ATT&CK version exists")
     else:
-        logger.debug(f"version not provided in URL, using user's last used version {version_context}")
+        logger.debug("version not provided in URL, using user's last used version %s", version_context)
 
     # top bar and page for question root
     crumbs = crumb_bar(["start"], version_context)
@@ -483,7 +483,7 @@ def question_tactic_page(version, tactic_id):
         logger.error("failed - request had a malformed ATT&CK version")
         return render_template("status_codes/404.html"), 404
 
-    logger.debug(f"querying existence of version {version}")
+    logger.debug("querying existence of version %s", version)
     version_pick = VersionPicker(version=version)
     if not version_pick.set_vars():
         logger.error("requested ATT&CK version does not exist")
@@ -503,7 +503,7 @@ def question_tactic_page(version, tactic_id):
         return render_template("status_codes/404.html"), 404
 
     # tactic exists as crumb bar formation validated it
-    logger.debug(f"querying Tactic {tactic_id} ({version_context})")
+    logger.debug("querying Tactic %s (%s)", tactic_id, version_context)
     cur_node = db.session.query(Tactic).filter_by(attack_version=version_context, tact_id=tactic_id).first()
     logger.debug("query done")
 
@@ -534,7 +534,7 @@ def question_further_page(version, tactic_id, dest=""):
         logger.error("failed - request had a malformed ATT&CK version")
         return render_template("status_codes/404.html"), 404
 
-    logger.debug(f"querying existence of version {version}")
+    logger.debug("querying existence of version %s", version)
     version_pick = VersionPicker(version=version)
     if not version_pick.set_vars():
         logger.error("requested ATT&CK version does not exist")
@@ -585,7 +585,7 @@ def question_further_page(version, tactic_id, dest=""):
         return render_template("success.html", **success, **crumbs)
 
     # known: sub = QnA -> Tech->SubTech question page .. if question exists
-    logger.debug(f"querying Technique {technique_id} under ATT&CK {version_context}")
+    logger.debug("querying Technique %s under ATT&CK %s", technique_id, version_context)
     cur_node = db.session.query(Technique).filter_by(attack_version=version_context, tech_id=technique_id).first()
     logger.debug("query done")
 
@@ -636,7 +636,7 @@ def notactic_success(version, subpath=""):
         logger.error("failed - request contained a malformed ATT&CK version")
         return render_template("status_codes/404.html"), 404
 
-    logger.debug(f"querying existence of version {version}")
+    logger.debug("querying existence of version %s", version)
     version_pick = VersionPicker(version=version)
     if not version_pick.set_vars():
         logger.error("requested ATT&CK version does not exists")
@@ -664,7 +664,7 @@ def notactic_success(version, subpath=""):
         return render_template("status_codes/404.html"), 404
 
     # if Technique doesn't exist (version change can cause this) -> 404
-    logger.debug(f"querying exitence of {technique} in ATT&CK {version_context}")
+    logger.debug("querying exitence of %s in ATT&CK %s", technique, version_context)
     cur_node = db.session.query(Technique).filter_by(attack_version=version_context, tech_id=technique).first()
 
     if cur_node is None:
@@ -676,7 +676,7 @@ def notactic_success(version, subpath=""):
             ),
             404,
         )
-    logger.debug(f"{technique} in ATT&CK {version_context} exists")
+    logger.debug("%s in ATT&CK %s exists", technique, version_context)
 
     success = success_page_vars(technique, tactic_context, version_context)
 
@@ -72,7 +72,7 @@ def mini_search(version):
     if contains_tech_id:
         phrase = contains_tech_id.group(0)
 
-        logger.debug(f"querying Techniques by ID under ATT&CK {version}")
+        logger.debug("querying Techniques by ID under ATT&CK %s", version)
         techniques = (
             db.session.query(
                 Technique.full_tech_name,
@@ -87,7 +87,7 @@ def mini_search(version):
     else:
         phrase = String("").literal_processor(dialect=db.session.get_bind().dialect)(value=phrase.lower())
 
-        logger.debug(f"querying Techniques by name under ATT&CK {version}")
+        logger.debug("querying Techniques by name under ATT&CK %s", version)
         subq = (
             db.session.query(
                 Technique.full_tech_name,
@@ -99,7 +99,7 @@ def mini_search(version):
             db.session.query(subq).filter(subq.c.sml > 0.25).order_by(subq.c.sml.desc(), subq.c.full_tech_name)
         ).all()
 
-    logger.debug(f"got {len(techniques)} Techniques")
+    logger.debug("got %s Techniques", len(techniques))
 
     # Make response from entries
     dictified = []
@@ -132,7 +132,7 @@ def technique_search_args_are_valid(version, query, tactics, platforms, data_sou
     ver_model = version_pick.cur_version_model
 
     # ensure that specified tactics exist
-    logger.debug(f"querying Tactics in ATT&CK {version} (to validate request)")
+    logger.debug("querying Tactics in ATT&CK %s (to validate request)", version)
     valid_tactics = {t.tact_name.replace(" ", "_").lower() for t in ver_model.tactics}
     specified_tactics = set(tactics)
     if len(specified_tactics) != len(specified_tactics.intersection(valid_tactics)):
@@ -140,7 +140,7 @@ def technique_search_args_are_valid(version, query, tactics, platforms, data_sou
         return False
 
     # ensure that specified platforms exist
-    logger.debug(f"querying Platforms in ATT&CK {version} (to validate request)")
+    logger.debug("querying Platforms in ATT&CK %s (to validate request)", version)
     valid_platforms = {p.internal_name for p in ver_model.platforms}
     specified_platforms = set(platforms)
     if len(specified_platforms) != len(specified_platforms.intersection(valid_platforms)):
@@ -148,7 +148,7 @@ def technique_search_args_are_valid(version, query, tactics, platforms, data_sou
         return False
 
     # ensure that specified data sources exist
-    logger.debug(f"querying Data Sources in ATT&CK {version} (to validate request)")
+    logger.debug("querying Data Sources in ATT&CK %s (to validate request)", version)
     valid_data_sources = {s.internal_name for s in ver_model.data_sources}
     specified_data_sources = set(data_sources)
     if len(specified_data_sources) != len(specified_data_sources.intersection(valid_data_sources)):
@@ -198,13 +198,13 @@ def search_page():
     ver_name = ver_model.version
 
     # populate tactic / platform / data source checkbox options for picked version
-    logger.debug(f"querying Tactics in ATT&CK {ver_name} for filters")
+    logger.debug("querying Tactics in ATT&CK %s for filters", ver_name)
     tactic_names = [t.tact_name for t in ver_model.tactics]
 
-    logger.debug(f"querying Platforms in ATT&CK {ver_name} for filters")
+    logger.debug("querying Platforms in ATT&CK %s for filters", ver_name)
     platform_names = [p.readable_name for p in ver_model.platforms]
 
-    logger.debug(f"querying Data Sources in ATT&CK {ver_name} for filters")
+    logger.debug("querying Data Sources in ATT&CK %s for filters", ver_name)
     data_source_names = [d.readable_name for d in ver_model.data_sources]
 
     tactic_filters = checkbox_filters_component(
@@ -593,7 +593,7 @@ def full_search():
             literal_column("ts_rank(tsvec, tsqry)").label("score"),
         ).filter(generate_existing.c.exists)
     ).all()
-    logger.debug(f"got {len(filter_and_score)} matching Techniques")
+    logger.debug("got %s matching Techniques", len(filter_and_score))
     tech_to_score = {tech: score for tech, score in filter_and_score}
 
     # fetch details of matching techniques
@@ -741,14 +741,14 @@ def answer_card_search():
         logger.error("Malformed ATT&CK version specified")
         return jsonify(message="ATT&CK version specified is malformed"), 400
 
-    logger.debug(f"Checking existince of ATT&CK {version}")
+    logger.debug("Checking existince of ATT&CK %s", version)
     version_picker = VersionPicker(version)
 
     if not version_picker.is_valid:  # existence
         logger.error(f"Checking existince of ATT&CK {version} - doesn't exist")
         return jsonify(message="ATT&CK version specified is not on server"), 400
 
-    logger.debug(f"Checking existince of ATT&CK {version} - it exists")
+    logger.debug("Checking existince of ATT&CK %s - it exists", version)
     version_model = version_picker.cur_version_model
 
     # index (format)
@@ -762,7 +762,7 @@ def answer_card_search():
 
     # index (existence)
     if parent_is_technique:
-        logger.debug(f"Querying existence of Technique {index} in {version}")
+        logger.debug("Querying existence of Technique %s in %s", index, version)
         tech_parent_uid = (
             db.session.query(Technique.uid)
             .filter(Technique.tech_id == index)
@@ -773,7 +773,7 @@ def answer_card_search():
             logger.error(f"Querying existence of Technique {index} in {version} - doesn't exist")
             return jsonify(message="Question node requested does not exist"), 400
         else:
-            logger.debug(f"Querying existence of Technique {index} in {version} - it exists")
+            logger.debug("Querying existence of Technique %s in %s - it exists", index, version)
 
     else:  # parent is tactic
         tech_parent_uid = None
@@ -783,13 +783,13 @@ def answer_card_search():
         logger.error("Tactic context ID is malformed")
         return jsonify(message="Tactic context specified is malformed"), 400
 
-    logger.debug(f"Querying existence of Tactic {tactic_context} in {version}")
+    logger.debug("Querying existence of Tactic %s in %s", tactic_context, version)
     if not (  # existence
         db.session.query(Tactic.uid).filter(Tactic.tact_id == tactic_context).filter(Tactic.attack_version == version)
     ).scalar():
         logger.error(f"Querying existence of Tactic {tactic_context} in {version} - doesn't exist")
         return jsonify(message="Tactic context specified doesn't exist"), 400
-    logger.debug(f"Querying existence of Tactic {tactic_context} in {version} - it exists")
+    logger.debug("Querying existence of Tactic %s in %s - it exists", tactic_context, version)
 
     # tactic_context / index (constraint)
     if (not parent_is_technique) and (index != tactic_context):  # index must = tactic_context if index is a tactic
@@ -799,22 +799,22 @@ def answer_card_search():
         return jsonify(message="index and tactic_context must be equal if index is a Tactic"), 400
 
     # platforms (format, existence)
-    logger.debug(f"Checking specified platforms against ATT&CK {version}")
+    logger.debug("Checking specified platforms against ATT&CK %s", version)
     valid_platforms = {p.internal_name for p in version_model.platforms}
     specified_platforms = set(platforms)
     if len(specified_platforms) != len(specified_platforms.intersection(valid_platforms)):
         logger.error(f"Checking specified platforms against ATT&CK {version} - some are invalid")
         return jsonify(message="Invalid platforms specified"), 400
-    logger.debug(f"Checking specified platforms against ATT&CK {version} - all are valid")
+    logger.debug("Checking specified platforms against ATT&CK %s - all are valid", version)
 
     # data_sources (format, existence)
-    logger.debug(f"Checking specified data sources against ATT&CK {version}")
+    logger.debug("Checking specified data sources against ATT&CK %s", version)
     valid_data_sources = {s.internal_name for s in version_model.data_sources}
     specified_data_sources = set(data_sources)
     if len(specified_data_sources) != len(specified_data_sources.intersection(valid_data_sources)):
         logger.error(f"Checking specified data sources against ATT&CK {version} - some are invalid")
         return jsonify(message="Invalid data sources specified"), 400
-    logger.debug(f"Checking specified data sources against ATT&CK {version} - all are valid")
+    logger.debug("Checking specified data sources against ATT&CK %s - all are valid", version)
 
     # search (empty & overly-long limits)
     if not search:
@@ -908,7 +908,7 @@ def answer_card_search():
             determine_matching.c.upper_tid, literal_column("ts_rank(tsvec, tsqry)").label("score")
         ).filter(determine_matching.c.does_match)
     ).all()
-    logger.debug(f"query finished - got {len(filter_matching_score)} matching cards")
+    logger.debug("query finished - got %s matching cards", len(filter_matching_score))
 
     result_info = {tech_id: {"score": score} for tech_id, score in filter_matching_score}
 
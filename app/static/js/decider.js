@@ -302,6 +302,8 @@ document.addEventListener('alpine:init', function () {
         // V
         paginatedCards: [], // [[c, c, c], [c, c]] - do not show controls if only 1-page exists
 
+        miniSearch: null, // prebuilt index of answerCards (null -> indexed in-browser on search)
+
         searchStatus: '',
         search: '',
         platforms: [],
@@ -330,8 +332,29 @@ document.addEventListener('alpine:init', function () {
             return response.data;
         },
 
+        async doFetchMiniSearch() {
+            const globalStore = Alpine.store('global');
+            const questionStore = Alpine.store('question');
+
+            const response = await fetchV2({
+                url: `/api/minisearch/${globalStore.versionPicker.cur_version}/${questionStore.id}`,
+            });
+
+            // not fatal - cards get indexed in-browser instead
+            if (response.netFail || !response.ok) {
+                return null;
+            }
+
+            // same as MiniSearch.loadJSON(), response is already parsed
+            return MiniSearch.loadJS(response.data, { fields: ['label', 'content_text'] });
+        },
+
         async init() {
-            const cards = await this.doFetchCards();
+            const [cards, miniSearch] = await Promise.all([
+                this.doFetchCards(),
+                Alpine.store('question').id === 'start' ? this.doFetchMiniSearch() : null,
+            ]);
+            this.miniSearch = miniSearch;
             cards.forEach((card, index) => {
                 const d = document.createElement('div');
                 d.innerHTML = card.content;
@@ -395,11 +418,16 @@ document.addEventListener('alpine:init', function () {
                 } else if (this.search.length > 512) {
                     this.searchStatus = 'Search too long';
                 } else {
-                    const ms = new MiniSearch({ fields: ['label', 'content_text'] });
-                    ms.addAll(cards);
+                    let ms = Alpine.raw(this.miniSearch); // un-proxied, the index isn't reactive state
+                    if (ms === null) {
+                        ms = new MiniSearch({ fields: ['label', 'content_text'] });
+                        ms.addAll(cards);
+                    }
+                    const cardIds = new Set(cards.map((card) => card.id));
                     const results = ms.search(this.search, {
                         prefix: (term) => term.length >= minSearchLength,
                         fuzzy: (term) => (term.length >= minSearchLength ? 0.15 : null),
+                        filter: (result) => cardIds.has(result.id), // prebuilt index holds unfiltered cards
                     });
 
                     const resultsIndex = {};
@@ -0,0 +1,499 @@
+from app.constants import BUILD_SOURCES_DIR
+from app.utils.benchmarks.runner import (
+    Benchmark,
+    add_runner_args,
+    compare_results,
+    time_benchmark,
+    write_results,
+)
+
+import argparse
+import json
+import os
+import secrets
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Benchmarks of the read routes, through the Flask test client of a Kiosk-Mode app on a real Postgres
+# - the DB is either the configured one (.env), or a disposable local cluster (--temp-postgres) removed afterwards
+# - one version - real (--sources) or synthetic (--synthetic) - is installed by the build actions if missing
+# - each route's SQL statement count (and DB time) is recorded next to its latency
+#
+# app.* modules (other than constants / benchmarks) read the DB settings of the environment when imported - so they
+# are imported in functions, after a temporary cluster has put its settings there
+
+SYNTHETIC_VERSION = "v100.0"
+
+# superuser of a temporary cluster, and the kiosk user the build creates in it
+TEMP_ADMIN_NAME = "decider_bench"
+TEMP_KIOSK_NAME = "decider_bench_kiosk"
+TEMP_DATABASE = "decider"  # the kiosk user's grants name the database 'decider'
+
+
+def run(cmd, **kwargs):
+    subprocess.run(cmd, check=True, **kwargs)
+
+
+def postgres_bin(name):
+    # server binaries are rarely on PATH - pg_config knows where they are
+    path = shutil.which(name)
+    if path:
+        return path
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        bin_dir = subprocess.run([pg_config, "--bindir"], capture_output=True, text=True).stdout.strip()
+        if os.path.isfile(os.path.join(bin_dir, name)):
+            return os.path.join(bin_dir, name)
+    raise Exception(f"Couldn't find the Postgres '{name}' binary (on PATH, or pg_config --bindir)")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TempPostgres:
+    """A throwaway Postgres cluster in a temporary directory - trust auth, on 127.0.0.1 only"""
+
+    def __init__(self, port=None):
+        self.port = port or free_port()
+        self.data_dir = None
+        self.running = False
+
+    def start(self):
+        self.data_dir = tempfile.mkdtemp(prefix="decider-bench-pg-")
+        run(
+            [postgres_bin("initdb"), "-D", self.data_dir, "-U", TEMP_ADMIN_NAME, "-A", "trust", "-E", "UTF8"],
+            stdout=subprocess.DEVNULL,
+        )
+        run(
+            [
+                postgres_bin("pg_ctl"),
+                "-D",
+                self.data_dir,
+                "-o",
+                f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1",
+                "-l",
+                os.path.join(self.data_dir, "server.log"),
+                "-w",
+                "start",
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        self.running = True
+        run(
+            [
+                postgres_bin("createdb"),
+                "-h",
+                "127.0.0.1",
+                "-p",
+                str(self.port),
+                "-U",
+                TEMP_ADMIN_NAME,
+                TEMP_DATABASE,
+            ]
+        )
+
+        # what app/env_vars.py reads - kiosk user / cart key / app admin are only needed to exist
+        os.environ.update(
+            DB_HOSTNAME="127.0.0.1",
+            DB_PORT=str(self.port),
+            DB_DATABASE=TEMP_DATABASE,
+            DB_ADMIN_NAME=TEMP_ADMIN_NAME,
+            DB_ADMIN_PASS="",
+            DB_KIOSK_NAME=TEMP_KIOSK_NAME,
+            DB_KIOSK_PASS=secrets.token_hex(16),
+        )
+        os.environ.setdefault("CART_ENC_KEY", secrets.token_hex(16))
+        os.environ.setdefault("APP_ADMIN_EMAIL", "bench@example.com")
+        os.environ.setdefault("APP_ADMIN_PASS", secrets.token_hex(16))
+
+    def stop(self):
+        if self.data_dir is None:
+            return
+        if self.running:
+            subprocess.run(
+                [postgres_bin("pg_ctl"), "-D", self.data_dir, "-m", "fast", "-w", "stop"], stdout=subprocess.DEVNULL
+            )
+            self.running = False
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        self.data_dir = None
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# installing the version
+
+
+def synthetic_sources(scale, seed):
+    out_dir = tempfile.mkdtemp(prefix="decider-bench-sources-")
+    run(
+        [
+            sys.executable,
+            "-m",
+            "app.utils.db.actions.generate_sources",
+            "--output",
+            out_dir,
+            "--scale",
+            str(scale),
+            "--seed",
+            str(seed),
+            "--skip-validate",
+        ]
+    )
+    return out_dir
+
+
+def single_version_sources(sources_dir, version):
+    """A sources dir with just one version's files (+ roles, and a user - full_build needs 1, nobody logs in)"""
+    import bcrypt
+
+    out_dir = tempfile.mkdtemp(prefix="decider-bench-build-")
+    for sub_dir, prefix in [
+        ("enterprise-attack", "enterprise-attack"),
+        ("tree", "tree-content"),
+        ("co_occurrences", "co-occurrences"),
+        ("akas", "akas"),
+        ("mismappings", "mismappings"),
+    ]:
+        src = os.path.join(sources_dir, sub_dir, f"{prefix}-{version}.json")
+        if os.path.isfile(src):
+            os.makedirs(os.path.join(out_dir, sub_dir))
+            os.symlink(os.path.abspath(src), os.path.join(out_dir, sub_dir, os.path.basename(src)))
+
+    shutil.copyfile(os.path.join(sources_dir, "role.json"), os.path.join(out_dir, "role.json"))
+    with open(os.path.join(out_dir, "user.json"), "w") as fhandle:
+        password = bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt()).decode("utf-8")
+        json.dump([{"email": "bench@example.com", "password": password, "role_id": 3}], fhandle)
+    return out_dir
+
+
+def installed_versions(config_name):
+    from flask import Flask
+    from app.models import db
+    from app.utils.db.util import app_config_selector
+    import app.utils.db.read as db_read
+
+    app = Flask(__name__)
+    app.config.from_object(app_config_selector(config_name))
+    db.init_app(app)
+    with app.app_context():
+        try:
+            return set(db_read.attack.versions())
+        except Exception:
+            return set()  # tables not made yet
+
+
+def build_action(action, sources_dir, *args):
+    # the build actions are run as they would be by hand - in their own process, reading sources_dir
+    # returns success - their (long) output is only shown when they fail
+    env = {**os.environ, "BUILD_SOURCES_DIR": sources_dir, "FULL_BUILD_MODE": "overwrite"}
+    cmd = [sys.executable, "-m", f"app.utils.db.actions.{action}", *args]
+    done = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if done.returncode != 0:
+        print("\n".join((done.stdout + done.stderr).splitlines()[-40:]))
+    return done.returncode == 0
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# routes
+
+
+def route_params(version):
+    """IDs / terms of the installed version to request: the widest Tactic, the Technique with the most
+    SubTechniques (and one of them), Techniques with CoOccurrences, filter values, and search terms
+    """
+    from app.models import db, CoOccurrence, Platform, Tactic, Technique
+    from app.models import attack_version_platform_map, tactic_technique_map
+    from sqlalchemy import func
+    from sqlalchemy.orm import aliased
+
+    tactic_sizes = (
+        db.session.query(Tactic.tact_id, func.count(Technique.uid))
+        .filter(Tactic.attack_version == version)
+        .join(tactic_technique_map, tactic_technique_map.c.tactic == Tactic.uid)
+        .join(Technique, tactic_technique_map.c.technique == Technique.uid)
+        .filter(Technique.parent_uid == None)
+        .group_by(Tactic.uid)
+        .order_by(func.count(Technique.uid).desc(), Tactic.uid)
+    ).all()
+
+    sub = aliased(Technique)
+    base_uid, base_id = (
+        db.session.query(Technique.uid, Technique.tech_id)
+        .filter(Technique.attack_version == version)
+        .join(sub, sub.parent_uid == Technique.uid)
+        .group_by(Technique.uid)
+        .order_by(func.count(sub.uid).desc(), Technique.tech_id)
+    ).first()
+    base_tact_id = (
+        db.session.query(Tactic.tact_id)
+        .join(tactic_technique_map, tactic_technique_map.c.tactic == Tactic.uid)
+        .filter(tactic_technique_map.c.technique == base_uid)
+        .order_by(Tactic.uid)
+    ).first()[0]
+    sub_id = (
+        db.session.query(Technique.tech_id).filter(Technique.parent_uid == base_uid).order_by(Technique.tech_id)
+    ).first()[0]
+
+    # a Technique without SubTechniques under the widest Tactic
+    leaf_id = (
+        db.session.query(Technique.tech_id)
+        .filter(Technique.attack_version == version, Technique.parent_uid == None)
+        .join(tactic_technique_map, tactic_technique_map.c.technique == Technique.uid)
+        .join(Tactic, tactic_technique_map.c.tactic == Tactic.uid)
+        .filter(Tactic.tact_id == tactic_sizes[0][0])
+        .outerjoin(sub, sub.parent_uid == Technique.uid)
+        .filter(sub.uid == None)
+        .order_by(Technique.tech_id)
+    ).first()[0]
+
+    co_oc_ids = [
+        tech_id
+        for (tech_id,) in (
+            db.session.query(Technique.tech_id)
+            .filter(Technique.attack_version == version)
+            .join(CoOccurrence, CoOccurrence.technique_i == Technique.uid)
+            .group_by(Technique.tech_id)
+            .order_by(func.count().desc(), Technique.tech_id)
+            .limit(10)
+        ).all()
+    ]
+
+    platforms = [
+        name
+        for (name,) in (
+            db.session.query(Platform.internal_name)
+            .join(attack_version_platform_map, attack_version_platform_map.c.platform == Platform.uid)
+            .filter(attack_version_platform_map.c.version == version)
+            .order_by(Platform.uid)
+            .limit(2)
+        ).all()
+    ]
+
+    # search terms: words of Technique names - common ones, so searches find (and highlight) plenty
+    words = {}
+    for (name,) in db.session.query(Technique.tech_name).filter(Technique.attack_version == version).all():
+        for word in name.lower().split():
+            if word.isalpha() and len(word) > 3:
+                words[word] = words.get(word, 0) + 1
+    common = sorted(words, key=lambda w: (-words[w], w))[:3] or ["data", "file", "system"]
+    common += common[:1] * (3 - len(common))
+
+    return dict(
+        widest_tact_id=tactic_sizes[0][0],
+        base_id=base_id,
+        base_tact_id=base_tact_id,
+        sub_id=sub_id,
+        leaf_id=leaf_id,
+        co_oc_ids=co_oc_ids,
+        platforms=platforms,
+        words=common,
+    )
+
+
+def make_benchmarks(client, version, params):
+    p = params
+    w1, w2, w3 = p["words"]
+    benchmarks = []
+
+    def get(name, url, query=None):
+        def fn():
+            response = client.get(url, query_string=query)
+            if response.status_code != 200:
+                raise Exception(f"{name}: {url} {query or ''} responded with HTTP {response.status_code}")
+
+        benchmarks.append(Benchmark(name, fn))
+
+    def post(name, url, body):
+        def fn():
+            response = client.post(url, json=body)
+            if response.status_code != 200:
+                raise Exception(f"{name}: {url} {body} responded with HTTP {response.status_code}")
+
+        benchmarks.append(Benchmark(name, fn))
+
+    # answer cards
+    get("api/answers[start]", "/api/answers/", {"index": "start", "version": version})
+    get("api/answers[tactic]", "/api/answers/", {"index": p["widest_tact_id"], "version": version})
+    get(
+        "api/answers[technique]",
+        "/api/answers/",
+        {"index": p["base_id"], "tactic": p["base_tact_id"], "version": version},
+    )
+
+    # searches
+    get("search/full[word]", "/search/full", {"version": version, "search": w1})
+    get("search/full[boolean]", "/search/full", {"version": version, "search": f'({w1} | "{w2} {w3}") & ~{w3}*'})
+    get(
+        "search/full[filtered]",
+        "/search/full",
+        {"version": version, "search": f"{w2}*", "tactics": [p["widest_tact_id"]], "platforms": p["platforms"]},
+    )
+    post("search/mini[name]", f"/search/mini/{version}", {"search": w1})
+    post("search/mini[id]", f"/search/mini/{version}", {"search": p["base_id"][:4]})
+    get(
+        "search/answer_cards[tactic]",
+        "/search/answer_cards",
+        {"version": version, "index": p["widest_tact_id"], "search": w1},
+    )
+    get(
+        "search/answer_cards[technique]",
+        "/search/answer_cards",
+        {"version": version, "index": p["base_id"], "tactic_context": p["base_tact_id"], "search": w2},
+    )
+
+    # co-occurrences - one Technique, and a cart's worth
+    if p["co_oc_ids"]:
+        get("api/cooccurrences[single]", "/api/cooccurrences", {"version": version, "tech_ids": p["co_oc_ids"][:1]})
+        get("api/cooccurrences[multi]", "/api/cooccurrences", {"version": version, "tech_ids": p["co_oc_ids"]})
+
+    # success pages
+    get("success[technique]", f"/question/{version}/{p['widest_tact_id']}/{p['leaf_id']}")
+    get("success[subtechnique]", f"/question/{version}/{p['base_tact_id']}/{p['sub_id'].replace('.', '/')}")
+    get("success[no_tactic]", f"/no_tactic/{version}/{p['sub_id'].replace('.', '/')}")
+
+    return benchmarks
+
+
+def count_queries(benchmark):
+    from app.utils.db.query_counter import start_count, stop_count
+
+    count = start_count()
+    try:
+        benchmark.fn()
+    finally:
+        stop_count(count)
+    return count
+
+
+def compare_query_counts(results, baseline_path):
+    # statement counts don't vary run to run - any increase is a regression (e.g. an N+1 lazy load)
+    with open(baseline_path, "r") as fhandle:
+        baseline = json.load(fhandle)["results"]
+
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get(name, {}).get("queries")
+        if (old is not None) and (stats["queries"] > old):
+            print(f"{name} now runs {stats['queries']} SQL statements, up from {old}")
+            regressions.append(name)
+    return regressions
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser("Benchmarks Decider's read routes (latency + SQL statement counts) on Postgres.")
+    parser.add_argument("--config", default="KioskConfig", help="Kiosk-Mode config the routes are served with.")
+    parser.add_argument("--admin-config", default="DefaultConfig", help="Config of the builds (installing).")
+    parser.add_argument(
+        "--temp-postgres", action="store_true", help="Run on a disposable local cluster (needs initdb / pg_ctl)."
+    )
+    parser.add_argument("--port", type=int, help="Port of the --temp-postgres cluster (default: a free one).")
+    parser.add_argument("--version", help="ATT&CK version to benchmark (installed from --sources if missing).")
+    parser.add_argument("--sources", default=BUILD_SOURCES_DIR, help="Build sources dir to install the version from.")
+    parser.add_argument("--synthetic", type=float, help=f"Install synthetic content ({SYNTHETIC_VERSION}) at a scale.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the --synthetic content.")
+    add_runner_args(parser)
+    parser.set_defaults(min_time=1.0)
+    args = parser.parse_args()
+
+    if (args.synthetic is None) == (args.version is None):
+        print("Either --version (real content) or --synthetic (a scale) is needed, not both. Exiting.")
+        sys.exit(1)
+    version = args.version or SYNTHETIC_VERSION
+
+    temp_pg = TempPostgres(args.port) if args.temp_postgres else None
+    temp_dirs = []
+    try:
+        if temp_pg:
+            print(f"Starting a temporary Postgres cluster on port {temp_pg.port}..")
+            try:
+                temp_pg.start()
+            except Exception as ex:
+                print(f"Failed to start a temporary Postgres cluster - due to:\n{ex}")
+                sys.exit(2)
+
+        # SOURCES / INSTALL -------------------------------------------------------------------------------------------
+
+        sources_dir = args.sources
+        if args.synthetic is not None:
+            print(f"Generating synthetic content at scale {args.synthetic}..")
+            sources_dir = synthetic_sources(args.synthetic, args.seed)
+            temp_dirs.append(sources_dir)
+
+        t0 = time.time()
+        if temp_pg:
+            print(f"Building {version} into the temporary cluster..")
+            build_dir = single_version_sources(sources_dir, version)
+            temp_dirs.append(build_dir)
+            if not build_action("full_build", build_dir, "--config", args.admin_config):
+                print("The full_build failed. Exiting.")
+                sys.exit(3)
+            print(f"Built in {time.time() - t0:.1f}s")
+
+        elif version not in installed_versions(args.admin_config):
+            print(f"Adding {version} to the database..")
+            if not build_action("add_version", sources_dir, "--config", args.admin_config, "--version", version):
+                print("The add_version failed (a fresh database needs a full_build, or use --temp-postgres). Exiting.")
+                sys.exit(3)
+            print(f"Added in {time.time() - t0:.1f}s")
+
+        # BENCHMARKING ------------------------------------------------------------------------------------------------
+
+        from app.utils.db.actions.export_static import kiosk_app
+
+        app = kiosk_app(args.config)
+        app.config["WTF_CSRF_ENABLED"] = False  # Mini-Search is a POST - the test client holds no token
+        if not app.config.get("QUERY_COUNTING"):
+            print("Note: QUERY_COUNTING is off in this config - SQL statements won't be counted")
+
+        client = app.test_client()
+        with app.app_context():
+            params = route_params(version)
+        benchmarks = make_benchmarks(client, version, params)
+
+        print(f"\n{'route':<40}{'median':>12}{'p-stdev':>9}{'queries':>9}{'db time':>11}")
+        print("-" * 81)
+        results = {}
+        for benchmark in benchmarks:
+            if args.filter and (args.filter not in benchmark.name):
+                continue
+            stats = time_benchmark(benchmark, args.min_time, args.repeat)
+            count = count_queries(benchmark)
+            stats["queries"] = count.count
+            stats["db_seconds"] = count.seconds
+            results[benchmark.name] = stats
+            print(
+                f"{benchmark.name:<40}{stats['median'] * 1000:>10.2f}ms"
+                f"{stats['stdev'] / stats['median'] * 100 if stats['median'] else 0:>8.1f}%"
+                f"{count.count:>9}{count.seconds * 1000:>9.2f}ms"
+            )
+
+    finally:
+        if temp_pg:
+            temp_pg.stop()
+        for temp_dir in temp_dirs:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    context = {"version": version, "synthetic": args.synthetic, "seed": args.seed if args.synthetic else None}
+    if args.output:
+        write_results(args.output, "api", results, context)
+
+    if args.baseline:
+        regressions = compare_results(results, args.baseline, args.threshold, context)
+        regressions += compare_query_counts(results, args.baseline)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from flask import Flask
+
+from app.conf import Config
+from app.models import db, AttackVersion, Tactic, Technique
+from app.routes.api import start_answer_cards, tactic_answer_cards, technique_answer_cards
+from app.routes.misc import is_cart_format_valid, is_query_db_for_cart_successful
+from app.routes.question import question_
+from app.routes.search import parse_search_str, tsqry_rep, plain_rep
+from app.routes.utils import build_url, checkbox_filters_component, outgoing_markdown
+from app.utils.db.actions.generate_sources import BASE_SCALE, PLATFORMS, make_catalog, scaled_counts, tree_content
+from app.utils.db.create.util import transform_description_citations
+from app.utils.benchmarks.runner import Benchmark, add_runner_args, compare_results, run_benchmarks, write_results
+
+import argparse
+import random
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Micro-benchmarks of the hot pure-Python paths - no Postgres needed
+# Inputs are synthetic ATT&CK content (app.utils.db.actions.generate_sources), so results are repeatable anywhere
+
+VERSION = "v100.0"
+
+# inputs per call of the batch benchmarks
+BATCH = 50
+
+SEARCHES = [
+    "credential",
+    "dump*",
+    "registry persistence",
+    '"scheduled task"',
+    '"remote service"* | tunnel',
+    "(kernel | driver) & ~firmware",
+    "password (hash | token) ~cloud",
+    '(phishing | "email macro") & (payload | implant*) & ~~download',
+]
+
+
+def make_app():
+    # just enough app for url_for() / current_app.config - an in-memory SQLite DB holds the (1) AttackVersion
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["BASE_TECHNIQUE_ANSWER"] = Config.BASE_TECHNIQUE_ANSWER
+    db.init_app(app)
+    app.register_blueprint(question_)
+    return app
+
+
+def make_content(scale, seed):
+    """Models (unsaved) and source items of a synthetic version"""
+    counts = scaled_counts(scale)
+    catalog = make_catalog(random.Random(seed), counts, BASE_SCALE["tactics"])
+    tree = tree_content(catalog, catalog["techniques"], seed)
+
+    tactics = {}
+    for uid, stix in enumerate(catalog["tactics"], start=1):
+        ref = stix["external_references"][0]
+        tactics[stix["x_mitre_shortname"]] = Tactic(
+            uid=uid,
+            attack_version=VERSION,
+            tact_id=ref["external_id"],
+            tact_name=stix["name"],
+            tact_url=ref["url"],
+            tact_answer=tree[ref["external_id"]]["answer"],
+            tact_question=tree[ref["external_id"]]["question"],
+            tact_shortname=stix["x_mitre_shortname"],
+        )
+
+    techniques = []  # (Technique, its Tactics, its platforms)
+    base_uids = {}
+    for uid, stix in enumerate(catalog["techniques"], start=1):
+        ref = stix["external_references"][0]
+        tech_id = ref["external_id"]
+        if "." not in tech_id:
+            base_uids[tech_id] = uid
+        technique = Technique(
+            uid=uid,
+            attack_version=VERSION,
+            parent_uid=base_uids[tech_id.split(".")[0]] if "." in tech_id else None,
+            tech_id=tech_id,
+            tech_name=stix["name"],
+            full_tech_name=stix["name"],
+            tech_url=ref["url"],
+            tech_description=transform_description_citations(stix),
+            tech_answer=tree[tech_id]["answer"],
+            tech_question=tree[tech_id]["question"],
+        )
+        phases = [tactics[kcp["phase_name"]] for kcp in stix["kill_chain_phases"]]
+        platforms = [p.lower().replace(" ", "_") for p in stix["x_mitre_platforms"]]
+        techniques.append((technique, phases, platforms))
+
+    return catalog, list(tactics.values()), techniques
+
+
+def make_benchmarks(catalog, tactics, techniques, seed):
+    rng = random.Random(seed)
+    data_sources = [ds["name"].replace(" ", "_").lower() for ds in catalog["data_sources"]]
+    benchmarks = []
+
+    def add(name, fn, items=1):
+        benchmarks.append(Benchmark(name, fn, items))
+
+    # markdown rendering - short (answer card) and long (description) content
+    answers = [t.tech_answer for t, _, _ in rng.sample(techniques, BATCH)]
+    descriptions = [t.tech_description for t, _, _ in rng.sample(techniques, BATCH)]
+    add("outgoing_markdown[answer]", lambda: [outgoing_markdown(a) for a in answers], BATCH)
+    add("outgoing_markdown[description]", lambda: [outgoing_markdown(d) for d in descriptions], BATCH)
+
+    # search string parsing / representations
+    parsed = [parse_search_str(s) for s in SEARCHES]
+    add("parse_search_str", lambda: [parse_search_str(s) for s in SEARCHES], len(SEARCHES))
+    add("tsqry_rep", lambda: [tsqry_rep(p.bool_expr, p.sym_to_term) for p in parsed], len(SEARCHES))
+    add("plain_rep", lambda: [plain_rep(p.bool_expr, p.sym_to_term) for p in parsed], len(SEARCHES))
+
+    # citation transforms of the build
+    stix_techniques = rng.sample(catalog["techniques"], BATCH)
+    add(
+        "transform_description_citations",
+        lambda: [transform_description_citations(t) for t in stix_techniques],
+        BATCH,
+    )
+
+    # filter components / URLs
+    add("checkbox_filters_component[platforms]", lambda: checkbox_filters_component("platform", PLATFORMS, "", ""))
+    add(
+        "checkbox_filters_component[data_sources]",
+        lambda: checkbox_filters_component("data_source", data_sources, "", "", "Data Source"),
+    )
+    url_sample = [
+        (t, phases[0].tact_id, end) for (t, phases, _), end in zip(rng.sample(techniques, BATCH), [0, 1] * BATCH)
+    ]
+    add("build_url", lambda: [build_url(t, tact_id, VERSION, end) for t, tact_id, end in url_sample], BATCH)
+
+    # answer cards, from query rows as the answers_api_* queries return them
+    num_subs = {}
+    for technique, _, _ in techniques:
+        if technique.parent_uid is not None:
+            num_subs[technique.parent_uid] = num_subs.get(technique.parent_uid, 0) + 1
+    by_uid = {t.uid: (t, phases, platforms) for t, phases, platforms in techniques}
+
+    start_rows = [
+        (
+            tactic,
+            sum(1 for t, phases, _ in techniques if (tactic in phases) and (t.parent_uid is None)),
+            sorted({p for _, phases, platforms in techniques if tactic in phases for p in platforms}),
+            rng.sample(data_sources, min(len(data_sources), 12)) + [None],
+        )
+        for tactic in tactics
+    ]
+    add("answer_cards[start]", lambda: start_answer_cards(start_rows, VERSION), len(start_rows))
+
+    widest = max(tactics, key=lambda tactic: sum(1 for _, phases, _ in techniques if tactic in phases))
+    tactic_rows = [
+        (t, num_subs.get(t.uid, 0), platforms, rng.sample(data_sources, min(len(data_sources), 4)))
+        for t, phases, platforms in techniques
+        if (widest in phases) and (t.parent_uid is None)
+    ]
+    add("answer_cards[tactic]", lambda: tactic_answer_cards(tactic_rows, widest.tact_id, VERSION), len(tactic_rows))
+
+    parent_uid = max(num_subs, key=num_subs.get)
+    parent, parent_phases, _ = by_uid[parent_uid]
+    technique_rows = [
+        (parent, t, platforms, rng.sample(data_sources, min(len(data_sources), 4)))
+        for t, _, platforms in techniques
+        if t.uid == parent_uid or t.parent_uid == parent_uid
+    ]
+    add(
+        "answer_cards[technique]",
+        lambda: technique_answer_cards(technique_rows, parent_phases[0].tact_id, VERSION),
+        len(technique_rows),
+    )
+
+    # cart validation - the version lookup is answered from the session's identity map after the first call
+    cart = {
+        "title": "Benchmark Cart",
+        "version": VERSION,
+        "entries": [
+            {"index": t.tech_id, "tactic": phases[0].tact_id, "name": t.tech_name, "notes": "", "tacticName": ""}
+            for t, phases, _ in rng.sample(techniques, BATCH)
+        ],
+    }
+    tacts_and_techs = {}
+    for entry in cart["entries"]:
+        tacts_and_techs.setdefault(entry["tactic"], [entry["tactic"], "", "", []])[3].append(
+            [entry["index"], entry["name"], ""]
+        )
+    tacts_and_techs = list(tacts_and_techs.values())
+    add("is_cart_format_valid", lambda: is_cart_format_valid(cart), BATCH)
+    add("is_query_db_for_cart_successful", lambda: is_query_db_for_cart_successful(cart, tacts_and_techs), BATCH)
+
+    return benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "Micro-benchmarks of Decider's hot pure-Python paths (no database server needed)."
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Size of the synthetic content (1 = ATT&CK v14.1).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic content / input sampling.")
+    add_runner_args(parser)
+    args = parser.parse_args()
+
+    print(f"Generating synthetic content at scale {args.scale}..")
+    catalog, tactics, techniques = make_content(args.scale, args.seed)
+
+    app = make_app()
+    with app.test_request_context():
+        AttackVersion.__table__.create(db.engine)
+        db.session.add(AttackVersion(version=VERSION))
+        db.session.commit()
+
+        benchmarks = make_benchmarks(catalog, tactics, techniques, args.seed)
+        print(f"\n{'benchmark':<50}{'median/call':>16}{'stdev':>8}{'median/item':>19}")
+        print("-" * 93)
+        results = run_benchmarks(benchmarks, args.min_time, args.repeat, args.filter)
+
+    context = {"scale": args.scale, "seed": args.seed}
+    if args.output:
+        write_results(args.output, "micro", results, context)
+
+    if args.baseline:
+        if compare_results(results, args.baseline, args.threshold, context):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
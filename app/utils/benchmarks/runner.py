@@ -0,0 +1,172 @@
+# shared parts of the benchmark suites: timing, machine metadata, JSON results, and baseline comparison
+
+from importlib import metadata as importlib_metadata
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+# installed package versions recorded with results - a dependency upgrade can explain a change as well as code can
+PACKAGES = ["Flask", "Werkzeug", "SQLAlchemy", "Flask-SQLAlchemy", "psycopg2-binary", "Markdown", "bleach", "lxml"]
+
+
+class Benchmark:
+    """A named function to time
+
+    - fn does one unit of work (often a batch of `items` inputs) and is called many times - setup is done beforehand
+    - times are reported per call, and per item
+    """
+
+    def __init__(self, name, fn, items=1):
+        self.name = name
+        self.fn = fn
+        self.items = items
+
+
+def time_benchmark(benchmark, min_time=0.2, repeat=5):
+    """Times benchmark.fn as timeit does - calls per round grow until a round takes min_time, then the rounds are
+    repeated - returns the per-call stats in seconds
+    """
+    fn = benchmark.fn
+    fn()  # warm-up (caches, lazy imports)
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        calls = 1
+        while True:
+            t0 = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_time:
+                break
+            calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9) * 1.1))
+
+        rounds = [elapsed / calls]
+        for _ in range(repeat - 1):
+            t0 = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            rounds.append((time.perf_counter() - t0) / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(rounds)
+    return {
+        "calls_per_round": calls,
+        "rounds": len(rounds),
+        "items": benchmark.items,
+        "min": min(rounds),
+        "median": median,
+        "mean": statistics.mean(rounds),
+        "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        "median_per_item": median / benchmark.items,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True, timeout=5).stdout
+        return out.stdout.strip() + ("-dirty" if dirty.strip() else "")
+    except Exception:
+        return None
+
+
+def machine_metadata():
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = importlib_metadata.version(package)
+        except importlib_metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "node": platform.node(),
+        "system": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "commit": git_commit(),
+        "packages": packages,
+    }
+
+
+def run_benchmarks(benchmarks, min_time=0.2, repeat=5, name_filter=None):
+    results = {}
+    for benchmark in benchmarks:
+        if name_filter and (name_filter not in benchmark.name):
+            continue
+        stats = time_benchmark(benchmark, min_time, repeat)
+        results[benchmark.name] = stats
+        print(
+            f"{benchmark.name:<50}{stats['median'] * 1e6:>14.1f}us"
+            f"{stats['stdev'] / stats['median'] * 100 if stats['median'] else 0:>8.1f}%"
+            f"{stats['median_per_item'] * 1e6:>14.2f}us/item"
+        )
+    return results
+
+
+def write_results(path, suite, results, extra=None):
+    with open(path, "w") as fhandle:
+        json.dump(
+            {"suite": suite, "machine": machine_metadata(), **(extra or {}), "results": results}, fhandle, indent=2
+        )
+    print(f"\nWrote results to {path}")
+
+
+def compare_results(results, baseline_path, threshold, context=None, key="median"):
+    """Prints each benchmark's change against a previous results file - returns the names that got slower than
+    (1 + threshold) times the baseline
+
+    context: the run's settings written with its results (e.g. scale) - a baseline run with others is pointed out
+    """
+    with open(baseline_path, "r") as fhandle:
+        baseline = json.load(fhandle)
+
+    if baseline.get("machine", {}).get("node") != platform.node():
+        print(f"\nNote: the baseline was run on another machine ({baseline.get('machine', {}).get('node')})")
+    for setting, value in (context or {}).items():
+        if baseline.get(setting) != value:
+            print(f"Note: the baseline was run with {setting}={baseline.get(setting)}, this with {setting}={value}")
+
+    print(f"\n{'benchmark':<50}{'baseline':>14}{'current':>14}{'change':>10}")
+    print("-" * 88)
+    regressions = []
+    for name, stats in results.items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<50}{'-':>14}{stats[key] * 1e6:>12.1f}us{'new':>10}")
+            continue
+        change = (stats[key] - old[key]) / old[key] if old[key] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<50}{old[key] * 1e6:>12.1f}us{stats[key] * 1e6:>12.1f}us{change * 100:>+9.1f}%{flag}")
+    print("-" * 88)
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {threshold * 100:.0f}%")
+    else:
+        print(f"No benchmark slower than the baseline by more than {threshold * 100:.0f}%")
+    return regressions
+
+
+def add_runner_args(parser):
+    # arguments shared by the suites
+    parser.add_argument("--filter", help="Only run benchmarks with names containing this.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds each timing round runs for at least.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark (median is compared).")
+    parser.add_argument("--output", help="Write the results (with machine metadata) to this JSON file.")
+    parser.add_argument("--baseline", help="Results JSON of a previous run to compare against.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Slowdown vs the baseline that counts as a regression (0.1=10%%)."
+    )
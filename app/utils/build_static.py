@@ -0,0 +1,131 @@
+# standalone script to fingerprint + precompress app/static for far-future caching
+
+try:
+    import brotli
+except ImportError:  # optional - only needed for .br variants
+    brotli = None
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+# name of the manifest in the static folder: {"js/decider.js": "js/decider.1a2b3c4d.js", ...}
+STATIC_MANIFEST = "manifest.json"
+
+# hex digits of content hash put in file names
+HASH_LENGTH = 8
+
+COMPRESSED_EXTS = (".gz", ".br")
+
+
+def hashed_name(rel_path, content):
+    # js/decider.js -> js/decider.<hash>.js
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def load_manifest(static_dir):
+    # gives {} when the static folder was never fingerprinted
+    try:
+        with open(os.path.join(static_dir, STATIC_MANIFEST), "r") as fhandle:
+            return json.load(fhandle)
+    except FileNotFoundError:
+        return {}
+
+
+def compress(path, content):
+    # writes .gz (and .br, if brotli is installed) siblings - reproducible, so rebuilds don't change them
+    with open(f"{path}.gz", "wb") as fhandle:
+        fhandle.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(f"{path}.br", "wb") as fhandle:
+            fhandle.write(brotli.compress(content))
+
+
+def clean_static(static_dir):
+    # removes every output of build_static(): hashed copies (per the manifest), .gz / .br siblings, the manifest
+    # - returns the number of files removed, leaving app/static as in the repo (unfingerprinted, served as-is)
+    removed = 0
+    for old in load_manifest(static_dir).values():
+        for path in [old] + [old + ext for ext in COMPRESSED_EXTS]:
+            if os.path.isfile(os.path.join(static_dir, path)):
+                os.remove(os.path.join(static_dir, path))
+                removed += 1
+
+    for dir_path, _, file_names in os.walk(static_dir):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            # only compressed siblings of an asset - not archives shipped as assets themselves
+            if file_name.endswith(COMPRESSED_EXTS) and os.path.isfile(os.path.splitext(path)[0]):
+                os.remove(path)
+                removed += 1
+
+    if os.path.isfile(os.path.join(static_dir, STATIC_MANIFEST)):
+        os.remove(os.path.join(static_dir, STATIC_MANIFEST))
+        removed += 1
+    return removed
+
+
+def build_static(static_dir):
+    # copies each asset to a content-hashed name, compresses originals + copies, and records the manifest
+    # previous run's outputs are removed first, so only current hashes remain
+    clean_static(static_dir)
+
+    manifest = {}
+    for dir_path, _, file_names in os.walk(static_dir):
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            rel_path = os.path.relpath(path, static_dir).replace(os.sep, "/")
+            if (rel_path == STATIC_MANIFEST) or file_name.endswith(COMPRESSED_EXTS):
+                continue
+
+            with open(path, "rb") as fhandle:
+                content = fhandle.read()
+
+            hashed = hashed_name(rel_path, content)
+            with open(os.path.join(static_dir, hashed), "wb") as fhandle:
+                fhandle.write(content)
+            manifest[rel_path] = hashed
+
+            compress(path, content)
+            compress(os.path.join(static_dir, hashed), content)
+
+    with open(os.path.join(static_dir, STATIC_MANIFEST), "w") as fhandle:
+        json.dump(manifest, fhandle, indent=4, sort_keys=True)
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "Fingerprints static assets (content-hashed copies + manifest) and writes .gz / .br variants of them."
+    )
+    parser.add_argument(
+        "--static-dir",
+        default=os.path.join(os.path.dirname(os.path.realpath(__file__)), "../static"),
+        help="Static folder to process (defaults to app/static).",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Only remove previous outputs (manifest, hashed copies, .gz / .br) - templates then link the originals.",
+    )
+    args = parser.parse_args()
+
+    static_dir = os.path.abspath(args.static_dir)
+    if args.clean:
+        print(f"Removed {clean_static(static_dir)} generated files from {static_dir}")
+        return
+
+    manifest = build_static(static_dir)
+
+    print(f"Fingerprinted {len(manifest)} static files in {static_dir}")
+    if brotli is None:
+        print("brotli is not installed (pip install brotli) - only .gz variants were written")
+
+
+if __name__ == "__main__":
+    main()
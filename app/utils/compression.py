@@ -0,0 +1,162 @@
+try:
+    import brotli
+except ImportError:  # optional - only needed for br encoding
+    brotli = None
+
+from werkzeug.datastructures import Headers, ResponseCacheControl
+from werkzeug.http import parse_accept_header, parse_cache_control_header
+
+from collections import OrderedDict
+import gzip
+import hashlib
+import threading
+
+# content types worth compressing (others, like images / fonts, are already compressed)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+
+class CompressedBodyCache:
+    # LRU of compressed bodies, keyed by (encoding, digest of uncompressed body), bounded by total bytes
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing responses (br if available, else gzip) per the request's Accept-Encoding
+
+    Only compresses when all hold:
+    - body is at least min_size bytes, and of a compressible Content-Type
+    - response isn't already encoded, partial (206), bodiless (HEAD / 204 / 304), or marked no-transform
+
+    Keeps HTTP semantics intact:
+    - Content-Length is set to the compressed size (keep-alive stays usable, no chunking)
+    - Vary: Accept-Encoding is added to compressible responses
+    - a strong ETag is made weak, as the encoded bytes differ - If-None-Match (a weak comparison) still matches
+
+    Responses that don't qualify by their headers are passed through as-is (streamed, e.g. files)
+    Compressed bodies of cacheable responses (not no-store / private) are kept in an LRU of cache_bytes total
+    """
+
+    def __init__(self, app, min_size=1024, gzip_level=6, brotli_quality=5, cache_bytes=32 * 1024 * 1024):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedBodyCache(cache_bytes) if cache_bytes else None
+
+    def pick_encoding(self, environ):
+        accepted = parse_accept_header(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+        return accepted.best_match(offered)
+
+    def compress(self, encoding, body):
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def is_candidate(self, status, headers):
+        # decided on headers alone - everything else streams through untouched
+        cache_control = parse_cache_control_header(headers.get("Cache-Control"), cls=ResponseCacheControl)
+        length = headers.get("Content-Length")
+        return (
+            headers.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+            and ((length is None) or (int(length) >= self.min_size))
+            and ("Content-Encoding" not in headers)
+            and ("Content-Range" not in headers)
+            and (not status.startswith(("204", "206", "304")))
+            and ("no-transform" not in cache_control)  # (.no_transform reads None when set, on Werkzeug 2.x)
+        )
+
+    def __call__(self, environ, start_response):
+        encoding = self.pick_encoding(environ)
+        if (encoding is None) or (environ.get("REQUEST_METHOD") == "HEAD"):
+            # sent as-is - yet still varies by Accept-Encoding, so caches don't hand it to clients that accept more
+            def vary_start_response(status, headers, exc_info=None):
+                headers = Headers(headers)
+                if headers.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+                    add_vary(headers, "Accept-Encoding")
+                return start_response(status, headers.to_wsgi_list(), exc_info)
+
+            return self.app(environ, vary_start_response)
+
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            headers = Headers(headers)
+            if headers.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+                add_vary(headers, "Accept-Encoding")
+            if status.startswith("304"):
+                weaken_etag(headers)  # matches the ETag the (encoded) 200 would carry
+            if not self.is_candidate(status, headers):
+                return start_response(status, headers.to_wsgi_list(), exc_info)
+
+            captured.update(status=status, headers=headers, exc_info=exc_info, chunks=[])
+            return captured["chunks"].append
+
+        app_iter = self.app(environ, capture_start_response)
+        if not captured:
+            return app_iter
+
+        try:
+            body = b"".join(captured["chunks"]) + b"".join(app_iter)
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+
+        status, headers = captured["status"], captured["headers"]
+        if len(body) >= self.min_size:
+            cache_control = parse_cache_control_header(headers.get("Cache-Control"), cls=ResponseCacheControl)
+            cacheable = (self.cache is not None) and not (cache_control.no_store or cache_control.private)
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest()) if cacheable else None
+            compressed = self.cache.get(key) if cacheable else None
+            if compressed is None:
+                compressed = self.compress(encoding, body)
+                if cacheable:
+                    self.cache.put(key, compressed)
+
+            body = compressed
+            headers["Content-Encoding"] = encoding
+            weaken_etag(headers)
+
+        headers["Content-Length"] = str(len(body))
+        start_response(status, headers.to_wsgi_list(), captured["exc_info"])
+        return [body]
+
+
+def add_vary(headers, field):
+    vary = headers.get("Vary", "")
+    if field.lower() not in [v.strip().lower() for v in vary.split(",")]:
+        headers["Vary"] = f"{vary}, {field}" if vary else field
+
+
+def weaken_etag(headers):
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
@@ -3,7 +3,13 @@ from flask import Flask
 from app.models import db
 
 from app.utils.db.source_loader import SourceManager
-from app.utils.db.util import option_selector, app_config_selector
+from app.utils.db.util import (
+    option_selector,
+    app_config_selector,
+    build_report,
+    write_build_report,
+    write_build_report_at_exit,
+)
 import app.utils.db.read as db_read
 import app.utils.db.create as db_create
 
@@ -22,6 +28,8 @@ def main():
     parser = argparse.ArgumentParser("Adds a new ATT&CK version to the DB from the local disk.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
     parser.add_argument("--version", help="ATT&CK version to be added.")
+    parser.add_argument("--report", help="Path to write a JSON report of per-stage timings / row counts to.")
+    parser.add_argument("--compare", help="Path of a previous JSON report to compare this run's stages against.")
     args = parser.parse_args()
 
     # ensure all-or-nothing command-line argument pick
@@ -150,6 +158,9 @@ def main():
         # BUILDING PROCESS --------------------------------------------------------------------------------------------
 
         t0 = time.time()
+        build_report.start("add_version", version=to_install)
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report_at_exit(args.report, args.compare)
 
         # ATT&CK + Tree content
         try:
@@ -195,10 +206,21 @@ def main():
                 )
                 sys.exit(10)
 
+        # Source hash (lets FULL_BUILD_MODE=reconcile see this version as up to date)
+        try:
+            db_create.build_state.record_source(to_install, src_mgr.version_hash(to_install))
+        except Exception as ex:
+            tfail = time.time() - t0
+            print(f"Failed to record sources of version {to_install} at {tfail:.1f}s into build - due to:\n{ex}")
+            sys.exit(11)
+
         print("\n------------------------------------------------\n")
         tdone = time.time() - t0
         print(f"SUCCESS - Added Version {to_install} In: {tdone:.1f}s!")
 
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report(args.report, args.compare)
+
 
 if __name__ == "__main__":
     main()
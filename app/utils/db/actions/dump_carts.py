@@ -2,31 +2,20 @@ from flask import Flask
 
 from app.models import Cart, db
 from app.utils.db.util import app_config_selector
-from datetime import datetime, date
+from app.utils.db import dump_writer
 
 import argparse
 import os
-import json
 
 import sys
 
 
-def json_dump_defaults(item):
-
-    # time
-    if isinstance(item, (datetime, date)):
-        return item.isoformat()
-
-    # general
-    else:
-        return item
-
-
 def main():
 
     # optional avenue of command-line instead of text-ui
     parser = argparse.ArgumentParser("Dumps carts from the DB to a JSON file.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    dump_writer.add_dump_args(parser)
     args = parser.parse_args()
 
     # perform config selection, can fail on bad cmdline pick
@@ -43,13 +32,9 @@ def main():
     db.init_app(app)
     with app.app_context():
 
-        # Get cart data as list of dicts
-        try:
-            carts = Cart.query.all()
-        except Exception as ex:
-            print(f"Failed to get cart data from database - due to:\n{ex}")
-            sys.exit(2)
-        entries = [
+        # Cart data streamed as dicts (server-side cursor, a batch of rows in memory at a time)
+        carts = Cart.query.order_by(Cart.cart_id).yield_per(dump_writer.YIELD_PER)
+        entries = (
             {
                 "user": c.user,
                 "attack_version": c.attack_version,
@@ -58,15 +43,15 @@ def main():
                 "cart_content": c.cart_content,
             }
             for c in carts
-        ]
+        )
 
         # Dump to file
         prog_dir = os.path.dirname(os.path.realpath(__file__))
-        dump_file = os.path.abspath(os.path.join(prog_dir, "../dumps/cart.json"))
+        dump_base = os.path.abspath(os.path.join(prog_dir, "../dumps/cart"))
+        dump_file = dump_writer.dump_path(dump_base, args.format, args.compress)
         try:
-            with open(dump_file, "w") as fhandle:
-                json.dump(entries, fhandle, indent=4, default=json_dump_defaults)
-            print(f"Dumped carts to {dump_file}!")
+            count = dump_writer.write_entries(dump_file, entries, args.format, args.compress)
+            print(f"Dumped {count} carts to {dump_file}!")
         except Exception as ex:
             print(f"Failed to dump carts to {dump_file} - due to:\n{ex}")
             sys.exit(3)
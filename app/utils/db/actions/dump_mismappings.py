@@ -1,12 +1,15 @@
 from flask import Flask
 
-from app.models import Mismapping, db
+from app.models import Mismapping, Technique, db
 import app.utils.db.read as db_read
 from app.utils.db.util import option_selector, app_config_selector
+from app.utils.db import dump_writer
+
+from sqlalchemy import and_, func, literal
+from sqlalchemy.orm import aliased
 
 import argparse
 import os
-import json
 
 import sys
 
@@ -17,6 +20,7 @@ def main():
     parser = argparse.ArgumentParser("Dumps Mismappings from the DB to a JSON file.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
     parser.add_argument("--version", help="ATT&CK version for mismapping content to be dumped from.")
+    dump_writer.add_dump_args(parser)
     args = parser.parse_args()
 
     # ensure all-or-nothing command-line argument pick
@@ -61,40 +65,42 @@ def main():
             print(f"Invalid command-line selection made:\n{ex}")
             sys.exit(4)
 
-        # Read Technique data into map that resolves DB Unique ID to Technique IDs
-        try:
-            tech_uid_to_id = {tuid: tid for tid, tuid in db_read.attack.tech_id_to_uid(to_dump).items()}
-        except Exception as ex:
-            print(f"Failed to read information about Techniques present in the DB - due to:\n{ex}")
-            sys.exit(5)
-
-        # Get mismapping data as list of dicts
-        try:
-            mismapings = db.session.query(Mismapping).filter(Mismapping.original.in_(tech_uid_to_id.keys())).all()
-        except Exception as ex:
-            print(f"Failed to get mismapping data from database - due to:\n{ex}")
-            sys.exit(6)
-        entries = [
+        # Mismapping data streamed as dicts, Technique UIDs resolved to IDs and sorted DB-side
+        original = aliased(Technique)
+        corrected = aliased(Technique)
+        corrected_id = func.coalesce(corrected.tech_id, literal("N/A"))  # might be undefined
+        context = func.coalesce(Mismapping.context, literal("None"))
+        rationale = func.coalesce(Mismapping.rationale, literal("None"))
+        mismappings = (
+            db.session.query(original.tech_id, corrected_id, Mismapping.context, Mismapping.rationale)
+            .join(original, Mismapping.original == original.uid)
+            .outerjoin(corrected, and_(Mismapping.corrected == corrected.uid, corrected.attack_version == to_dump))
+            .filter(original.attack_version == to_dump)
+            # same order as sorting by f"{original}{corrected}{context}{rationale}" (code point order)
+            .order_by((original.tech_id + corrected_id + context + rationale).collate("C"))
+        )
+        entries = (
             {
-                "original": tech_uid_to_id[m.original],  # always defined
-                "corrected": tech_uid_to_id.get(m.corrected, "N/A"),  # might be undefined
-                "context": m.context,
-                "rationale": m.rationale,
+                "original": original_id,
+                "corrected": corrected_tech_id,
+                "context": mm_context,
+                "rationale": mm_rationale,
             }
-            for m in mismapings
-        ]
-        entries.sort(key=lambda mm: f"{mm['original']}{mm['corrected']}{mm['context']}{mm['rationale']}")
+            for original_id, corrected_tech_id, mm_context, mm_rationale in mismappings.yield_per(
+                dump_writer.YIELD_PER
+            )
+        )
 
         # Dump to file
         prog_dir = os.path.dirname(os.path.realpath(__file__))
-        dump_file = os.path.abspath(os.path.join(prog_dir, f"../dumps/mismappings-{to_dump}.json"))
+        dump_base = os.path.abspath(os.path.join(prog_dir, f"../dumps/mismappings-{to_dump}"))
+        dump_file = dump_writer.dump_path(dump_base, args.format, args.compress)
         try:
-            with open(dump_file, "w") as fhandle:
-                json.dump(entries, fhandle, indent=4)
-            print(f"Dumped mismappings to {dump_file}!")
+            count = dump_writer.write_entries(dump_file, entries, args.format, args.compress)
+            print(f"Dumped {count} mismappings to {dump_file}!")
         except Exception as ex:
             print(f"Failed to dump mismappings to {dump_file} - due to:\n{ex}")
-            sys.exit(7)
+            sys.exit(5)
 
 
 if __name__ == "__main__":
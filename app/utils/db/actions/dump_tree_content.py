@@ -8,46 +8,79 @@ import argparse
 import os
 import json
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 import sys
 
 
-def score_attack_id(id_):
+def score_attack_id(id_, tactic_order):
     # Used as a scoring function for ATT&CK ID strings
-    # Tactics in Matrix order - these come first
+    # Tactics in Matrix order (tactic_order: TAwxyz -> position, from the DB) - these come first
     # Techniques in ascending number order
 
     # Tactic: position(TAwxyz) - 1,000.0
     if id_.startswith("TA"):
-
-        # get Matrix order - fail to 100 if more Tactics exist
-        inter_tactic_order = [
-            "TA0043",
-            "TA0042",
-            "TA0001",
-            "TA0002",
-            "TA0003",
-            "TA0004",
-            "TA0005",
-            "TA0006",
-            "TA0007",
-            "TA0008",
-            "TA0009",
-            "TA0011",
-            "TA0010",
-            "TA0040",
-        ]
-        try:
-            pos = inter_tactic_order.index(id_)
-        except ValueError:
-            pos = 100
-        return pos - 1_000.0
+        return tactic_order.get(id_, 100) - 1_000.0
 
     # Technique: T(wxyz.abc)
     else:
         return float(id_[1:])
 
 
+def read_tree_content(versions):
+    # Tactic & Technique question/answer content (+ names for human convenience) of versions, in a single pass
+    # gives {version: {id: {"__name", "question", "answer"}}} with Tactics Matrix-wise then Techniques by ID
+    # Tactic UIDs are assigned in the Matrix's tactic_refs order at build time, giving the Matrix order
+    tact_rows = (
+        db.session.query(
+            Tactic.attack_version,
+            Tactic.tact_id,
+            Tactic.tact_name,
+            Tactic.tact_question,
+            Tactic.tact_answer,
+        )
+        .filter(Tactic.attack_version.in_(versions))
+        .order_by(Tactic.uid)
+    ).all()
+
+    tech_rows = (
+        db.session.query(
+            Technique.attack_version,
+            Technique.tech_id,
+            Technique.tech_name,
+            Technique.tech_question,
+            Technique.tech_answer,
+        ).filter(Technique.attack_version.in_(versions))
+    ).all()
+
+    tactic_orders = {version: {} for version in versions}
+    for row in tact_rows:
+        tactic_order = tactic_orders[row[0]]
+        tactic_order[row[1]] = len(tactic_order)
+
+    version_entries = {version: [] for version in versions}
+    for row in itertools.chain(tact_rows, tech_rows):
+        version_entries[row[0]].append({"id": row[1], "__name": row[2], "question": row[3], "answer": row[4]})
+
+    content = {}
+    for version, entries in version_entries.items():
+        entries.sort(key=lambda entry: score_attack_id(entry["id"], tactic_orders[version]))
+        content[version] = {
+            e["id"]: {
+                "__name": e["__name"],
+                "question": e["question"],
+                "answer": e["answer"],
+            }
+            for e in entries
+        }
+    return content
+
+
+def write_tree_content(dump_file, entries):
+    with open(dump_file, "w") as fhandle:
+        json.dump(entries, fhandle, indent=4)
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 
 
@@ -59,10 +92,19 @@ def main():
     )
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
     parser.add_argument("--version", help="ATT&CK version for card content to be dumped from.")
+    parser.add_argument(
+        "--all-versions",
+        action="store_true",
+        help="Dump the content of every version on the DB (non-interactive, use with --config and not --version).",
+    )
     args = parser.parse_args()
 
     # ensure all-or-nothing command-line argument pick
-    if len([a for a in (args.config, args.version) if a is not None]) not in [0, 2]:
+    if args.all_versions:
+        if (args.config is None) or (args.version is not None):
+            print("--all-versions needs --config, and can't be used with --version. Exiting.")
+            sys.exit(1)
+    elif len([a for a in (args.config, args.version) if a is not None]) not in [0, 2]:
         print("Either ALL or NONE of the command-line args should be defined. Exiting.")
         sys.exit(1)
 
@@ -90,66 +132,51 @@ def main():
             print("There are no versions to dump tree content from. Exiting.")
             return
 
-        # Allow user to select a version to dump from
+        # All versions, or allow user to select a version to dump from
+        if args.all_versions:
+            to_dump = sorted(versions_installed)
+        else:
+            try:
+                to_dump = [
+                    option_selector(
+                        versions_installed,
+                        initial_msg="ATT&CK versions on the database",
+                        prompt_msg="What version to dump content from",
+                        invalid_msg="is NOT a valid version from",
+                        cmdline_pick=args.version,
+                    )
+                ]
+            except Exception as ex:
+                print(f"Invalid command-line selection made:\n{ex}")
+                sys.exit(4)
+
+        # Get Tactic & Technique question/answer content, ordered and keyed by ID
         try:
-            to_dump = option_selector(
-                versions_installed,
-                initial_msg="ATT&CK versions on the database",
-                prompt_msg="What version to dump content from",
-                invalid_msg="is NOT a valid version from",
-                cmdline_pick=args.version,
-            )
-        except Exception as ex:
-            print(f"Invalid command-line selection made:\n{ex}")
-            sys.exit(4)
-
-        # Get Tactic & Technique question/answer content (+ names for human convenience)
-        try:
-            tact_id_nqa = (
-                db.session.query(
-                    Tactic.tact_id,
-                    Tactic.tact_name,
-                    Tactic.tact_question,
-                    Tactic.tact_answer,
-                ).filter(Tactic.attack_version == to_dump)
-            ).all()
-
-            tech_id_nqa = (
-                db.session.query(
-                    Technique.tech_id,
-                    Technique.tech_name,
-                    Technique.tech_question,
-                    Technique.tech_answer,
-                ).filter(Technique.attack_version == to_dump)
-            ).all()
+            content = read_tree_content(to_dump)
         except Exception as ex:
             print(f"Failed to read Tactic & Technique Question/Answer content from DB - due to\n:{ex}")
             sys.exit(5)
 
-        # Order Tactics Matrix-wise, Place Techniques after ascending ID number-wise, make into dict
-        entries = [
-            {"id": row[0], "__name": row[1], "question": row[2], "answer": row[3]}
-            for row in itertools.chain(tact_id_nqa, tech_id_nqa)
-        ]
-        entries.sort(key=lambda entry: score_attack_id(entry["id"]))
-        entries = {
-            e["id"]: {
-                "__name": e["__name"],
-                "question": e["question"],
-                "answer": e["answer"],
-            }
-            for e in entries
-        }
-
-        # Dump to file
+        # Dump to files - concurrently, as each version is its own file
         prog_dir = os.path.dirname(os.path.realpath(__file__))
-        dump_file = os.path.abspath(os.path.join(prog_dir, f"../dumps/tree-content-{to_dump}.json"))
-        try:
-            with open(dump_file, "w") as fhandle:
-                json.dump(entries, fhandle, indent=4)
-            print(f"Dumped tree content for version {to_dump} to {dump_file}!")
-        except Exception as ex:
-            print(f"Failed to dump tree content to {dump_file} - due to:\n{ex}")
+        dump_files = {
+            version: os.path.abspath(os.path.join(prog_dir, f"../dumps/tree-content-{version}.json"))
+            for version in to_dump
+        }
+        failed = False
+        with ThreadPoolExecutor() as executor:
+            writes = {
+                version: executor.submit(write_tree_content, dump_files[version], content[version])
+                for version in to_dump
+            }
+            for version, write in writes.items():
+                try:
+                    write.result()
+                    print(f"Dumped tree content for version {version} to {dump_files[version]}!")
+                except Exception as ex:
+                    print(f"Failed to dump tree content to {dump_files[version]} - due to:\n{ex}")
+                    failed = True
+        if failed:
             sys.exit(6)
 
 
@@ -2,10 +2,10 @@ from flask import Flask
 
 from app.models import User, db
 from app.utils.db.util import app_config_selector
+from app.utils.db import dump_writer
 
 import argparse
 import os
-import json
 
 import sys
 
@@ -15,6 +15,7 @@ def main():
     # optional avenue of command-line instead of text-ui
     parser = argparse.ArgumentParser("Dumps Users from the DB to a JSON file.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    dump_writer.add_dump_args(parser)
     args = parser.parse_args()
 
     # perform config selection, can fail on bad cmdline pick
@@ -31,21 +32,20 @@ def main():
     db.init_app(app)
     with app.app_context():
 
-        # Get user data as list of dicts
-        try:
-            users = User.query.all()
-        except Exception as ex:
-            print(f"Failed to get user data from database - due to:\n{ex}")
-            sys.exit(2)
-        entries = [{"email": u.email, "password": u.password, "role_id": u.role_id} for u in users]
+        # User data streamed as dicts (server-side cursor, a batch of rows in memory at a time)
+        users = db.session.query(User.email, User.password, User.role_id).order_by(User.id)
+        entries = (
+            {"email": email, "password": password, "role_id": role_id}
+            for email, password, role_id in users.yield_per(dump_writer.YIELD_PER)
+        )
 
         # Dump to file
         prog_dir = os.path.dirname(os.path.realpath(__file__))
-        dump_file = os.path.abspath(os.path.join(prog_dir, "../dumps/user.json"))
+        dump_base = os.path.abspath(os.path.join(prog_dir, "../dumps/user"))
+        dump_file = dump_writer.dump_path(dump_base, args.format, args.compress)
         try:
-            with open(dump_file, "w") as fhandle:
-                json.dump(entries, fhandle, indent=4)
-            print(f"Dumped users to {dump_file}!")
+            count = dump_writer.write_entries(dump_file, entries, args.format, args.compress)
+            print(f"Dumped {count} users to {dump_file}!")
         except Exception as ex:
             print(f"Failed to dump users to {dump_file} - due to:\n{ex}")
             sys.exit(3)
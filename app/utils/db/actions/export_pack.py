@@ -0,0 +1,95 @@
+from flask import Flask
+
+from app.models import db
+
+import app.utils.db.read as db_read
+from app.utils.db import pack as db_pack
+from app.utils.db.util import option_selector, app_config_selector
+
+import argparse
+import os
+import time
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+
+    # optional avenue of command-line instead of text-ui
+    parser = argparse.ArgumentParser("Exports a built ATT&CK version from the DB to a pack file (see import_pack).")
+    parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    parser.add_argument("--version", help="ATT&CK version to be exported.")
+    parser.add_argument("--output", help="Path of the pack file to write (default: decider-<version>.pack).")
+    args = parser.parse_args()
+
+    # ensure all-or-nothing command-line argument pick
+    if len([a for a in (args.config, args.version) if a is not None]) not in [0, 2]:
+        print("Either ALL or NONE of the command-line args (--config, --version) should be defined. Exiting.")
+        sys.exit(1)
+
+    # perform config selection, can fail on bad cmdline pick
+    try:
+        app_config = app_config_selector(args.config)
+    except Exception as ex:
+        print(f"Invalid command-line selection made:\n{ex}")
+        sys.exit(2)
+
+    print("\n------------------------------------------------\n")
+
+    app = Flask(__name__)
+    app.config.from_object(app_config)
+    db.init_app(app)
+    with app.app_context():
+
+        # Determine existing content
+        try:
+            versions_installed = set(db_read.attack.versions())
+        except Exception as ex:
+            print(f"Failed to read what ATT&CK versions are currently installed on the DB - due to:\n{ex}")
+            sys.exit(3)
+        if len(versions_installed) == 0:
+            print("There are no versions to export. Exiting.")
+            return
+
+        # Allow user to select a version to export
+        try:
+            to_export = option_selector(
+                versions_installed,
+                initial_msg="Versions installed on the database",
+                prompt_msg="What version to export",
+                invalid_msg="is NOT a valid version from",
+                cmdline_pick=args.version,
+            )
+        except Exception as ex:
+            print(f"Invalid command-line selection made:\n{ex}")
+            sys.exit(4)
+
+        pack_path = args.output or f"decider-{to_export}.pack"
+
+        print("\n------------------------------------------------\n")
+
+        t0 = time.time()
+
+        try:
+            manifest = db_pack.export_version(to_export, pack_path)
+        except Exception as ex:
+            tfail = time.time() - t0
+            print(f"Failed to export version {to_export} at {tfail:.1f}s into export - due to:\n{ex}")
+            if os.path.isfile(pack_path):
+                os.remove(pack_path)
+            sys.exit(5)
+
+        print("\nPack Detail:")
+        for table in manifest["tables"]:
+            print(f" - {table['name']}: {table['rows']} rows")
+
+        print("\n------------------------------------------------\n")
+        tdone = time.time() - t0
+        size_mb = os.path.getsize(pack_path) / (1024 * 1024)
+        print(f"SUCCESS - Exported Version {to_export} to {pack_path} ({size_mb:.1f} MB) In: {tdone:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
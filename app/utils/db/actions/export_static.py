@@ -0,0 +1,273 @@
+from app.models import db, Tactic, Technique, tactic_technique_map
+import app.utils.db.read as db_read
+from app.utils.db.util import option_selector, app_config_selector
+
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+
+# Pre-renders the read-only question tree of versions for serving as plain files (kiosk deployments)
+# URL -> file layout under the output directory:
+#   /question/<v>/...                                     -> question/<v>/.../index.html
+#   /no_tactic/<v>/...                                    -> no_tactic/<v>/.../index.html
+#   /api/answers/?index=<i>&tactic=<t>&version=<v>        -> api/answers/<v>/<i>_<t>.json (<t> empty if n/a)
+#   /api/techid_to_valid_tactid_map/<v>                   -> api/techid_to_valid_tactid_map/<v>.json
+#   /api/minisearch/<v>/start                             -> api/minisearch/<v>/start.json
+#   /static/...                                           -> static/...
+
+
+def page_file(url):
+    # /question/v14.1/TA0001 -> question/v14.1/TA0001/index.html
+    return os.path.join(url.strip("/"), "index.html")
+
+
+def answers_url(version, index, tactic=""):
+    return f"/api/answers/?index={index}&tactic={tactic}&version={version}"
+
+
+def answers_file(version, index, tactic=""):
+    return os.path.join("api", "answers", version, f"{index}_{tactic}.json")
+
+
+def version_routes(version):
+    # (url, file) of every page / API response of a version's question tree - files relative to the output dir
+    tact_ids = (db.session.query(Tactic.tact_id).filter(Tactic.attack_version == version).order_by(Tactic.uid)).all()
+    tact_ids = [tact_id for (tact_id,) in tact_ids]
+
+    tactic_techs = (
+        db.session.query(Tactic.tact_id, Technique.tech_id)
+        .filter(Tactic.attack_version == version)
+        .join(tactic_technique_map, tactic_technique_map.c.tactic == Tactic.uid)
+        .join(Technique, tactic_technique_map.c.technique == Technique.uid)
+        .filter(Technique.parent_uid == None)
+    ).all()
+
+    # base Technique -> its SubTechnique suffixes (T1003 -> ["001", ..]), and those with a Tech->Sub question
+    subs = defaultdict(list)
+    has_question = set()
+    for tech_id, tech_question in (
+        db.session.query(Technique.tech_id, Technique.tech_question).filter(Technique.attack_version == version)
+    ).all():
+        if "." in tech_id:
+            base_id, sub_id = tech_id.split(".")
+            subs[base_id].append(sub_id)
+        elif tech_question:
+            has_question.add(tech_id)
+
+    pages = [f"/question/{version}"]
+    answers = [(version, "start", "")]
+
+    for tact_id in tact_ids:
+        pages.append(f"/question/{version}/{tact_id}")
+        answers.append((version, tact_id, ""))
+
+    for tact_id, tech_id in tactic_techs:
+        pages.append(f"/question/{version}/{tact_id}/{tech_id}")
+        pages.extend(f"/question/{version}/{tact_id}/{tech_id}/{sub_id}" for sub_id in subs[tech_id])
+        if tech_id in has_question:
+            pages.append(f"/question/{version}/{tact_id}/{tech_id}/QnA")
+            answers.append((version, tech_id, tact_id))
+
+    # no-tactic success pages (reached from search) - one per (Sub)Technique
+    for tech_id in sorted({tech_id for _, tech_id in tactic_techs}):
+        pages.append(f"/no_tactic/{version}/{tech_id}")
+        pages.extend(f"/no_tactic/{version}/{tech_id}/{sub_id}" for sub_id in subs[tech_id])
+
+    return (
+        [(url, page_file(url)) for url in pages]
+        + [(answers_url(*answer), answers_file(*answer)) for answer in answers]
+        + [
+            (
+                f"/api/techid_to_valid_tactid_map/{version}",
+                os.path.join("api", "techid_to_valid_tactid_map", f"{version}.json"),
+            ),
+            # prebuilt index of the root's cards (the only node searched in-browser)
+            (f"/api/minisearch/{version}/start", os.path.join("api", "minisearch", version, "start.json")),
+        ]
+    )
+
+
+def kiosk_app(config_name):
+    # decider.py reads its --config off of the command-line when imported - hand it this action's pick
+    sys.argv = [sys.argv[0], "--config", config_name]
+    import decider
+
+    return decider.app
+
+
+def export_route(app, out_dir, url, rel_file):
+    response = app.test_client().get(url)
+    if response.status_code != 200:
+        raise Exception(f"{url} responded with HTTP {response.status_code}")
+
+    out_file = os.path.join(out_dir, rel_file)
+    os.makedirs(os.path.dirname(out_file), exist_ok=True)
+    with open(out_file, "wb") as fhandle:
+        fhandle.write(response.get_data())
+
+
+def check_page_mini_search(app, out_dir, version):
+    # an exported page's CSRF token is from the exporter's session - so a visitor's Mini-Search (a POST falling
+    # through to the app) must work with it, as it does when exempt from CSRF in Kiosk Mode
+    with open(os.path.join(out_dir, page_file(f"/question/{version}")), "r") as fhandle:
+        match = re.search(r"const csrfToken = (\"[^\"]*\");", fhandle.read())
+    headers = {"X-CSRFToken": json.loads(match.group(1))} if match else {}
+
+    response = app.test_client().post(f"/search/mini/{version}", json={"search": "T1"}, headers=headers)
+    if response.status_code != 200:
+        raise Exception(f"Mini-Search from an exported page responded with HTTP {response.status_code}")
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+
+    # optional avenue of command-line instead of text-ui
+    parser = argparse.ArgumentParser(
+        "Pre-renders the question tree (pages + answer card APIs) of ATT&CK versions to files for static serving."
+    )
+    parser.add_argument("--config", help="The kiosk configuration to use (from app/conf.py).")
+    parser.add_argument("--version", help="ATT&CK version to export.")
+    parser.add_argument(
+        "--all-versions",
+        action="store_true",
+        help="Export every version on the DB (non-interactive, use with --config and not --version).",
+    )
+    parser.add_argument("--output", default="static_site", help="Directory to write the site to.")
+    parser.add_argument("--jobs", type=int, default=4, help="Number of pages to render concurrently.")
+    args = parser.parse_args()
+
+    # ensure all-or-nothing command-line argument pick
+    if args.all_versions:
+        if (args.config is None) or (args.version is not None):
+            print("--all-versions needs --config, and can't be used with --version. Exiting.")
+            sys.exit(1)
+    elif len([a for a in (args.config, args.version) if a is not None]) not in [0, 2]:
+        print("Either ALL or NONE of --config and --version should be defined. Exiting.")
+        sys.exit(1)
+
+    # perform config selection, can fail on bad cmdline pick
+    try:
+        app_config = app_config_selector(args.config)
+    except Exception as ex:
+        print(f"Invalid command-line selection made:\n{ex}")
+        sys.exit(2)
+
+    # pages are rendered by the app itself, which only runs in Kiosk Mode
+    if not getattr(app_config, "KIOSK_MODE", False):
+        print(f"{app_config.__name__} is not a Kiosk-Mode config - only a kiosk can be exported. Exiting.")
+        sys.exit(2)
+
+    print("\n------------------------------------------------\n")
+
+    app = kiosk_app(app_config.__name__)
+    with app.app_context():
+
+        # Determine existing content
+        try:
+            versions_installed = set(db_read.attack.versions())
+        except Exception as ex:
+            print(f"Failed to read what ATT&CK versions are currently installed on the DB - due to:\n{ex}")
+            sys.exit(3)
+        if len(versions_installed) == 0:
+            print("There are no versions to export. Exiting.")
+            return
+
+        # All versions, or allow user to select a version to export
+        if args.all_versions:
+            to_export = sorted(versions_installed)
+        else:
+            try:
+                to_export = [
+                    option_selector(
+                        versions_installed,
+                        initial_msg="ATT&CK versions on the database",
+                        prompt_msg="What version to export",
+                        invalid_msg="is NOT a valid version from",
+                        cmdline_pick=args.version,
+                    )
+                ]
+            except Exception as ex:
+                print(f"Invalid command-line selection made:\n{ex}")
+                sys.exit(4)
+
+        # Enumerate the tree of each version
+        try:
+            routes = {version: version_routes(version) for version in to_export}
+        except Exception as ex:
+            print(f"Failed to read the question tree from the DB - due to:\n{ex}")
+            sys.exit(5)
+
+    out_dir = os.path.abspath(args.output)
+
+    # EXPORT INFO PRINT-OUT -------------------------------------------------------------------------------------------
+
+    print("Export Detail:")
+    print(f" - Output directory: {out_dir}")
+    for version in to_export:
+        print(f" * {version}: {len(routes[version])} pages / API responses")
+
+    print("\n------------------------------------------------\n")
+
+    # EXPORT PROCESS --------------------------------------------------------------------------------------------------
+
+    t0 = time.time()
+
+    # a re-export replaces the version's files entirely - dropping those of since-removed nodes
+    for version in to_export:
+        for version_dir in (
+            "question",
+            "no_tactic",
+            os.path.join("api", "answers"),
+            os.path.join("api", "minisearch"),
+        ):
+            shutil.rmtree(os.path.join(out_dir, version_dir, version), ignore_errors=True)
+
+    # assets, making the directory servable on its own
+    shutil.copytree(app.static_folder, os.path.join(out_dir, "static"), dirs_exist_ok=True)
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        for version in to_export:
+            tv = time.time()
+            exports = [executor.submit(export_route, app, out_dir, url, rel_file) for url, rel_file in routes[version]]
+            errors = []
+            for export in exports:
+                try:
+                    export.result()
+                except Exception as ex:
+                    errors.append(ex)
+
+            if errors:
+                failed = True
+                print(f"Failed to export {len(errors)} of {len(exports)} routes of version {version}, such as:")
+                for ex in errors[:5]:
+                    print(f" - {ex}")
+                continue
+            print(f"Exported {len(exports)} routes of version {version} in {time.time() - tv:.1f}s")
+
+            try:
+                check_page_mini_search(app, out_dir, version)
+            except Exception as ex:
+                failed = True
+                print(f"Exported pages of version {version} can't be used as served - due to:\n{ex}")
+
+    print("\n------------------------------------------------\n")
+    if failed:
+        print(f"FAILED - Some routes could not be exported, {out_dir} is incomplete.")
+        sys.exit(6)
+
+    tdone = time.time() - t0
+    print(f"SUCCESS - Exported Static Site In: {tdone:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
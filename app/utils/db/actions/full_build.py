@@ -7,7 +7,7 @@ from app.utils.db.source_loader import SourceManager
 import app.utils.db.create as db_create
 import app.utils.db.destroy as db_destroy
 import app.utils.db.read as db_read
-from app.utils.db.util import app_config_selector
+from app.utils.db.util import app_config_selector, build_report, write_build_report, write_build_report_at_exit
 
 from app.constants import BUILD_SOURCES_DIR
 
@@ -24,6 +24,18 @@ def main():
     # optional avenue of command-line instead of text-ui
     parser = argparse.ArgumentParser("Builds the DB with all content from the local disk JSONs.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="LIST-partition the version-scoped tables (Tactic, Technique, ..) by ATT&CK version.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a failed build from its last completed stage, rather than rebuilding from scratch.",
+    )
+    parser.add_argument("--report", help="Path to write a JSON report of per-stage timings / row counts to.")
+    parser.add_argument("--compare", help="Path of a previous JSON report to compare this run's stages against.")
     args = parser.parse_args()
 
     # perform config selection, can fail on bad cmdline pick
@@ -41,9 +53,29 @@ def main():
     with app.app_context():
         # BUILD MODE --------------------------------------------------------------------------------------------------
         full_build_mode = os.getenv("FULL_BUILD_MODE", "overwrite")
+        src_mgr = SourceManager(BUILD_SOURCES_DIR)
+
+        # stages completed by the previous build (when resuming it) / already in place (when reconciling)
+        completed = set()
+        versions_done = set()
+        reconciling = False
+
+        # --resume : continue the previous build, leaving its completed stages in place
+        if args.resume:
+            print("--resume -> Continuing previous build")
+            try:
+                completed = db_read.build_state.completed_stages()
+            except Exception as ex:
+                print(f"Failed to read the state of the previous build - due to:\n{ex}")
+                sys.exit(1)
+            if completed is None:
+                print("  - No previous build state found to resume from. Exiting.")
+                sys.exit(15)
+            versions_done = db_read.build_state.completed_versions(completed)
+            print(f"  - Versions Completed: {', '.join(sorted(versions_done)) or '<none>'}")
 
         # "preserve" : don't touch DB if it has at least 1 version already
-        if full_build_mode == "preserve":
+        elif full_build_mode == "preserve":
             print(f"FULL_BUILD_MODE = {full_build_mode} -> Checking DB Content")
             try:
                 inspector = inspect(db.engine)
@@ -67,6 +99,41 @@ def main():
             else:
                 print("  - Will populate DB")
 
+        # "reconcile" : only install versions missing from the DB, or whose sources on disk have changed
+        elif full_build_mode == "reconcile":
+            print(f"FULL_BUILD_MODE = {full_build_mode} -> Comparing DB Content to Sources")
+            try:
+                inspector = inspect(db.engine)
+                attack_ver_exists = inspector.has_table("attack_version")
+                if attack_ver_exists:
+                    versions_installed = db_read.attack.versions()
+                    source_hashes = db_read.build_state.source_hashes()
+                else:
+                    versions_installed = []
+            except Exception as ex:
+                print(f"Failed to read what ATT&CK content is currently installed in the DB - due to:\n{ex}")
+                sys.exit(1)
+            print(f"  - Versions Present: {', '.join(versions_installed) or '<none>'}")
+
+            # nothing to reconcile against
+            if len(versions_installed) == 0:
+                print("  - Will populate DB")
+
+            # keep tables, roles, users, carts - and versions whose sources are unchanged (or absent from disk)
+            else:
+                reconciling = True
+                completed = {"tables", "roles", "users", "carts"}
+                changed = {
+                    v
+                    for v in versions_installed
+                    if (v in src_mgr.attack)
+                    and (v in src_mgr.tree)
+                    and (source_hashes.get(v) != src_mgr.version_hash(v))
+                }
+                versions_done = set(versions_installed).difference(changed)
+                print(f"  - Versions Unchanged: {', '.join(sorted(versions_done)) or '<none>'}")
+                print(f"  - Versions Changed (will reinstall): {', '.join(sorted(changed)) or '<none>'}")
+
         # *missing* : Overwrite DB
         else:
             print(f"FULL_BUILD_MODE = {full_build_mode} -> Overwriting DB")
@@ -74,23 +141,26 @@ def main():
         print("\n------------------------------------------------\n")
 
         # RESOURCE LOADING --------------------------------------------------------------------------------------------
-        src_mgr = SourceManager(BUILD_SOURCES_DIR)
 
         print("Loading sources..")
 
         print("\n------------------------------------------------\n")
-        # Role - required
+        # Role - required (unless already in the DB)
 
-        if src_mgr.role.load_validate():
+        if "roles" in completed:
+            print("Roles already in DB.")
+        elif src_mgr.role.load_validate():
             print("Role loaded.")
         else:
             print("Role is needed for Decider to function. Exiting.")
             sys.exit(2)
 
         print("\n------------------------------------------------\n")
-        # User - required
+        # User - required (unless already in the DB)
 
-        if not src_mgr.user.load_validate():
+        if "users" in completed:
+            print("Users already in DB.")
+        elif not src_mgr.user.load_validate():
             print("User is needed for Decider to function. Exiting.")
             sys.exit(3)
         elif len(src_mgr.user.get_data()) == 0:
@@ -102,7 +172,10 @@ def main():
         print("\n------------------------------------------------\n")
         # ATT&CK content - 1+ required
 
-        attack_versions = {v for v in src_mgr.attack.keys() if src_mgr.attack[v].load_validate()}
+        # versions completed by a resumed build are neither re-parsed nor re-inserted
+        attack_versions = {
+            v for v in src_mgr.attack.keys() if (v in versions_done) or src_mgr.attack[v].load_validate()
+        }
         if len(attack_versions) == 0:
             print("Failed to load any ATT&CK versions. At least one is needed for Decider to work. Exiting.")
             sys.exit(5)
@@ -112,7 +185,7 @@ def main():
         print("\n------------------------------------------------\n")
         # Tree content - 1+ (after intersection with ATT&CK content) required
 
-        tree_versions = {v for v in src_mgr.tree.keys() if src_mgr.tree[v].load_validate()}
+        tree_versions = {v for v in src_mgr.tree.keys() if (v in versions_done) or src_mgr.tree[v].load_validate()}
         install_versions = attack_versions.intersection(tree_versions)
         if len(install_versions) == 0:
             print("Failed to load ATT&CK content and Tree content (questions / answers) for the same ATT&CK version.")
@@ -133,9 +206,9 @@ def main():
 
         co_oc_versions = {
             v
-            for v in set(install_versions).intersection(
-                set(src_mgr.co_ocs.keys())
-            )  # only try and load CoOcs for versions to install
+            for v in set(install_versions)
+            .difference(versions_done)
+            .intersection(set(src_mgr.co_ocs.keys()))  # only try and load CoOcs for versions to install
             if src_mgr.co_ocs[v].load_validate()  # ensure load passes
         }
         if len(co_oc_versions) != 0:
@@ -148,9 +221,9 @@ def main():
 
         akas_versions = {
             v
-            for v in set(install_versions).intersection(
-                set(src_mgr.akas.keys())
-            )  # only try and load AKAs for versions to install
+            for v in set(install_versions)
+            .difference(versions_done)
+            .intersection(set(src_mgr.akas.keys()))  # only try and load AKAs for versions to install
             if src_mgr.akas[v].load_validate()  # ensure load passes
         }
         if len(akas_versions) != 0:
@@ -163,9 +236,9 @@ def main():
 
         mismap_versions = {
             v
-            for v in set(install_versions).intersection(
-                set(src_mgr.mismaps.keys())
-            )  # only try and load Mismaps for versions to install
+            for v in set(install_versions)
+            .difference(versions_done)
+            .intersection(set(src_mgr.mismaps.keys()))  # only try and load Mismaps for versions to install
             if src_mgr.mismaps[v].load_validate()  # ensure load passes
         }
         if len(mismap_versions) != 0:
@@ -176,8 +249,10 @@ def main():
         print("\n------------------------------------------------\n")
         # Carts - optional and across all versions
 
-        carts_loaded = src_mgr.cart.load_validate()
-        if carts_loaded:
+        carts_loaded = ("carts" not in completed) and src_mgr.cart.load_validate()
+        if "carts" in completed:
+            print("Carts already in DB.")
+        elif carts_loaded:
             print("Provided carts will be added to the DB as possible")
             print("    (as carts depend on users and attack versions)")
         else:
@@ -188,9 +263,14 @@ def main():
         # INSTALL INFO PRINT-OUT --------------------------------------------------------------------------------------
 
         print("Install Detail:")
+        if args.partitioned:
+            print(" * Version-scoped tables LIST-partitioned by ATT&CK version")
         print(" + Role")
         print(" + User")
         for version in install_versions:
+            if version in versions_done:
+                print(f" = ATT&CK Version {version} (already installed)")
+                continue
             print(f" + ATT&CK Version {version}:")
             if version in co_oc_versions:
                 print("    + CoOccurrences")
@@ -206,53 +286,93 @@ def main():
         # BUILDING PROCESS --------------------------------------------------------------------------------------------
 
         t0 = time.time()
+        build_report.start(
+            "full_build",
+            versions=sorted(install_versions),
+            partitioned=args.partitioned,
+            resumed=args.resume,
+            mode=full_build_mode,
+        )
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report_at_exit(args.report, args.compare)
 
         # remake tables
-        try:
-            db_destroy.all_tables()
-            db_create.extensions_dictionary()
-            db_create.all_tables()
-        except Exception as ex:
-            tfail = time.time() - t0
-            print(f"Failed to recreate tables at {tfail:.1f}s into build - due to:\n{ex}")
-            sys.exit(7)
+        if "tables" not in completed:
+            try:
+                db_destroy.all_tables()
+                db_create.extensions_dictionary()
+                db_create.all_tables()
+                if args.partitioned:
+                    db_create.partition.all_tables()
+                db_create.build_state.checkpoint("tables")
+            except Exception as ex:
+                tfail = time.time() - t0
+                print(f"Failed to recreate tables at {tfail:.1f}s into build - due to:\n{ex}")
+                sys.exit(7)
+
+        # add any tables missing from a DB built by an older release
+        elif reconciling:
+            try:
+                db_create.all_tables()
+            except Exception as ex:
+                tfail = time.time() - t0
+                print(f"Failed to add missing tables at {tfail:.1f}s into build - due to:\n{ex}")
+                sys.exit(7)
 
         # add Roles and Users
         try:
-            db_create.role.add_all(src_mgr)
-            db_create.user.add_all(src_mgr)
+            if "roles" not in completed:
+                db_create.role.add_all(src_mgr)
+                db_create.build_state.checkpoint("roles")
+            if "users" not in completed:
+                db_create.user.add_all(src_mgr)
+                db_create.build_state.checkpoint("users")
         except Exception as ex:
             tfail = time.time() - t0
             print(f"Failed to add Roles and Users at {tfail:.1f}s into build - due to:\n{ex}")
             sys.exit(8)
 
         for version in install_versions:
+            if version in versions_done:
+                print(f"\nATT&CK content for version {version} already installed, skipping\n")
+                continue
+
             print(f"\nAdding ATT&CK content for version {version}\n")
 
             # ATT&CK + Tree content
-            try:
-                db_create.attack.add_version(version, src_mgr)
-            except Exception as ex:
-                tfail = time.time() - t0
-                print(
-                    f"Failed to add ATT&CK/Tree content for version {version}"
-                    f" at {tfail:.1f}s into build - due to:\n{ex}"
-                )
-                sys.exit(9)
+            if f"{version}/attack" not in completed:
+                try:
+                    # present when reinstalling a changed version, or when a previous attempt failed partway
+                    # (spans many commits) - remove what is there, holding the version's Carts in the DB until
+                    # they are restored (a failure before then leaves them held, for a --resume to restore)
+                    if version in db_read.attack.versions():
+                        db_destroy.attack.drop_version(version, hold_carts=True)
+                    db_create.attack.add_version(version, src_mgr)
+                    db_create.cart.restore_held(version)
+                    db_create.build_state.checkpoint(f"{version}/attack")
+                except Exception as ex:
+                    tfail = time.time() - t0
+                    print(
+                        f"Failed to add ATT&CK/Tree content for version {version}"
+                        f" at {tfail:.1f}s into build - due to:\n{ex}"
+                    )
+                    sys.exit(9)
 
             # AKAs
-            if version in akas_versions:
+            if (version in akas_versions) and (f"{version}/akas" not in completed):
                 try:
                     db_create.akas.add_version(version, src_mgr)
+                    db_create.build_state.checkpoint(f"{version}/akas")
                 except Exception as ex:
                     tfail = time.time() - t0
                     print(f"Failed to add AKAs for version {version} at {tfail:.1f}s into build - due to:\n{ex}")
                     sys.exit(10)
 
             # CoOccurrences
-            if version in co_oc_versions:
+            if (version in co_oc_versions) and (f"{version}/coocs" not in completed):
                 try:
                     db_create.coocs.add_version(version, src_mgr)
+                    db_create.build_state.checkpoint(f"{version}/coocs")
                 except Exception as ex:
                     tfail = time.time() - t0
                     print(
@@ -262,9 +382,10 @@ def main():
                     sys.exit(11)
 
             # Mismappings
-            if version in mismap_versions:
+            if (version in mismap_versions) and (f"{version}/mismaps" not in completed):
                 try:
                     db_create.mismaps.add_version(version, src_mgr)
+                    db_create.build_state.checkpoint(f"{version}/mismaps")
                 except Exception as ex:
                     tfail = time.time() - t0
                     print(
@@ -273,17 +394,21 @@ def main():
                     )
                     sys.exit(12)
 
+            db_create.build_state.checkpoint(f"{version}/done")
+            db_create.build_state.record_source(version, src_mgr.version_hash(version))
+
         # carts
-        if carts_loaded:
+        if carts_loaded and ("carts" not in completed):
             try:
                 print("\nAdding Carts\n")
                 db_create.cart.add_all(src_mgr)
+                db_create.build_state.checkpoint("carts")
             except Exception as ex:
                 tfail = time.time() - t0
                 print(f"Failed to add Carts at {tfail:.1f}s into build - due to:\n{ex}")
                 sys.exit(13)
 
-        # db kiosk user
+        # db kiosk user (recreated on each run, so never skipped)
         print("\nCreate Kiosk user\n")
 
         try:
@@ -297,6 +422,9 @@ def main():
         tdone = time.time() - t0
         print(f"SUCCESS - Full Build Complete In: {tdone:.1f}s!")
 
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report(args.report, args.compare)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,513 @@
+from app.utils.db.source_loader import SourceManager
+from app.constants import DEFAULT_BUILD_SOURCES_DIR
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import time
+import uuid
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Writes synthetic (but schema-valid) build sources at a chosen scale - for build / search / API benchmarks
+# Content is made-up: nothing in it is real ATT&CK data
+
+# roughly Enterprise ATT&CK v14.1 - what --scale 1 produces
+BASE_SCALE = {
+    "tactics": 14,
+    "techniques": 637,  # base + sub
+    "sub_share": 0.68,  # of techniques that are subtechniques
+    "blurbs": 15000,  # procedure examples (relationships with citations)
+    "data_sources": 38,
+    "data_components": 106,
+}
+
+# ATT&CK IDs are 4 digits (T1000-T9999, G/S/DS0001-9999) and subtechnique IDs 3 (.001-.999)
+MAX_BASE_TECHNIQUES = 9000
+MAX_SUBS_PER_BASE = 999
+MAX_OTHER_IDS = 9999
+
+# where role.json / user.json are copied from - the configured build sources first, then the shipped defaults
+ACCOUNT_SOURCE_DIRS = [
+    DEFAULT_BUILD_SOURCES_DIR,
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../../../default_config/build_sources"),
+]
+
+# procedure examples per Group / Software, on average
+BLURBS_PER_SOURCE = 18
+
+PLATFORMS = [
+    "Windows",
+    "macOS",
+    "Linux",
+    "Network",
+    "PRE",
+    "Containers",
+    "IaaS",
+    "SaaS",
+    "Office 365",
+    "Azure AD",
+    "Google Workspace",
+]
+
+WORDS = (
+    "access account adversary agent alert application archive artifact authentication automated backdoor beacon "
+    "binary boot browser cache certificate channel cloud code command compromise configuration connection container "
+    "credential cron data database debugger default defense delivery dependency device directory discovery domain "
+    "download driver dump email encoding encryption endpoint environment execution exfiltration exploit file "
+    "firewall firmware forged group hash header hijack host identity image implant injection install interpreter "
+    "kernel key keychain library log login macro malware manipulation memory module network object obfuscation "
+    "package password payload permission persistence phishing pipe policy port privilege process protocol proxy "
+    "query registry remote replication resource rootkit scheduled script secret service session share shell signed "
+    "software spoof storage system task template token traffic trust tunnel update upload user utility valid "
+    "virtual volume web window wireless"
+).split()
+
+VERBS = (
+    "abuse collect conceal create delete disable dump enumerate evade gather hide hijack impair inject modify".split()
+)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# text / ID helpers
+
+
+def stix_id(rng, stix_type):
+    return f"{stix_type}--{uuid.UUID(int=rng.getrandbits(128), version=4)}"
+
+
+def phrase(rng, n_min, n_max):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(n_min, n_max)))
+
+
+def title(rng, n_min, n_max):
+    return phrase(rng, n_min, n_max).title()
+
+
+def sentence(rng, n_min=8, n_max=20):
+    return f"Adversaries may {rng.choice(VERBS)} {phrase(rng, n_min, n_max)}."
+
+
+def paragraph(rng, n_sentences):
+    return " ".join(sentence(rng) for _ in range(n_sentences))
+
+
+def mitre_reference(external_id, path):
+    return {
+        "source_name": "mitre-attack",
+        "external_id": external_id,
+        "url": f"https://attack.mitre.org/{path}",
+    }
+
+
+def citation_reference(ref_num):
+    return {
+        "source_name": f"Synthetic Report {ref_num}",
+        "url": f"https://reports.example.com/{ref_num}",
+        "description": f"Synthetic Report {ref_num}. (n.d.). Retrieved January 1, 2024.",
+    }
+
+
+def scaled_counts(scale, techniques=None, blurbs=None):
+    # techniques (base + sub) and blurbs default to the scale - base Technique IDs run out first, so past that
+    # the rest become subtechniques
+    n_techniques = techniques if (techniques is not None) else round(BASE_SCALE["techniques"] * scale)
+    n_base = max(1, round(n_techniques * (1 - BASE_SCALE["sub_share"])))
+    n_base = max(n_base, math.ceil(n_techniques / (1 + MAX_SUBS_PER_BASE)))
+    n_base = min(n_base, MAX_BASE_TECHNIQUES)
+    n_subs = max(0, n_techniques - n_base)
+    if n_subs > n_base * MAX_SUBS_PER_BASE:
+        raise ValueError(f"At most {MAX_BASE_TECHNIQUES * (1 + MAX_SUBS_PER_BASE)} Techniques can have ATT&CK IDs")
+
+    return {
+        "base_techniques": n_base,
+        "subtechniques": n_subs,
+        "blurbs": blurbs if (blurbs is not None) else round(BASE_SCALE["blurbs"] * scale),
+        "data_sources": min(MAX_OTHER_IDS, max(1, round(BASE_SCALE["data_sources"] * math.sqrt(scale)))),
+        "data_components": max(1, round(BASE_SCALE["data_components"] * math.sqrt(scale))),
+    }
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# catalog - the content shared by every version generated
+
+
+def make_catalog(rng, counts, n_tactics):
+    catalog = {}
+
+    # Tactics - names (and shortnames) kept unique
+    tactics = []
+    shortnames = set()
+    for i in range(n_tactics):
+        name = title(rng, 1, 2)
+        while name.lower().replace(" ", "-") in shortnames:
+            name = title(rng, 1, 3)
+        shortnames.add(name.lower().replace(" ", "-"))
+        tact_id = f"TA{i + 1:04d}"
+        tactics.append(
+            {
+                "type": "x-mitre-tactic",
+                "id": stix_id(rng, "x-mitre-tactic"),
+                "name": name,
+                "description": paragraph(rng, 2),
+                "x_mitre_shortname": name.lower().replace(" ", "-"),
+                "external_references": [mitre_reference(tact_id, f"tactics/{tact_id}")],
+            }
+        )
+    catalog["tactics"] = tactics
+
+    # Base Techniques - each under 1 Tactic (some 2), subtechniques spread over them unevenly like in ATT&CK
+    n_base = counts["base_techniques"]
+    base_ids = [f"T{1000 + i * (MAX_BASE_TECHNIQUES // n_base):04d}" for i in range(n_base)]
+    sub_counts = [0] * n_base
+    with_subs = rng.sample(range(n_base), k=max(1, n_base // 2)) if counts["subtechniques"] else []
+    for i in range(counts["subtechniques"]):
+        slot = with_subs[i % len(with_subs)] if (rng.random() < 0.5) else rng.choice(with_subs)
+        while sub_counts[slot] >= MAX_SUBS_PER_BASE:
+            slot = (slot + 1) % n_base
+        sub_counts[slot] += 1
+
+    techniques = []
+    for tech_id, n_subs in zip(base_ids, sub_counts):
+        phases = rng.sample(tactics, k=2 if (rng.random() < 0.15 and len(tactics) > 1) else 1)
+        base = make_technique(rng, tech_id, phases, parent=None)
+        techniques.append(base)
+        for sub_num in range(1, n_subs + 1):
+            techniques.append(make_technique(rng, f"{tech_id}.{sub_num:03d}", phases, parent=base))
+    catalog["techniques"] = techniques
+
+    # Data Sources / Components
+    data_sources = []
+    for i in range(counts["data_sources"]):
+        ds_id = f"DS{i + 1:04d}"
+        data_sources.append(
+            {
+                "type": "x-mitre-data-source",
+                "id": stix_id(rng, "x-mitre-data-source"),
+                "name": f"{title(rng, 1, 2)} {i + 1}",
+                "description": paragraph(rng, 1),
+                "external_references": [mitre_reference(ds_id, f"datasources/{ds_id}")],
+            }
+        )
+    catalog["data_sources"] = data_sources
+
+    catalog["data_components"] = [
+        {
+            "type": "x-mitre-data-component",
+            "id": stix_id(rng, "x-mitre-data-component"),
+            "name": f"{title(rng, 1, 3)} {i + 1}",
+            "description": paragraph(rng, 1),
+            "x_mitre_data_source_ref": data_sources[i % len(data_sources)]["id"],
+        }
+        for i in range(counts["data_components"])
+    ]
+
+    # Groups / Software - sources of the procedure examples
+    n_sources = min(2 * MAX_OTHER_IDS, max(1, counts["blurbs"] // BLURBS_PER_SOURCE))
+    sources = []
+    for i in range(n_sources):
+        is_group = i % 2 == 0
+        ext_id = f"{'G' if is_group else 'S'}{i // 2 + 1:04d}"
+        sources.append(
+            {
+                "type": "intrusion-set" if is_group else "malware",
+                "id": stix_id(rng, "intrusion-set" if is_group else "malware"),
+                "name": f"{title(rng, 1, 2)} {ext_id}",
+                "description": paragraph(rng, 1),
+                "external_references": [mitre_reference(ext_id, f"{'groups' if is_group else 'software'}/{ext_id}")],
+            }
+        )
+    catalog["sources"] = sources
+
+    return catalog
+
+
+def make_technique(rng, tech_id, phases, parent):
+    ref_nums = [rng.randint(1, 99999) for _ in range(rng.randint(1, 4))]
+    description = " ".join(
+        f"{sentence(rng, 12, 30)}(Citation: Synthetic Report {ref_num})" for ref_num in ref_nums
+    ) + (" " + paragraph(rng, rng.randint(2, 6)))
+
+    return {
+        "type": "attack-pattern",
+        "id": stix_id(rng, "attack-pattern"),
+        "name": title(rng, 1, 4),
+        "description": description,
+        "kill_chain_phases": [
+            {"kill_chain_name": "mitre-attack", "phase_name": tactic["x_mitre_shortname"]} for tactic in phases
+        ],
+        "x_mitre_platforms": parent["x_mitre_platforms"] if parent else rng.sample(PLATFORMS, k=rng.randint(1, 4)),
+        "x_mitre_is_subtechnique": parent is not None,
+        "external_references": [
+            mitre_reference(tech_id, f"techniques/{tech_id.replace('.', '/')}"),
+            *[citation_reference(ref_num) for ref_num in dict.fromkeys(ref_nums)],
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# per-version source files
+
+
+def version_techniques(catalog, version, seed, churn):
+    # each version drops its own sample of subtechniques (as deprecated) - so versions differ like real ones do
+    rng = random.Random(f"{seed}:{version}")
+    techniques = []
+    for tech in catalog["techniques"]:
+        if tech["x_mitre_is_subtechnique"] and (rng.random() < churn):
+            tech = {**tech, "x_mitre_deprecated": True}
+        techniques.append(tech)
+    return techniques
+
+
+def attack_objects(catalog, techniques, counts, seed):
+    # yields the bundle's objects - relationships are generated as written, never all held at once
+    rng = random.Random(f"{seed}:relationships")
+    tactics = catalog["tactics"]
+
+    yield {
+        "type": "x-mitre-matrix",
+        "id": stix_id(rng, "x-mitre-matrix"),
+        "name": "Synthetic Enterprise ATT&CK",
+        "description": "Synthetic matrix generated for benchmarking.",
+        "tactic_refs": [tactic["id"] for tactic in tactics],
+        "external_references": [mitre_reference("enterprise-attack", "matrices/enterprise")],
+    }
+    yield from tactics
+    yield from techniques
+    yield from catalog["data_sources"]
+    yield from catalog["data_components"]
+    yield from catalog["sources"]
+
+    # Sub -subtechnique-of-> Base
+    base_stix_ids = {}
+    for tech in techniques:
+        tech_id = tech["external_references"][0]["external_id"]
+        if not tech["x_mitre_is_subtechnique"]:
+            base_stix_ids[tech_id] = tech["id"]
+            continue
+        yield {
+            "type": "relationship",
+            "id": stix_id(rng, "relationship"),
+            "relationship_type": "subtechnique-of",
+            "source_ref": tech["id"],
+            "target_ref": base_stix_ids[tech_id.split(".")[0]],
+        }
+
+    # DataComponent -detects-> Technique
+    data_components = catalog["data_components"]
+    for tech in techniques:
+        for dc in rng.sample(data_components, k=min(len(data_components), rng.randint(1, 4))):
+            yield {
+                "type": "relationship",
+                "id": stix_id(rng, "relationship"),
+                "relationship_type": "detects",
+                "source_ref": dc["id"],
+                "target_ref": tech["id"],
+                "description": f"Monitor for {phrase(rng, 4, 12)}.",
+            }
+
+    # Group / Software -uses-> Technique (procedure examples -> Blurbs)
+    sources = catalog["sources"]
+    for _ in range(counts["blurbs"]):
+        source = rng.choice(sources)
+        tech = rng.choice(techniques)
+        ref_num = rng.randint(1, 99999)
+        yield {
+            "type": "relationship",
+            "id": stix_id(rng, "relationship"),
+            "relationship_type": "uses",
+            "source_ref": source["id"],
+            "target_ref": tech["id"],
+            "description": (
+                f"[{source['name']}]({source['external_references'][0]['url']}) has used "
+                f"{phrase(rng, 6, 24)}.(Citation: Synthetic Report {ref_num})"
+            ),
+            "external_references": [citation_reference(ref_num)],
+        }
+
+
+def write_attack(path, objects, version):
+    # streamed out, one object per line - at 100x scale the bundle is far too big to build in memory first
+    with open(path, "w", encoding="UTF-8") as fhandle:
+        fhandle.write(f'{{"type": "bundle", "id": "bundle--synthetic-{version}", "objects": [\n')
+        for ind, obj in enumerate(objects):
+            fhandle.write(("" if ind == 0 else ",\n") + json.dumps(obj))
+        fhandle.write("\n]}\n")
+
+
+def tree_content(catalog, techniques, seed):
+    rng = random.Random(f"{seed}:tree")
+    has_subs = {
+        t["external_references"][0]["external_id"].split(".")[0] for t in techniques if t["x_mitre_is_subtechnique"]
+    }
+    tree = {}
+    for tactic in catalog["tactics"]:
+        tree[tactic["external_references"][0]["external_id"]] = {
+            "__name": tactic["name"],
+            "question": f"How is the adversary trying to **{phrase(rng, 3, 8)}**?",
+            "answer": f"**{phrase(rng, 3, 8).capitalize()}** {phrase(rng, 4, 12)}.",
+        }
+    for tech in techniques:
+        tech_id = tech["external_references"][0]["external_id"]
+        tree[tech_id] = {
+            "__name": tech["name"],
+            "question": f"How is the adversary **{phrase(rng, 3, 8)}**?" if tech_id in has_subs else None,
+            "answer": f"**{phrase(rng, 2, 6).capitalize()}** to {phrase(rng, 6, 18)}.",
+        }
+    return tree
+
+
+def co_occurrences(tech_ids, seed, per_technique=10):
+    rng = random.Random(f"{seed}:co_occurrences")
+    references = {tech_id: rng.randint(1, 400) for tech_id in tech_ids}
+    entries = []
+    for tech_i in tech_ids:
+        for tech_j in rng.sample(tech_ids, k=min(len(tech_ids) - 1, per_technique) if len(tech_ids) > 1 else 0):
+            if tech_j == tech_i:
+                continue
+            shared = rng.randint(1, min(references[tech_i], references[tech_j]))
+            j_avg = rng.uniform(1, 40)
+            entries.append(
+                {
+                    "technique_i": tech_i,
+                    "technique_j": tech_j,
+                    "score": round(rng.uniform(0, 10), 1),
+                    "i_references": references[tech_i],
+                    "j_references": references[tech_j],
+                    "shared_references": shared,
+                    "shared_percent": round(100 * shared / references[tech_i]),
+                    "j_avg": j_avg,
+                    "j_std": rng.uniform(0, j_avg / 2),
+                }
+            )
+    return entries
+
+
+def akas(tech_ids, seed, share=0.5):
+    rng = random.Random(f"{seed}:akas")
+    return [
+        {"id": tech_id, "akas": [phrase(rng, 1, 3) for _ in range(rng.randint(1, 4))]}
+        for tech_id in tech_ids
+        if rng.random() < share
+    ]
+
+
+def mismappings(tech_ids, seed, share=0.05):
+    rng = random.Random(f"{seed}:mismappings")
+    return [
+        {
+            "original": tech_id,
+            "corrected": rng.choice(tech_ids) if (rng.random() < 0.8) else "N/A",
+            "context": sentence(rng),
+            "rationale": sentence(rng),
+        }
+        for tech_id in tech_ids
+        if rng.random() < share
+    ]
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="UTF-8") as fhandle:
+        json.dump(data, fhandle)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "Writes synthetic, schema-valid build sources at a chosen scale (for benchmarks)."
+    )
+    parser.add_argument("--output", required=True, help="Build sources dir to write (BUILD_SOURCES_DIR for builds).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Size relative to Enterprise ATT&CK v14.1.")
+    parser.add_argument("--techniques", type=int, help="Techniques (base + sub) per version - overrides --scale.")
+    parser.add_argument("--blurbs", type=int, help="Procedure examples per version - overrides --scale.")
+    parser.add_argument("--tactics", type=int, default=BASE_SCALE["tactics"], help="Tactics in the matrix.")
+    parser.add_argument("--versions", type=int, default=1, help="Number of ATT&CK versions to write.")
+    parser.add_argument("--first-version", type=int, default=100, help="Major number of the first version (10+).")
+    parser.add_argument("--churn", type=float, default=0.02, help="Share of subtechniques deprecated per version.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed - the same arguments give the same files.")
+    parser.add_argument(
+        "--skip-validate", action="store_true", help="Don't load the written files back to check them."
+    )
+    args = parser.parse_args()
+
+    if args.first_version < 10:
+        print("Versions below 10 have no Data Sources / Components - use a --first-version of 10+. Exiting.")
+        sys.exit(1)
+
+    try:
+        counts = scaled_counts(args.scale, args.techniques, args.blurbs)
+    except ValueError as ex:
+        print(f"{ex}. Exiting.")
+        sys.exit(2)
+
+    t0 = time.time()
+    for sub_dir in ("enterprise-attack", "tree", "co_occurrences", "akas", "mismappings"):
+        os.makedirs(os.path.join(args.output, sub_dir), exist_ok=True)
+
+    # roles (and users, when set up) are copied over so a full_build can run on the output as-is
+    for file_name in ("role.json", "user.json"):
+        for src_dir in ACCOUNT_SOURCE_DIRS:
+            src_path = os.path.join(src_dir, file_name)
+            if os.path.isfile(src_path):
+                shutil.copyfile(src_path, os.path.join(args.output, file_name))
+                break
+        else:
+            print(f"No {file_name} to copy - add one to {args.output} before running a full_build on it.")
+
+    print(
+        f"Generating {counts['base_techniques']} Techniques + {counts['subtechniques']} Subtechniques, "
+        f"{counts['blurbs']} Blurbs, {args.tactics} Tactics per version"
+    )
+    catalog = make_catalog(random.Random(args.seed), counts, args.tactics)
+
+    versions = [f"v{args.first_version + i}.0" for i in range(args.versions)]
+    for version in versions:
+        techniques = version_techniques(catalog, version, args.seed, args.churn)
+        active = [t for t in techniques if not t.get("x_mitre_deprecated", False)]
+        tech_ids = [t["external_references"][0]["external_id"] for t in active]
+
+        write_attack(
+            os.path.join(args.output, "enterprise-attack", f"enterprise-attack-{version}.json"),
+            attack_objects(catalog, active, counts, args.seed),
+            version,
+        )
+        write_json(
+            os.path.join(args.output, "tree", f"tree-content-{version}.json"), tree_content(catalog, active, args.seed)
+        )
+        write_json(
+            os.path.join(args.output, "co_occurrences", f"co-occurrences-{version}.json"),
+            co_occurrences(tech_ids, args.seed),
+        )
+        write_json(os.path.join(args.output, "akas", f"akas-{version}.json"), akas(tech_ids, args.seed))
+        write_json(
+            os.path.join(args.output, "mismappings", f"mismappings-{version}.json"), mismappings(tech_ids, args.seed)
+        )
+        print(f"Wrote {version} ({len(active)} active Techniques) at {time.time() - t0:.1f}s")
+
+    print("\n------------------------------------------------\n")
+
+    # what a build would see - loading is slow (and memory hungry) for big scales, so can be skipped
+    if args.skip_validate:
+        print(f"Done in {time.time() - t0:.1f}s - build with: BUILD_SOURCES_DIR={os.path.abspath(args.output)}")
+        return
+
+    src_mgr = SourceManager(args.output)
+    for version in versions:
+        sources = [src_mgr.attack, src_mgr.tree, src_mgr.co_ocs, src_mgr.akas, src_mgr.mismaps]
+        if not all(source[version].load_validate() for source in sources):
+            print(f"Generated sources of {version} failed to validate. Exiting.")
+            sys.exit(3)
+        print(f"Validated {version}.")
+
+    print(f"\nDone in {time.time() - t0:.1f}s - build with: BUILD_SOURCES_DIR={os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
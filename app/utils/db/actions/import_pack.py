@@ -0,0 +1,121 @@
+from flask import Flask
+
+from app.models import db
+from sqlalchemy import inspect
+
+from app.utils.db.source_loader import SourceManager
+import app.utils.db.create as db_create
+import app.utils.db.read as db_read
+from app.utils.db import pack as db_pack
+from app.utils.db.util import app_config_selector
+
+from app.constants import BUILD_SOURCES_DIR
+
+import argparse
+import time
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+
+    # optional avenue of command-line instead of text-ui
+    parser = argparse.ArgumentParser("Adds an ATT&CK version to the DB from a pack file (see export_pack).")
+    parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    parser.add_argument("--pack", required=True, help="Path of the pack file to load.")
+    args = parser.parse_args()
+
+    # perform config selection, can fail on bad cmdline pick
+    try:
+        app_config = app_config_selector(args.config)
+    except Exception as ex:
+        print(f"Invalid command-line selection made:\n{ex}")
+        sys.exit(1)
+
+    print("\n------------------------------------------------\n")
+
+    try:
+        manifest = db_pack.read_manifest(args.pack)
+    except Exception as ex:
+        print(f"Failed to read pack {args.pack} - due to:\n{ex}")
+        sys.exit(2)
+    to_install = manifest["attack_version"]
+
+    app = Flask(__name__)
+    app.config.from_object(app_config)
+    db.init_app(app)
+    with app.app_context():
+
+        # DB ASSESSMENT -----------------------------------------------------------------------------------------------
+
+        try:
+            fresh_db = not inspect(db.engine).has_table("attack_version")
+            versions_installed = [] if fresh_db else db_read.attack.versions()
+        except Exception as ex:
+            print(f"Failed to read what ATT&CK versions are currently installed on the DB - due to:\n{ex}")
+            sys.exit(3)
+
+        if to_install in versions_installed:
+            print(f"Version {to_install} is already installed, remove it first to load it from a pack. Exiting.")
+            sys.exit(4)
+
+        # IMPORT INFO PRINT-OUT ---------------------------------------------------------------------------------------
+
+        print("Import Detail:")
+        if fresh_db:
+            print(" + Tables (fresh DB)")
+        print(f" + ATT&CK Version {to_install} (exported {manifest['exported_at']}):")
+        for table in manifest["tables"]:
+            print(f"    + {table['name']}: {table['rows']} rows")
+
+        print("\n------------------------------------------------\n")
+
+        # IMPORT PROCESS ----------------------------------------------------------------------------------------------
+
+        t0 = time.time()
+
+        # fresh DB -> same setup as full_build (Roles / Users if their sources are present)
+        if fresh_db:
+            try:
+                db_create.extensions_dictionary()
+                db_create.all_tables()
+                src_mgr = SourceManager(BUILD_SOURCES_DIR)
+                if src_mgr.role.load_validate() and src_mgr.user.load_validate():
+                    db_create.role.add_all(src_mgr)
+                    db_create.user.add_all(src_mgr)
+                else:
+                    print("Role / User sources not loaded - none were added to the DB.")
+            except Exception as ex:
+                tfail = time.time() - t0
+                print(f"Failed to set up fresh DB at {tfail:.1f}s into import - due to:\n{ex}")
+                sys.exit(5)
+
+        # pack content - single transaction
+        try:
+            db_pack.import_version(args.pack)
+            db.session.commit()
+        except Exception as ex:
+            db.session.rollback()
+            tfail = time.time() - t0
+            print(f"Failed to import version {to_install} at {tfail:.1f}s into import - due to:\n{ex}")
+            print("No version content was added, as the import runs in a single transaction.")
+            sys.exit(6)
+
+        # db kiosk user
+        if fresh_db:
+            try:
+                db_create.kiosk_user()
+            except Exception as ex:
+                tfail = time.time() - t0
+                print(f"Failed to create Kiosk user at {tfail:.1f}s into import - due to:\n{ex}")
+                sys.exit(7)
+
+        print("\n------------------------------------------------\n")
+        tdone = time.time() - t0
+        print(f"SUCCESS - Imported Version {to_install} In: {tdone:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from flask import Flask
+
+from app.models import db
+
+import app.utils.db.create as db_create
+from app.utils.db.util import app_config_selector
+
+import argparse
+import time
+
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def main():
+
+    # optional avenue of command-line instead of text-ui
+    parser = argparse.ArgumentParser(
+        "Migrates an existing DB to LIST-partition its version-scoped tables by ATT&CK version."
+    )
+    parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    args = parser.parse_args()
+
+    # perform config selection, can fail on bad cmdline pick
+    try:
+        app_config = app_config_selector(args.config)
+    except Exception as ex:
+        print(f"Invalid command-line selection made:\n{ex}")
+        sys.exit(1)
+
+    print("\n------------------------------------------------\n")
+
+    app = Flask(__name__)
+    app.config.from_object(app_config)
+    db.init_app(app)
+    with app.app_context():
+
+        # MIGRATION INFO PRINT-OUT ------------------------------------------------------------------------------------
+
+        print("Migration Detail:")
+        for model in db_create.partition.VERSIONED_TABLES:
+            print(f" * {model.__table__.name} -> LIST-partitioned by attack_version (1 partition per version)")
+        print(" - Foreign keys referencing these tables' uid columns are dropped")
+        print(" - Grants on these tables (the kiosk user's SELECT) are re-issued on the partitioned tables")
+
+        print("\n------------------------------------------------\n")
+
+        # MIGRATION PROCESS -------------------------------------------------------------------------------------------
+
+        t0 = time.time()
+
+        try:
+            db_create.partition.all_tables()
+        except Exception as ex:
+            db.session.rollback()
+            tfail = time.time() - t0
+            print(f"Failed to partition tables at {tfail:.1f}s into migration - due to:\n{ex}")
+            print("No changes were made, as the migration runs in a single transaction.")
+            sys.exit(2)
+
+        print("\n------------------------------------------------\n")
+        tdone = time.time() - t0
+        print(f"SUCCESS - Partitioned Tables In: {tdone:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,13 @@ from app.models import db
 
 import app.utils.db.read as db_read
 import app.utils.db.destroy as db_destroy
-from app.utils.db.util import option_selector, app_config_selector
+from app.utils.db.util import (
+    option_selector,
+    app_config_selector,
+    build_report,
+    write_build_report,
+    write_build_report_at_exit,
+)
 
 import argparse
 import time
@@ -20,6 +26,8 @@ def main():
     parser = argparse.ArgumentParser("Removes an ATT&CK version from the database.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
     parser.add_argument("--version", help="ATT&CK version to be removed.")
+    parser.add_argument("--report", help="Path to write a JSON report of per-stage timings / row counts to.")
+    parser.add_argument("--compare", help="Path of a previous JSON report to compare this run's stages against.")
     args = parser.parse_args()
 
     # ensure all-or-nothing command-line argument pick
@@ -96,6 +104,9 @@ def main():
         # TEAR DOWN PROCESS -------------------------------------------------------------------------------------------
 
         t0 = time.time()
+        build_report.start("remove_version", version=to_remove)
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report_at_exit(args.report, args.compare)
 
         # ATT&CK + Tree content
         try:
@@ -106,12 +117,16 @@ def main():
                 f"Failed to remove ATT&CK/Tree content for version {to_remove}"
                 f" at {tfail:.1f}s into build - due to:\n{ex}"
             )
+            print("No changes were made, as the removal runs in a single transaction.")
             sys.exit(6)
 
         print("\n------------------------------------------------\n")
         tdone = time.time() - t0
         print(f"SUCCESS - Removed Version {to_remove} In: {tdone:.1f}s!")
 
+        if (args.report is not None) or (args.compare is not None):
+            write_build_report(args.report, args.compare)
+
 
 if __name__ == "__main__":
     main()
@@ -1,62 +1,49 @@
 from app.models import db, Aka, technique_aka_map
 
 import app.utils.db.read as db_read
+import app.utils.db.create as db_create
 
 from app.utils.db.util import messaged_timer
 
-import copy
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# (Technique, AKA term) pairs resolved and inserted per round-trip
+BATCH_SIZE = 1000
+
+
+def add_batch(tech_uid_terms):
+    # Resolve the batch's terms to Aka UIDs, inserting the ones not yet in the table
+    terms = list(dict.fromkeys(term for _, term in tech_uid_terms))
+    term_to_uid = db_create.util.upsert_uids(Aka, Aka.term, terms, lambda term: {"term": term})
+
+    # Map Techniques to Akas (a source entry can list a term twice)
+    aka_mappings = [{"technique": tech_uid, "aka": term_to_uid[term]} for tech_uid, term in tech_uid_terms]
+    db.session.execute(pg_insert(technique_aka_map).values(aka_mappings).on_conflict_do_nothing())
 
 
 @messaged_timer("Building Akas table")
 def add_version(version, src_mgr):
-    # Determine at what offset to insert Akas
-    next_uid_up = db_read.util.max_primary_key(Aka.uid) + 1
+    db_create.util.ensure_unique_index(Aka.term)
 
     # Allows for conversion of TechID to UID for the mapping table
     tech_id_to_uid = db_read.attack.tech_id_to_uid(version)
 
     # Load data - [ {"id": "T1003", "akas": ["dump password hashes", ..]}, ..]
-    aka_data = copy.deepcopy(src_mgr.akas[version].get_data())
-
-    # Resolver for current AKAs -> UIDs and one for newly made AKAs
-    current_term_to_uid = {term: uid for term, uid in db.session.query(Aka.term, Aka.uid).all()}
-    new_term_to_uid = {}
+    aka_data = src_mgr.akas[version].get_data()
 
-    # Process all entries (of which Tech ID mentioned is in this version of ATT&CK)
+    # Process all entries (of which Tech ID mentioned is in this version of ATT&CK), a batch at a time
+    batch = []
     for entry in aka_data:
-        if entry["id"] not in tech_id_to_uid:
+        tech_uid = tech_id_to_uid.get(entry["id"])
+        if tech_uid is None:
             continue
 
-        # Get the entry terms and iterate over them, they will be
-        # mapped to existing & new UIDs
-        terms = entry["akas"]
-        terms_as_uids = []
-        for term in terms:
-
-            # Term->UID already in database
-            if term in current_term_to_uid:
-                terms_as_uids.append(current_term_to_uid[term])
-
-            # Term->UID already in memory
-            elif term in new_term_to_uid:
-                terms_as_uids.append(new_term_to_uid[term])
-
-            # new Term->UID mapping
-            else:
-                new_term_to_uid[term] = next_uid_up  # record map to be added to mappings
-                terms_as_uids.append(next_uid_up)
-                next_uid_up += 1
-
-        # transform entry's id into Tech UID and Akas in Aka UIDs
-        entry["akas"] = terms_as_uids
-        entry["id"] = tech_id_to_uid[entry["id"]]
-
-    # Add newly created Akas to Aka
-    new_term_to_uid = [{"uid": uid, "term": term} for term, uid in new_term_to_uid.items()]
-    db.session.bulk_insert_mappings(Aka, new_term_to_uid, render_nulls=True)
-    db.session.commit()
+        for term in entry["akas"]:
+            batch.append((tech_uid, term))
+            if len(batch) >= BATCH_SIZE:
+                add_batch(batch)
+                batch = []
 
-    # Add both new & old mappings to map
-    aka_mappings = [{"technique": entry["id"], "aka": aka_uid} for entry in aka_data for aka_uid in entry["akas"]]
-    db.session.execute(technique_aka_map.insert().values(aka_mappings))
+    if batch:
+        add_batch(batch)
     db.session.commit()
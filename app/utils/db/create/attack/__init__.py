@@ -268,17 +268,11 @@ def tact_tech_map(version, src_mgr):
 
 @messaged_timer("Building Platform table (+ mappings to AttackVersion & Technique)")
 def platform_table(version, src_mgr):
-    old_plat_name_uid = db.session.query(Platform.readable_name, Platform.uid).all()
-    old_plat_name_to_uid = {name: uid for name, uid in old_plat_name_uid}
-    next_plat_uid = max(list(old_plat_name_to_uid.values()), default=0) + 1
-
-    new_plat_name_to_uid = {}
-
-    attack_version_platform_uids = set()
+    db_create.util.ensure_unique_index(Platform.readable_name)
 
     tech_id_to_uid = db_read.attack.tech_id_to_uid(version)
 
-    tech_uid_plat_uid = []
+    tech_uid_plat_name = []
 
     # get techniques
     attack: dict = src_mgr.attack[version].get_data()
@@ -292,41 +286,30 @@ def platform_table(version, src_mgr):
 
         tech_platforms = tech["x_mitre_platforms"]
         for platform in tech_platforms:
-
-            if platform in old_plat_name_to_uid:
-                plat_uid = old_plat_name_to_uid[platform]
-
-            elif platform in new_plat_name_to_uid:
-                plat_uid = new_plat_name_to_uid[platform]
-
-            else:
-                plat_uid = next_plat_uid
-                next_plat_uid += 1
-                new_plat_name_to_uid[platform] = plat_uid
-
-            tech_uid_plat_uid.append({"technique": tech_uid, "platform": plat_uid})
-            attack_version_platform_uids.add(plat_uid)
-
-    new_platforms = [
-        {
+            tech_uid_plat_name.append((tech_uid, platform))
+
+    # resolve this version's platforms to UIDs, inserting those not yet present (in order of appearance)
+    plat_names = list(dict.fromkeys(plat_name for _, plat_name in tech_uid_plat_name))
+    plat_name_to_uid = db_create.util.upsert_uids(
+        Platform,
+        Platform.readable_name,
+        plat_names,
+        lambda plat_name: {
             # fmt: off
-            "uid"          : uid,
             "readable_name": plat_name,
             "internal_name": plat_name.lower().replace(" ", "_"),
             # fmt: on
-        }
-        for plat_name, uid in new_plat_name_to_uid.items()
-    ]
-    new_platforms.sort(key=lambda p: p["uid"])  # ensures order of platform uids for clean DB
-    db.session.bulk_insert_mappings(Platform, new_platforms, render_nulls=True)
-    db.session.commit()
+        },
+    )
 
     version_platform_mappings = [
-        {"version": version, "platform": platform_uid} for platform_uid in sorted(list(attack_version_platform_uids))
+        {"version": version, "platform": platform_uid} for platform_uid in sorted(plat_name_to_uid.values())
     ]
     db.session.execute(attack_version_platform_map.insert().values(version_platform_mappings))
-    db.session.commit()
 
+    tech_uid_plat_uid = [
+        {"technique": tech_uid, "platform": plat_name_to_uid[plat_name]} for tech_uid, plat_name in tech_uid_plat_name
+    ]
     tech_uid_plat_uid.sort(key=lambda m: m["technique"])
     db.session.execute(technique_platform_map.insert().values(tech_uid_plat_uid))
     db.session.commit()
@@ -553,6 +536,10 @@ def add_version(version, src_mgr):
     db.session.add(AttackVersion(version=version))
     db.session.commit()
 
+    # version partitions [only when version-scoped tables are LIST-partitioned]
+    if db_read.util.is_partitioned(Technique.__table__.name):
+        db_create.partition.add_version(version)
+
     # technique [subs need parent_uids and base names for their full_name]
     # subtechnique
     db_create.attack.technique_table(version, src_mgr)
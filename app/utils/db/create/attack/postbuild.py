@@ -1,7 +1,32 @@
 from app.models import db
 
+import app.utils.db.read as db_read
+
 from app.utils.db.util import messaged_timer
 
+# add function "tsvector_agg" that allows aggregating an array TSvecs
+TSVECTOR_AGG_FUNCTION = r"""
+    DROP FUNCTION IF EXISTS tsvector_agg;
+    CREATE FUNCTION tsvector_agg(tsvector[]) RETURNS tsvector AS $$
+    DECLARE
+        tsvector_item tsvector;
+        tsvec_accumulator tsvector := '';
+    BEGIN
+        FOREACH tsvector_item IN ARRAY $1
+        LOOP
+            tsvec_accumulator := tsvec_accumulator || tsvector_item;
+        END LOOP;
+        RETURN tsvec_accumulator;
+    END;
+    $$ LANGUAGE plpgsql IMMUTABLE;
+"""
+
+
+def is_partitioned_with_generated(column_name):
+    # partitioned Technique table: a new version's partition inherits generated columns & indexes from the parent
+    # so there is no need to drop and regenerate them across all versions' partitions
+    return db_read.util.is_partitioned("technique") and db_read.util.is_generated_column("technique", column_name)
+
 
 @messaged_timer("Creating index for full Technique search")
 def add_technique_search_index():
@@ -16,6 +41,9 @@ def add_technique_search_index():
     #    replace MD links [Text](URL) -> Text
     # 5. regexp_replace(__4__, '[^a-z0-9 ]+', ' ', 'gi')
     #    all non A-z0-9/space -> ' '
+    if is_partitioned_with_generated("tech_ts"):
+        return
+
     db.session.execute(
         r"""
     DROP INDEX IF EXISTS tech_ts_index;
@@ -56,6 +84,9 @@ def add_technique_answer_search_facilities():
     #    - its description
     #    - the answer cards of its sub-techs
     #    - the descriptions of its sub-techs
+    if is_partitioned_with_generated("tech_ans_ts"):
+        return
+
     db.session.execute(
         r"""
     DROP INDEX IF EXISTS tech_ans_ts_index;
@@ -69,20 +100,20 @@ def add_technique_answer_search_facilities():
             '[^a-z0-9 ]+', ' ', 'gi'))
             ) STORED;
     CREATE INDEX tech_ans_ts_index ON technique USING gist(tech_ans_ts);
-
-    DROP FUNCTION IF EXISTS tsvector_agg;
-    CREATE FUNCTION tsvector_agg(tsvector[]) RETURNS tsvector AS $$
-    DECLARE
-        tsvector_item tsvector;
-        tsvec_accumulator tsvector := '';
-    BEGIN
-        FOREACH tsvector_item IN ARRAY $1
-        LOOP
-            tsvec_accumulator := tsvec_accumulator || tsvector_item;
-        END LOOP;
-        RETURN tsvec_accumulator;
-    END;
-    $$ LANGUAGE plpgsql IMMUTABLE;
     """.strip()
+        + TSVECTOR_AGG_FUNCTION
     )
     db.session.commit()
+
+
+@messaged_timer("Ensuring search facilities for loaded search columns")
+def add_loaded_search_facilities():
+    # for search columns filled with precomputed tsvectors (pack import) rather than generated by the DB
+    # indexes them and adds tsvector_agg - left to the caller to commit
+    db.session.execute(
+        r"""
+    CREATE INDEX IF NOT EXISTS tech_ts_index ON technique USING gist(tech_ts);
+    CREATE INDEX IF NOT EXISTS tech_ans_ts_index ON technique USING gist(tech_ans_ts);
+    """.strip()
+        + TSVECTOR_AGG_FUNCTION
+    )
@@ -0,0 +1,17 @@
+from app.models import db, BuildCheckpoint, VersionSource
+
+from datetime import datetime
+
+
+def checkpoint(stage):
+    # records a full_build stage as completed - called only after the stage has committed its content
+    # (merged, as a reconcile run can repeat the stages of a version it reinstalls)
+    db.session.merge(BuildCheckpoint(stage=stage, completed_at=datetime.now()))
+    db.session.commit()
+
+
+def record_source(version, source_hash):
+    # records the hash of the sources a version was installed from (table made on demand for older DBs)
+    VersionSource.__table__.create(db.engine, checkfirst=True)
+    db.session.merge(VersionSource(version=version, source_hash=source_hash))
+    db.session.commit()
@@ -1,9 +1,11 @@
-from app.models import db, Cart
+from app.models import db, Cart, HeldCart
 
 import app.utils.db.read as db_read
 
 from app.utils.db.util import messaged_timer
 
+from sqlalchemy import inspect, select
+
 import copy
 
 
@@ -28,3 +30,18 @@ def add_all(src_mgr):
     # add Carts
     db.session.bulk_insert_mappings(Cart, carts, render_nulls=True)
     db.session.commit()
+
+
+@messaged_timer("Restoring Carts for reinstalled version")
+def restore_held(version):
+    # re-adds the Carts set aside by destroy.attack.drop_version(.., hold_carts=True), keeping their IDs
+    # they leave the holding table in the same transaction - so a failure at any point before here keeps them held
+    if not inspect(db.engine).has_table(HeldCart.__table__.name):
+        return
+    cart_cols = [col.name for col in Cart.__table__.columns]
+    restore_carts = Cart.__table__.insert().from_select(
+        cart_cols, select(*[HeldCart.__table__.c[col] for col in cart_cols]).where(HeldCart.attack_version == version)
+    )
+    db.session.execute(restore_carts)
+    db.session.execute(HeldCart.__table__.delete().where(HeldCart.attack_version == version))
+    db.session.commit()
@@ -0,0 +1,125 @@
+from app.models import db, Tactic, Technique, DataSource, DataComponent
+
+import app.utils.db.read as db_read
+
+from app.utils.db.util import messaged_timer
+
+from sqlalchemy import String
+from sqlalchemy.sql import text as sql_text
+
+import re
+
+# tables holding content scoped to a single ATT&CK version (via their attack_version column)
+# these can be LIST-partitioned by attack_version - giving a partition per version
+VERSIONED_TABLES = [Tactic, Technique, DataSource, DataComponent]
+
+
+def partition_name(table_name, version):
+    # technique + v14.1 -> technique_v14_1
+    return f"{table_name}_{re.sub('[^a-z0-9]+', '_', version.lower())}"
+
+
+def quote_ident(name):
+    return db.engine.dialect.identifier_preparer.quote(name)
+
+
+def quote_literal(value):
+    return String("").literal_processor(dialect=db.engine.dialect)(value=value)
+
+
+def convert_table(table_name):
+    # converts a version-scoped table to a LIST-partitioned (by attack_version) one, keeping its rows
+    # - primary key becomes (uid, attack_version), as a partitioned table's keys must hold the partition key
+    # - FKs pointing at the table's uid are dropped, as they can no longer reference a unique uid column
+    # - FK to attack_version, the uid sequence, other indexes (FTS / generated columns), and grants are carried over
+    old_table_name = f"{table_name}_unpartitioned"
+    table, old_table = quote_ident(table_name), quote_ident(old_table_name)
+
+    db.session.execute(f"ALTER TABLE {table} RENAME TO {old_table};")
+    db.session.execute(
+        f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING GENERATED)"
+        " PARTITION BY LIST (attack_version);"
+    )
+
+    # partition per version currently installed
+    for version in db_read.attack.versions():
+        add_partition(table_name, version)
+
+    # copy rows over (generated columns are re-generated)
+    copy_cols = (
+        db.session.execute(
+            sql_text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = :old_table_name AND is_generated = 'NEVER' ORDER BY ordinal_position"
+            ).bindparams(old_table_name=old_table_name)
+        )
+        .scalars()
+        .all()
+    )
+    copy_cols = ", ".join(quote_ident(c) for c in copy_cols)
+    db.session.execute(f"INSERT INTO {table} ({copy_cols}) SELECT {copy_cols} FROM {old_table};")
+
+    # keep uid sequence alive past the drop of the old table
+    uid_seq = db.session.execute(
+        sql_text("SELECT pg_get_serial_sequence(:old_table_name, 'uid')").bindparams(old_table_name=old_table_name)
+    ).scalar()
+    if uid_seq:
+        db.session.execute(f"ALTER SEQUENCE {uid_seq} OWNED BY {table}.uid;")
+
+    # non-key indexes to remake on the partitioned table (FTS indexes - these end up per-partition)
+    index_defs = (
+        db.session.execute(
+            sql_text(
+                "SELECT indexdef FROM pg_indexes WHERE tablename = :old_table_name AND indexname NOT LIKE '%pkey'"
+            ).bindparams(old_table_name=old_table_name)
+        )
+        .scalars()
+        .all()
+    )
+
+    # table privileges (the kiosk user's SELECT) belong to the old table - re-granted on the new one below
+    grants = db.session.execute(
+        sql_text(
+            "SELECT grantee, privilege_type FROM information_schema.role_table_grants "
+            "WHERE table_name = :old_table_name AND grantee <> "
+            "(SELECT tableowner FROM pg_tables WHERE tablename = :old_table_name)"
+        ).bindparams(old_table_name=old_table_name)
+    ).all()
+
+    # CASCADE removes the FKs (of map tables / Blurb / ..) that point at the old table
+    db.session.execute(f"DROP TABLE {old_table} CASCADE;")
+
+    db.session.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (uid, attack_version);")
+    db.session.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (attack_version) REFERENCES attack_version (version);")
+    for index_def in index_defs:
+        db.session.execute(re.sub(rf" ON (\w+\.)?{re.escape(old_table)} ", f" ON {table} ", index_def))
+    for grantee, privilege in grants:
+        grantee = grantee if grantee == "PUBLIC" else quote_ident(grantee)
+        db.session.execute(f"GRANT {privilege} ON {table} TO {grantee};")
+
+
+@messaged_timer("Partitioning version-scoped tables by attack_version")
+def all_tables():
+    # converts all version-scoped tables that aren't yet partitioned - in a single transaction
+    # works on both freshly created (empty) tables and populated ones (migration of an existing DB)
+    for model in VERSIONED_TABLES:
+        table_name = model.__table__.name
+        if db_read.util.is_partitioned(table_name):
+            print(f"{table_name} is already partitioned, skipping")
+            continue
+        convert_table(table_name)
+    db.session.commit()
+
+
+def add_partition(table_name, version):
+    db.session.execute(
+        f"CREATE TABLE IF NOT EXISTS {quote_ident(partition_name(table_name, version))} "
+        f"PARTITION OF {quote_ident(table_name)} FOR VALUES IN ({quote_literal(version)});"
+    )
+
+
+@messaged_timer("Creating partitions for version")
+def add_version(version):
+    for model in VERSIONED_TABLES:
+        add_partition(model.__table__.name, version)
+    db.session.commit()
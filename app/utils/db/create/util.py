@@ -1,3 +1,9 @@
+from app.models import db
+
+import app.utils.db.read as db_read
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 import re
 
 
@@ -36,3 +42,43 @@ def transform_description_citations(item):
                 cite_num += 1
 
     return desc
+
+
+def ensure_unique_index(column):
+    # (for DBs built before the column was made unique) - a no-op when the index is already present
+    # named as PostgreSQL names the constraint made by unique=True, so both paths converge on one index
+    table_name, column_name = column.table.name, column.name
+    db.session.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_{column_name}_key ON {table_name} ({column_name});"
+    )
+
+
+def upsert_uids(model, column, values, row_for):
+    # resolves each of a batch of distinct values to the uid of the model row holding it (in a unique column)
+    # - existing rows are looked up for just the batch, rather than preloading the whole table
+    # - unseen values are inserted with the next uids, ON CONFLICT skipping any that appeared meanwhile
+    value_to_uid = dict(db.session.query(column, model.uid).filter(column.in_(values)).all())
+
+    next_uid_up = db_read.util.max_primary_key(model.uid) + 1
+    new_rows = []
+    for value in values:
+        if value in value_to_uid:
+            continue
+        new_rows.append({"uid": next_uid_up, **row_for(value)})
+        next_uid_up += 1
+
+    if new_rows:
+        insert_new = (
+            pg_insert(model)
+            .values(new_rows)
+            .on_conflict_do_nothing(index_elements=[column.name])
+            .returning(column, model.uid)
+        )
+        value_to_uid.update(db.session.execute(insert_new).all())
+
+    # conflicted rows aren't returned, look them up
+    missing = [value for value in values if value not in value_to_uid]
+    if missing:
+        value_to_uid.update(db.session.query(column, model.uid).filter(column.in_(missing)).all())
+
+    return value_to_uid
@@ -1,4 +1,4 @@
-from . import akas, attack, coocs, mismaps
+from . import akas, attack, build_state, coocs, mismaps, partition
 
 from app.models import db
 from app.utils.db.util import messaged_timer
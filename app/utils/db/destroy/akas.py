@@ -1,19 +1,19 @@
 from app.models import db, Aka, technique_aka_map
 
-import app.utils.db.read as db_read
+from app.utils.db.destroy.attack import version_tech_uids
 
 from app.utils.db.util import messaged_timer
 
+from sqlalchemy import select
+
 
 @messaged_timer("Removing a version from the Akas table")
 def drop_version(version):
-    tech_uids = db_read.attack.tech_uids(version)
-
-    delete_aka_refs = technique_aka_map.delete().where(technique_aka_map.c.technique.in_(tech_uids))
+    # commit is left to the caller - see destroy.attack.drop_version()
+    delete_aka_refs = technique_aka_map.delete().where(technique_aka_map.c.technique.in_(version_tech_uids(version)))
     db.session.execute(delete_aka_refs)
-    db.session.commit()
 
-    referenced_aka_uids = [r[0] for r in db.session.query(technique_aka_map.c.aka).all()]
-    delete_unreferenced_akas = Aka.__table__.delete().where(Aka.uid.notin_(referenced_aka_uids))
+    # Akas are shared across versions - only remove those no longer referenced by any Technique
+    still_referenced = select(technique_aka_map.c.aka).where(technique_aka_map.c.aka == Aka.uid)
+    delete_unreferenced_akas = Aka.__table__.delete().where(~still_referenced.exists())
     db.session.execute(delete_unreferenced_akas)
-    db.session.commit()
@@ -7,6 +7,7 @@ from app.models import (
     DataComponent,
     DataSource,
     Cart,
+    HeldCart,
     Blurb,
     tactic_technique_map,
     technique_platform_map,
@@ -23,85 +24,97 @@ import app.utils.db.destroy as db_destroy
 
 from app.utils.db.util import messaged_timer
 
+from sqlalchemy import select
+
+# Removal stages below only execute their deletes - drop_version() commits them all as a single transaction
+# Rows are matched set-wise via subqueries on attack_version, rather than by lists of UIDs pulled into Python
+
+
+def version_tech_uids(version):
+    return select(Technique.uid).where(Technique.attack_version == version)
+
+
+def version_tact_uids(version):
+    return select(Tactic.uid).where(Tactic.attack_version == version)
+
 
 @messaged_timer("Removing Carts for version")
-def cart_table(version):
+def cart_table(version, hold=False):
+
+    # hold=True : set the Carts aside (in the same transaction) for create.cart.restore_held() to re-add
+    if hold:
+        HeldCart.__table__.create(db.session.connection(), checkfirst=True)
+        cart_cols = [col.name for col in Cart.__table__.columns]
+        hold_carts = HeldCart.__table__.insert().from_select(
+            cart_cols, select(*[Cart.__table__.c[col] for col in cart_cols]).where(Cart.attack_version == version)
+        )
+        db.session.execute(hold_carts)
 
     # Cart
     delete_carts = Cart.__table__.delete().where(Cart.attack_version == version)
     db.session.execute(delete_carts)
-    db.session.commit()
 
 
 @messaged_timer("Removing DataSources & DataComponents for version")
 def data_comp_src_table(version):
-    tech_uids = db_read.attack.tech_uids(version)
-    tact_uids = db_read.attack.tact_uids(version)
 
     # tactic_ds_map
-    delete_tact_ds_map = tactic_ds_map.delete().where(tactic_ds_map.c.tactic.in_(tact_uids))
+    delete_tact_ds_map = tactic_ds_map.delete().where(tactic_ds_map.c.tactic.in_(version_tact_uids(version)))
     db.session.execute(delete_tact_ds_map)
-    db.session.commit()
 
     # technique_ds_map
-    delete_tech_ds_map = technique_ds_map.delete().where(technique_ds_map.c.technique.in_(tech_uids))
+    delete_tech_ds_map = technique_ds_map.delete().where(technique_ds_map.c.technique.in_(version_tech_uids(version)))
     db.session.execute(delete_tech_ds_map)
-    db.session.commit()
 
     # technique_dc_map
-    delete_tech_dc_map = technique_dc_map.delete().where(technique_dc_map.c.technique.in_(tech_uids))
+    delete_tech_dc_map = technique_dc_map.delete().where(technique_dc_map.c.technique.in_(version_tech_uids(version)))
     db.session.execute(delete_tech_dc_map)
-    db.session.commit()
 
     # DataComponent
     delete_datacomp = DataComponent.__table__.delete().where(DataComponent.attack_version == version)
     db.session.execute(delete_datacomp)
-    db.session.commit()
 
     # DataSource
     delete_datasrc = DataSource.__table__.delete().where(DataSource.attack_version == version)
     db.session.execute(delete_datasrc)
-    db.session.commit()
 
 
 @messaged_timer("Removing Blurbs (Technique Usage Exmaples) for version")
 def blurb_table(version):
-    tech_uids = db_read.attack.tech_uids(version)
 
     # Blurb
-    delete_blurbs = Blurb.__table__.delete().where(Blurb.technique.in_(tech_uids))
+    delete_blurbs = Blurb.__table__.delete().where(Blurb.technique.in_(version_tech_uids(version)))
     db.session.execute(delete_blurbs)
-    db.session.commit()
 
 
 @messaged_timer("Removing Tactic <-> Technique mappings for version")
 def tact_tech_map(version):
-    tact_uids = db_read.attack.tact_uids(version)
 
     # tactic_technique_map
-    delete_tact_tech_map = tactic_technique_map.delete().where(tactic_technique_map.c.tactic.in_(tact_uids))
+    delete_tact_tech_map = tactic_technique_map.delete().where(
+        tactic_technique_map.c.tactic.in_(version_tact_uids(version))
+    )
     db.session.execute(delete_tact_tech_map)
-    db.session.commit()
 
 
 @messaged_timer("Removing Technique <-> Platform mappings for version")
 def tech_plat_map(version):
-    tech_uids = db_read.attack.tech_uids(version)
 
     # technique_platform_map
-    delete_tech_plat_map = technique_platform_map.delete().where(technique_platform_map.c.technique.in_(tech_uids))
+    delete_tech_plat_map = technique_platform_map.delete().where(
+        technique_platform_map.c.technique.in_(version_tech_uids(version))
+    )
     db.session.execute(delete_tech_plat_map)
-    db.session.commit()
 
 
 @messaged_timer("Removing Tactic <-> Platform mappings for version")
 def tact_plat_map(version):
-    tact_uids = db_read.attack.tact_uids(version)
 
     # tactic_platform_map
-    delete_tact_plat_map = tactic_platform_map.delete().where(tactic_platform_map.c.tactic.in_(tact_uids))
+    delete_tact_plat_map = tactic_platform_map.delete().where(
+        tactic_platform_map.c.tactic.in_(version_tact_uids(version))
+    )
     db.session.execute(delete_tact_plat_map)
-    db.session.commit()
 
 
 @messaged_timer("Removing Techniques for version")
@@ -110,7 +123,6 @@ def technique_table(version):
     # Technique
     delete_technique = Technique.__table__.delete().where(Technique.attack_version == version)
     db.session.execute(delete_technique)
-    db.session.commit()
 
 
 @messaged_timer("Remvoing Tactics for version")
@@ -119,7 +131,6 @@ def tactic_table(version):
     # Tactic
     delete_tactic = Tactic.__table__.delete().where(Tactic.attack_version == version)
     db.session.execute(delete_tactic)
-    db.session.commit()
 
 
 @messaged_timer("Removing Platforms for version")
@@ -130,13 +141,13 @@ def platform_table(version):
     # then, platforms no longer pointed-to by a version can be deleted
     delete_plat_refs = attack_version_platform_map.delete().where(attack_version_platform_map.c.version == version)
     db.session.execute(delete_plat_refs)
-    db.session.commit()
 
     # Platform
-    referenced_plat_uids = [r[0] for r in db.session.query(attack_version_platform_map.c.platform).all()]
-    delete_unreferenced_plats = Platform.__table__.delete().where(Platform.uid.notin_(referenced_plat_uids))
+    still_referenced = select(attack_version_platform_map.c.platform).where(
+        attack_version_platform_map.c.platform == Platform.uid
+    )
+    delete_unreferenced_plats = Platform.__table__.delete().where(~still_referenced.exists())
     db.session.execute(delete_unreferenced_plats)
-    db.session.commit()
 
 
 @messaged_timer("Removing version from AttackVersion(s) table")
@@ -144,18 +155,26 @@ def attack_version_table(version):
 
     # Remove version from any users that had it as their last-visited preference
     db.session.query(User).filter(User.last_attack_ver == version).update({"last_attack_ver": None})
-    db.session.commit()
 
     # AttackVersion
     delete_version = AttackVersion.__table__.delete().where(AttackVersion.version == version)
     db.session.execute(delete_version)
-    db.session.commit()
 
 
-def drop_version(version):
+def drop_version(version, hold_carts=False):
+    # all-or-nothing: a failure in any stage rolls the whole removal back, leaving the version intact
+    try:
+        drop_version_stages(version, hold_carts)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def drop_version_stages(version, hold_carts=False):
 
     # Cart
-    db_destroy.attack.cart_table(version)
+    db_destroy.attack.cart_table(version, hold_carts)
 
     # Data Components & Sources for ATT&CK 10+
     base_version_num = int(version.replace("v", "").split(".")[0])  # [8], v[8], v[9], v[9].1, v[9].2
@@ -165,16 +184,11 @@ def drop_version(version):
     # Blurb
     db_destroy.attack.blurb_table(version)
 
-    # -- Optionals -------------------------------
-    if db_read.coocs.exists_for_version(version):
-        db_destroy.coocs.drop_version(version)
-
-    if db_read.mismaps.exists_for_version(version):
-        db_destroy.mismaps.drop_version(version)
-
-    if db_read.akas.exists_for_version(version):
-        db_destroy.akas.drop_version(version)
-    # --------------------------------------------
+    # -- Optionals (no-ops when the version lacks them) --
+    db_destroy.coocs.drop_version(version)
+    db_destroy.mismaps.drop_version(version)
+    db_destroy.akas.drop_version(version)
+    # ---------------------------------------------------
 
     # tactic_technique_map
     db_destroy.attack.tact_tech_map(version)
@@ -185,14 +199,18 @@ def drop_version(version):
     # tactic_platform_map
     db_destroy.attack.tact_plat_map(version)
 
-    # Technique
-    db_destroy.attack.technique_table(version)
-
-    # Tactic
-    db_destroy.attack.tactic_table(version)
+    # Technique & Tactic (+ DataComponent & DataSource partitions when LIST-partitioned)
+    if db_read.util.is_partitioned(Technique.__table__.name):
+        db_destroy.partition.drop_version(version)
+    else:
+        db_destroy.attack.technique_table(version)
+        db_destroy.attack.tactic_table(version)
 
     # attack_version_platform_map & Platform
     db_destroy.attack.platform_table(version)
 
     # AttackVersion row
     db_destroy.attack.attack_version_table(version)
+
+    # build checkpoints / source hash
+    db_destroy.build_state.drop_version(version)
@@ -0,0 +1,15 @@
+from app.models import db, BuildCheckpoint, VersionSource
+
+from sqlalchemy import inspect
+
+
+def drop_version(version):
+    # forgets a version's build checkpoints and source hash (tables may not exist on older DBs)
+    # commit is left to the caller - see destroy.attack.drop_version()
+    inspector = inspect(db.engine)
+    if inspector.has_table(BuildCheckpoint.__table__.name):
+        delete_checkpoints = BuildCheckpoint.__table__.delete().where(BuildCheckpoint.stage.startswith(f"{version}/"))
+        db.session.execute(delete_checkpoints)
+    if inspector.has_table(VersionSource.__table__.name):
+        delete_source = VersionSource.__table__.delete().where(VersionSource.version == version)
+        db.session.execute(delete_source)
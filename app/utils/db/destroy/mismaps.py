@@ -1,20 +1,19 @@
 from app.models import db, Mismapping
 
-from app.utils.db.util import messaged_timer
+from app.utils.db.destroy.attack import version_tech_uids
 
-import app.utils.db.read as db_read
+from app.utils.db.util import messaged_timer
 
 from sqlalchemy import or_
 
 
 @messaged_timer("Removing a version from the Mismappings table")
 def drop_version(version):
-    tech_uids = db_read.attack.tech_uids(version)
+    # commit is left to the caller - see destroy.attack.drop_version()
     delete_co_ocs = Mismapping.__table__.delete().where(
         or_(
-            Mismapping.original.in_(tech_uids),
-            Mismapping.corrected.in_(tech_uids),
+            Mismapping.original.in_(version_tech_uids(version)),
+            Mismapping.corrected.in_(version_tech_uids(version)),
         )
     )
     db.session.execute(delete_co_ocs)
-    db.session.commit()
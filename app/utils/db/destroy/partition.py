@@ -0,0 +1,17 @@
+from app.models import db
+
+from app.utils.db.create.partition import VERSIONED_TABLES, partition_name, quote_ident
+
+from app.utils.db.util import messaged_timer
+
+
+@messaged_timer("Dropping partitions for version")
+def drop_version(version):
+    # detaches and drops the version's partition of each version-scoped table
+    # rows referencing these (maps, blurbs, ..) are expected to be removed beforehand
+    # commit is left to the caller - see destroy.attack.drop_version()
+    for model in reversed(VERSIONED_TABLES):
+        table = quote_ident(model.__table__.name)
+        partition = quote_ident(partition_name(model.__table__.name, version))
+        db.session.execute(f"ALTER TABLE {table} DETACH PARTITION {partition};")
+        db.session.execute(f"DROP TABLE {partition};")
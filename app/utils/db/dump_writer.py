@@ -0,0 +1,72 @@
+from datetime import datetime, date
+import gzip
+import io
+import json
+
+try:
+    import zstandard
+except ImportError:  # optional - only needed for --compress zstd
+    zstandard = None
+
+FORMATS = ["json", "ndjson"]
+COMPRESSIONS = ["none", "gzip", "zstd"]
+
+# rows fetched per round-trip from the server-side cursor
+YIELD_PER = 1000
+
+
+def json_dump_defaults(item):
+
+    # time
+    if isinstance(item, (datetime, date)):
+        return item.isoformat()
+
+    # general
+    else:
+        return item
+
+
+def add_dump_args(parser):
+    # command-line options shared by the dump actions
+    parser.add_argument("--format", choices=FORMATS, default="json", help="json (array) or ndjson (a row per line).")
+    parser.add_argument("--compress", choices=COMPRESSIONS, default="none", help="Compression of the dump file.")
+
+
+def dump_path(base_path, fmt="json", compression="none"):
+    # base_path lacks an extension: ../dumps/cart -> ../dumps/cart.ndjson.gz
+    return (
+        base_path
+        + {"json": ".json", "ndjson": ".ndjson"}[fmt]
+        + {"none": "", "gzip": ".gz", "zstd": ".zst"}[compression]
+    )
+
+
+def open_text(path, compression="none"):
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the zstandard package (pip install zstandard)")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, "wb")), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def write_entries(path, entries, fmt="json", compression="none", default=json_dump_defaults):
+    # streams an iterable of dicts to path, never holding more than one entry in memory
+    # json output matches json.dump(list(entries), f, indent=4) - ndjson is one compact entry per line
+    count = 0
+    with open_text(path, compression) as fhandle:
+        if fmt == "ndjson":
+            for entry in entries:
+                fhandle.write(json.dumps(entry, default=default))
+                fhandle.write("\n")
+                count += 1
+
+        else:
+            for entry in entries:
+                fhandle.write(",\n    " if count else "[\n    ")
+                fhandle.write(json.dumps(entry, indent=4, default=default).replace("\n", "\n    "))
+                count += 1
+            fhandle.write("\n]" if count else "[]")
+
+    return count
@@ -0,0 +1,121 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as SQLAlchTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+import threading
+import time
+
+
+class PoolStats:
+    # process-wide counters of connection pool activity - each (forked) worker keeps its own
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_checkout(self, waited, timed_out=False):
+        with self.lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def record(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool=None):
+        # counters so far, and the pool's current state when it has one (not under PgBouncer's NullPool)
+        with self.lock:
+            stats = dict(
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                wait_seconds=round(self.wait_seconds, 6),
+                max_wait_seconds=round(self.max_wait_seconds, 6),
+                connects=self.connects,
+                invalidations=self.invalidations,
+            )
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return stats
+
+
+POOL_STATS = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    # QueuePool recording how long each checkout took - waiting on a free connection, connecting, and pre-ping
+    def connect(self):
+        t0 = time.perf_counter()
+        try:
+            connection = super().connect()
+        except SQLAlchTimeoutError:
+            POOL_STATS.record_checkout(time.perf_counter() - t0, timed_out=True)
+            raise
+        POOL_STATS.record_checkout(time.perf_counter() - t0)
+        return connection
+
+
+def session_limits(config):
+    # [(Postgres setting, ms), ..] of the per-connection limits configured (0 = none)
+    limits = [
+        ("statement_timeout", config.get("DB_STATEMENT_TIMEOUT", 0)),
+        ("idle_in_transaction_session_timeout", config.get("DB_IDLE_IN_TRANSACTION_TIMEOUT", 0)),
+    ]
+    return [(name, int(ms)) for name, ms in limits if ms]
+
+
+def engine_options(config):
+    """Builds SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings of a config (app/conf.py)
+
+    Direct to Postgres:
+    - QueuePool of DB_POOL_SIZE (+ DB_MAX_OVERFLOW) connections, waiting up to DB_POOL_TIMEOUT seconds for one
+    - connections are pinged on checkout (survives a Postgres restart) and replaced after DB_POOL_RECYCLE seconds
+    - statement_timeout / idle_in_transaction_session_timeout are set as connection startup options
+
+    Through PgBouncer (DB_PGBOUNCER, transaction pooling):
+    - PgBouncer does the pooling, so connections aren't held app-side (NullPool)
+    - startup options aren't passed on by PgBouncer, so the limits are set per transaction (see register_pool_events)
+    """
+
+    if config.get("DB_PGBOUNCER"):
+        return dict(poolclass=NullPool)
+
+    options = dict(
+        poolclass=TimedQueuePool,
+        pool_size=config.get("DB_POOL_SIZE", 5),
+        max_overflow=config.get("DB_MAX_OVERFLOW", 10),
+        pool_timeout=config.get("DB_POOL_TIMEOUT", 30),
+        pool_recycle=config.get("DB_POOL_RECYCLE", -1),
+        pool_pre_ping=config.get("DB_POOL_PRE_PING", True),
+    )
+
+    startup_options = " ".join(f"-c {name}={ms}" for name, ms in session_limits(config))
+    if startup_options:
+        options["connect_args"] = dict(options=startup_options)
+
+    return options
+
+
+def register_pool_events(engine, config):
+    # counts connects / invalidations into POOL_STATS, and applies the limits per transaction under PgBouncer
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        POOL_STATS.record("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_STATS.record("invalidations")
+
+    limits = session_limits(config)
+    if config.get("DB_PGBOUNCER") and limits:
+        limits_sql = "; ".join(f"SET LOCAL {name} = {ms}" for name, ms in limits)
+
+        @event.listens_for(engine, "begin")
+        def on_begin(conn):
+            conn.exec_driver_sql(limits_sql)
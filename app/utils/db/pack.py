@@ -0,0 +1,298 @@
+from app.models import (
+    db,
+    AttackVersion,
+    Platform,
+    attack_version_platform_map,
+    Tactic,
+    Technique,
+    Blurb,
+    tactic_technique_map,
+    technique_platform_map,
+    tactic_platform_map,
+    DataSource,
+    DataComponent,
+    technique_ds_map,
+    technique_dc_map,
+    tactic_ds_map,
+    Aka,
+    technique_aka_map,
+    CoOccurrence,
+    Mismapping,
+    VersionSource,
+)
+
+import app.utils.db.read as db_read
+import app.utils.db.create as db_create
+
+from app.utils.db.create.partition import quote_ident
+from app.utils.db.util import messaged_timer
+
+from sqlalchemy import select
+from sqlalchemy.sql import text as sql_text
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import zipfile
+
+# A pack is a zip of one fully built version: a manifest + one PostgreSQL binary COPY stream per table
+# - rows are stored as built (rendered HTML, tsvectors of search columns), so loading needs no parsing / transforms
+# - each stream's sha256 is kept in the manifest and verified while loading
+PACK_FORMAT = "decider-pack"
+PACK_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# tables whose uids are only used by a single version - shifted into a free uid range on load
+SHIFTED_TABLES = [Tactic, Technique, DataSource, DataComponent, Blurb, Mismapping]
+
+# tables shared across versions - matched to existing rows by their natural key on load
+SHARED_TABLES = {Platform: Platform.readable_name, Aka: Aka.term}
+
+
+def version_tables(version):
+    # (table, rows-of-version query) in load order (FK dependencies first)
+    tech_uids = select(Technique.uid).where(Technique.attack_version == version)
+    tact_uids = select(Tactic.uid).where(Tactic.attack_version == version)
+    return [
+        (AttackVersion.__table__, select(AttackVersion).where(AttackVersion.version == version)),
+        (
+            Platform.__table__,
+            select(Platform).where(
+                Platform.uid.in_(
+                    select(attack_version_platform_map.c.platform).where(
+                        attack_version_platform_map.c.version == version
+                    )
+                )
+            ),
+        ),
+        (
+            attack_version_platform_map,
+            select(attack_version_platform_map).where(attack_version_platform_map.c.version == version),
+        ),
+        (Tactic.__table__, select(Tactic).where(Tactic.attack_version == version)),
+        (Technique.__table__, select(Technique).where(Technique.attack_version == version)),
+        (Blurb.__table__, select(Blurb).where(Blurb.technique.in_(tech_uids))),
+        (tactic_technique_map, select(tactic_technique_map).where(tactic_technique_map.c.tactic.in_(tact_uids))),
+        (
+            technique_platform_map,
+            select(technique_platform_map).where(technique_platform_map.c.technique.in_(tech_uids)),
+        ),
+        (tactic_platform_map, select(tactic_platform_map).where(tactic_platform_map.c.tactic.in_(tact_uids))),
+        (DataSource.__table__, select(DataSource).where(DataSource.attack_version == version)),
+        (DataComponent.__table__, select(DataComponent).where(DataComponent.attack_version == version)),
+        (technique_ds_map, select(technique_ds_map).where(technique_ds_map.c.technique.in_(tech_uids))),
+        (technique_dc_map, select(technique_dc_map).where(technique_dc_map.c.technique.in_(tech_uids))),
+        (tactic_ds_map, select(tactic_ds_map).where(tactic_ds_map.c.tactic.in_(tact_uids))),
+        (
+            Aka.__table__,
+            select(Aka).where(
+                Aka.uid.in_(select(technique_aka_map.c.aka).where(technique_aka_map.c.technique.in_(tech_uids)))
+            ),
+        ),
+        (technique_aka_map, select(technique_aka_map).where(technique_aka_map.c.technique.in_(tech_uids))),
+        (CoOccurrence.__table__, select(CoOccurrence).where(CoOccurrence.technique_i.in_(tech_uids))),
+        (Mismapping.__table__, select(Mismapping).where(Mismapping.original.in_(tech_uids))),
+    ]
+
+
+class HashingStream:
+    # passes reads / writes through to a stream, hashing the bytes that go by
+    def __init__(self, stream):
+        self.stream = stream
+        self.hasher = hashlib.sha256()
+
+    def write(self, data):
+        self.hasher.update(data)
+        return self.stream.write(data)
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.hasher.update(data)
+        return data
+
+
+def raw_cursor():
+    # DBAPI cursor within the session's transaction (for COPY)
+    return db.session.connection().connection.cursor()
+
+
+def compile_literal(query):
+    return str(query.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+@messaged_timer("Exporting version to pack")
+def export_version(version, pack_path):
+    source_hash = db_read.build_state.source_hashes().get(version)
+
+    manifest = {
+        # fmt: off
+        "format"        : PACK_FORMAT,
+        "format_version": PACK_FORMAT_VERSION,
+        "attack_version": version,
+        "source_hash"   : source_hash,
+        "exported_at"   : datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables"        : [],
+        # fmt: on
+    }
+
+    cursor = raw_cursor()
+    with zipfile.ZipFile(pack_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as pack:
+        for table, query in version_tables(version):
+            columns = [col.name for col in table.columns]
+            with pack.open(f"{table.name}.copy", "w", force_zip64=True) as member:
+                stream = HashingStream(member)
+                cursor.copy_expert(f"COPY ({compile_literal(query)}) TO STDOUT WITH (FORMAT binary)", stream)
+            manifest["tables"].append(
+                {
+                    # fmt: off
+                    "name"   : table.name,
+                    "columns": columns,
+                    "rows"   : cursor.rowcount,
+                    "sha256" : stream.hasher.hexdigest(),
+                    # fmt: on
+                }
+            )
+        pack.writestr(MANIFEST_NAME, json.dumps(manifest, indent=4))
+
+    return manifest
+
+
+def read_manifest(pack_path):
+    with zipfile.ZipFile(pack_path, "r") as pack:
+        manifest = json.loads(pack.read(MANIFEST_NAME))
+    if (manifest.get("format") != PACK_FORMAT) or (manifest.get("format_version") != PACK_FORMAT_VERSION):
+        raise Exception(f"{pack_path} is not a version {PACK_FORMAT_VERSION} {PACK_FORMAT} file")
+    tables = manifest.get("tables")
+    if (
+        (not isinstance(manifest.get("attack_version"), str))
+        or (not isinstance(tables, list))
+        or (not all(isinstance(entry, dict) for entry in tables))
+    ):
+        raise Exception(f"{pack_path} has a malformed manifest")
+    return manifest
+
+
+def manifest_columns(entry, table, pack_path):
+    # the manifest isn't covered by the checksums - its column names are checked against the table before use in SQL
+    columns = entry.get("columns")
+    if (
+        (not isinstance(columns, list))
+        or (len(columns) == 0)
+        or (not all(isinstance(c, str) for c in columns))
+        or (len(set(columns)) != len(columns))
+    ):
+        raise Exception(f"Table {table.name} in {pack_path} has an invalid column list")
+    unknown = [c for c in columns if c not in table.c]
+    if unknown:
+        raise Exception(f"Table {table.name} in {pack_path} has columns not in the database: {unknown}")
+    return columns
+
+
+def writable_columns(table_name):
+    # columns of the target table that accept values (generated search columns are computed by the DB instead)
+    return (
+        db.session.execute(
+            sql_text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = :table_name AND is_generated = 'NEVER'"
+            ).bindparams(table_name=table_name)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def uid_offset(model, staged):
+    # shift that moves the staged uids just past those already in the target table
+    staged_min = db.session.execute(f"SELECT min(uid) FROM {staged};").scalar()
+    if staged_min is None:
+        return 0
+    return db_read.util.max_primary_key(model.uid) + 1 - staged_min
+
+
+@messaged_timer("Importing version from pack")
+def import_version(pack_path):
+    # loads a pack in the caller's transaction - the caller commits (or rolls back)
+    manifest = read_manifest(pack_path)
+    version = manifest["attack_version"]
+
+    tables = {table.name: table for table, _ in version_tables(version)}
+    shifted = {model.__table__.name: model for model in SHIFTED_TABLES}
+    shared = {model.__table__.name: key for model, key in SHARED_TABLES.items()}
+    offsets = {}
+
+    cursor = raw_cursor()
+    with zipfile.ZipFile(pack_path, "r") as pack:
+        for entry in manifest["tables"]:
+            if entry.get("name") not in tables:
+                raise Exception(f"{pack_path} has a table that isn't part of a version: {entry.get('name')!r}")
+            table = tables[entry["name"]]
+            columns = manifest_columns(entry, table, pack_path)
+            staged = f"pack_{table.name}"
+
+            # stage the stream as-is (LIKE without INCLUDING GENERATED keeps search columns as plain columns)
+            db.session.execute(f"CREATE TEMP TABLE {staged} (LIKE {table.name}) ON COMMIT DROP;")
+            with pack.open(f"{table.name}.copy", "r") as member:
+                stream = HashingStream(member)
+                cursor.copy_expert(
+                    f"COPY {staged} ({', '.join(quote_ident(c) for c in columns)}) FROM STDIN WITH (FORMAT binary)",
+                    stream,
+                )
+            if stream.hasher.hexdigest() != entry["sha256"]:
+                raise Exception(f"Checksum mismatch for table {table.name} in {pack_path}")
+
+            # shared rows: add those whose natural key isn't present yet, under fresh uids
+            if table.name in shared:
+                key = shared[table.name].name
+                insert_columns = [quote_ident(c) for c in columns if c != "uid"]
+                db.session.execute(
+                    f"INSERT INTO {table.name} (uid, {', '.join(insert_columns)}) "
+                    f"SELECT (SELECT coalesce(max(uid), 0) FROM {table.name}) + row_number() OVER (ORDER BY s.uid), "
+                    f"{', '.join(f's.{c}' for c in insert_columns)} FROM {staged} s "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {table.name} t WHERE t.{key} = s.{key});"
+                )
+                continue
+
+            if table.name in shifted:
+                offsets[table.name] = uid_offset(shifted[table.name], staged)
+
+            # remap uid references: shifted tables by offset, shared tables through their natural key
+            writable = set(writable_columns(table.name))
+            target_columns = [c for c in columns if c in writable]
+            select_exprs = []
+            for name in target_columns:
+                column = table.c[name]
+                ref_table = table.name if (name == "uid" and table.name in shifted) else None
+                for fk in column.foreign_keys:
+                    ref_table = fk.column.table.name
+                name = quote_ident(name)
+                if ref_table in shifted:
+                    select_exprs.append(f"s.{name} + {offsets[ref_table]}")
+                elif ref_table in shared:
+                    key = shared[ref_table].name
+                    select_exprs.append(
+                        f"(SELECT t.uid FROM {ref_table} t JOIN pack_{ref_table} p ON p.{key} = t.{key}"
+                        f" WHERE p.uid = s.{name})"
+                    )
+                else:
+                    select_exprs.append(f"s.{name}")
+
+            db.session.execute(
+                f"INSERT INTO {table.name} ({', '.join(quote_ident(c) for c in target_columns)}) "
+                f"SELECT {', '.join(select_exprs)} FROM {staged} s;"
+            )
+
+            # version partitions [only when version-scoped tables are LIST-partitioned]
+            if (table.name == AttackVersion.__table__.name) and db_read.util.is_partitioned(Technique.__table__.name):
+                for model in db_create.partition.VERSIONED_TABLES:
+                    db_create.partition.add_partition(model.__table__.name, version)
+
+    # search facilities for search columns loaded as plain (non-generated) columns on a fresh DB
+    db_create.attack.postbuild.add_loaded_search_facilities()
+
+    # lets FULL_BUILD_MODE=reconcile see the version as up to date with the sources it was exported from
+    if manifest.get("source_hash"):
+        VersionSource.__table__.create(db.session.connection(), checkfirst=True)
+        db.session.merge(VersionSource(version=version, source_hash=manifest["source_hash"]))
+
+    return manifest
@@ -0,0 +1,90 @@
+from sqlalchemy import event
+
+from collections import Counter
+from contextlib import contextmanager
+import threading
+import time
+
+# counters currently collecting statements of this thread (a request's, and any query_budget() around it)
+_active = threading.local()
+
+
+class QueryCount:
+    # statements run (and their total time) while active - also tracks repeats of the same SQL to spot N+1s
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def add(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, limit):
+        # [(statement, times run), ..] of statements run at least limit times, most repeated first
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= limit]
+
+
+def active_counts():
+    if not hasattr(_active, "counts"):
+        _active.counts = []
+    return _active.counts
+
+
+def start_count():
+    count = QueryCount()
+    active_counts().append(count)
+    return count
+
+
+def stop_count(count):
+    counts = active_counts()
+    if count in counts:
+        counts.remove(count)
+    return count
+
+
+def register_query_events(engine):
+    # times each statement of the engine into this thread's active counters - a no-op when none are active
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if active_counts():
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        for count in active_counts():
+            count.add(statement, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # a failed statement never reaches after_cursor_execute - drop its start
+        conn = exception_context.connection
+        starts = conn.info.get("query_start") if conn is not None else None
+        if starts:
+            starts.pop()
+
+
+@contextmanager
+def query_budget(max_queries):
+    """Test helper - fails (AssertionError) if the block runs more than max_queries SQL statements
+
+    with app.app_context(), query_budget(4):
+        app.test_client().get("/question/v14.1")
+    """
+
+    count = start_count()
+    try:
+        yield count
+    finally:
+        stop_count(count)
+
+    if count.count > max_queries:
+        statements = "\n".join(f" - ({n}x) {statement}" for statement, n in count.statements.most_common())
+        raise AssertionError(f"Ran {count.count} SQL statements, over the budget of {max_queries}:\n{statements}")
@@ -1 +1 @@
-from . import akas, attack, coocs, mismaps, user, util
+from . import akas, attack, build_state, coocs, mismaps, user, util
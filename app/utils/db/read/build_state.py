@@ -0,0 +1,25 @@
+from app.models import db, BuildCheckpoint, VersionSource
+
+from sqlalchemy import inspect
+
+
+def completed_stages():
+    # stages of the last full_build that completed, None if there is no build-state table to resume from
+    if not inspect(db.engine).has_table(BuildCheckpoint.__table__.name):
+        return None
+    return {row[0] for row in db.session.query(BuildCheckpoint.stage).all()}
+
+
+def completed_versions(stages):
+    # versions that were fully installed (all of their content) by the last full_build
+    return {stage.split("/")[0] for stage in stages if stage.endswith("/done")}
+
+
+def source_hashes():
+    # version -> hash of the sources it was installed from, empty for DBs built before hashes were recorded
+    if not inspect(db.engine).has_table(VersionSource.__table__.name):
+        return {}
+    return {
+        version: source_hash
+        for version, source_hash in db.session.query(VersionSource.version, VersionSource.source_hash)
+    }
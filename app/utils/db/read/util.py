@@ -1,6 +1,7 @@
 from app.models import db
 
 from sqlalchemy import func
+from sqlalchemy.sql import text as sql_text
 
 
 def max_primary_key(column):
@@ -11,3 +12,21 @@ def max_primary_key(column):
         return 0
     else:
         return highest
+
+
+def is_partitioned(table_name):
+    # returns if the provided table is a partitioned table (parent) on the DB
+    # used to pick between row-wise and partition-wise handling of version-scoped tables
+    query = sql_text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table_name))"
+    ).bindparams(table_name=table_name)
+    return bool(db.session.execute(query).scalar())
+
+
+def is_generated_column(table_name, column_name):
+    # returns if the provided column exists as a generated column on the DB
+    query = sql_text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table_name AND column_name = :column_name AND is_generated = 'ALWAYS')"
+    ).bindparams(table_name=table_name, column_name=column_name)
+    return bool(db.session.execute(query).scalar())
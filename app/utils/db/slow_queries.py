@@ -0,0 +1,127 @@
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import logging.handlers
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN ANALYZE runs the statement again - so only ever plain reads are explained
+EXPLAINABLE_PREFIXES = ("select", "with")
+
+# rotation of the slow query log - 5 old logs of up to 10MB are kept
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+
+class SlowQueryLog:
+    """Writes SQL statements slower than a threshold to a rotating log, with their parameters and request
+
+    - a sampled fraction of them (explain_sample) gets an EXPLAIN (ANALYZE, BUFFERS) plan too
+    - plans are made in a background thread, on a connection of their own (never one of the app's pool),
+      and skipped while max_pending are already waiting - so a burst of slow queries can't pile up work
+    """
+
+    def __init__(self, path, threshold, explain_sample=0.0, explain_timeout=30000, max_pending=4):
+        self.threshold = threshold
+        self.explain_sample = explain_sample
+        self.explain_timeout = explain_timeout
+        self.max_pending = max_pending
+
+        self.log = logging.getLogger("decider.slow_queries")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        if not self.log.handlers:
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.executor = None
+        self.executor_pid = None
+        self.explain_engine = None
+
+    def register(self, engine):
+        # times the engine's statements - kept apart from query_counter's timing, as either can be off
+        self.explain_engine = create_engine(engine.url, poolclass=NullPool)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("slow_query_start")
+            if not starts:
+                return
+            seconds = time.perf_counter() - starts.pop()
+            if seconds >= self.threshold:
+                self.record(statement, parameters, seconds, executemany)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            starts = conn.info.get("slow_query_start") if conn is not None else None
+            if starts:
+                starts.pop()
+
+    def record(self, statement, parameters, seconds, executemany=False):
+        request_id = g.get("request_id", "") if has_app_context() else ""
+        route = f"{request.method} {request.path}" if has_request_context() else "(no request)"
+        entry = (
+            f"slow query {seconds * 1000:.1f}ms - {request_id or '(no request id)'} {route}\n"
+            f"SQL: {statement}\n"
+            f"Parameters: {parameters!r}"
+        )
+
+        explainable = (not executemany) and statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES)
+        if explainable and (random.random() < self.explain_sample) and self.reserve():
+            self.submit(self.explain_and_log, entry, statement, parameters)
+        else:
+            self.log.info(entry)
+
+    def reserve(self):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                return False
+            self.pending += 1
+            return True
+
+    def submit(self, fn, *args):
+        # the executor's thread doesn't survive a fork - each (worker) process starts its own
+        with self.lock:
+            if self.executor_pid != os.getpid():
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+                self.executor_pid = os.getpid()
+            self.executor.submit(fn, *args)
+
+    def explain_and_log(self, entry, statement, parameters):
+        try:
+            self.log.info(f"{entry}\nPlan:\n{self.explain(statement, parameters)}")
+        except Exception:
+            logger.exception("Failed to EXPLAIN a slow query")
+            self.log.info(f"{entry}\nPlan: (EXPLAIN failed)")
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    def explain(self, statement, parameters):
+        # read-only and rolled back regardless - nothing of the re-run statement is kept
+        connection = self.explain_engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout)}")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            connection.rollback()
+            return plan
+        finally:
+            connection.close()
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+import hashlib
 import json
 import os
 import re
@@ -59,6 +60,12 @@ class SourceFile(ABC):
         if self.loaded:
             return self.data
 
+    def update_hash(self, hasher):
+        # feeds the raw file bytes into hasher (no parsing needed)
+        with open(self.path, "rb") as fhandle:
+            for chunk in iter(lambda: fhandle.read(1 << 20), b""):
+                hasher.update(chunk)
+
 
 class AttackFile(SourceFile):
     def validate(self):
@@ -296,3 +303,19 @@ class SourceManager:
         self.co_ocs = self.multiversion_as_dict(CoOccurrencesFile, os.path.join(sources_dir, "./co_occurrences/"))
         self.mismaps = self.multiversion_as_dict(MismappingsFile, os.path.join(sources_dir, "./mismappings/"))
         self.akas = self.multiversion_as_dict(AkasFile, os.path.join(sources_dir, "./akas/"))
+
+    def version_hash(self, version):
+        # hash over all of the source files for a version - changes if any file is changed, added, or removed
+        hasher = hashlib.sha256()
+        for kind, files in [
+            ("attack", self.attack),
+            ("tree", self.tree),
+            ("co_ocs", self.co_ocs),
+            ("mismaps", self.mismaps),
+            ("akas", self.akas),
+        ]:
+            source_file = files.get(version)
+            if (source_file is not None) and source_file.exists:
+                hasher.update(f"{kind}:".encode())
+                source_file.update_hash(hasher)
+        return hasher.hexdigest()
@@ -1,16 +1,139 @@
 from app.conf import conf_configs
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from datetime import datetime, timezone
+import atexit
+import functools
+import inspect
+import json
+import sys
 import time
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    # peak resident set size of this process so far - KB on Linux, bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class BuildReport:
+    # Collects per-stage measurements of messaged_timer stages into a JSON-able report
+    # - inactive (recording nothing) until start() is called by a build action
+
+    WRITE_VERBS = {"INSERT", "UPDATE", "DELETE"}
+
+    def __init__(self):
+        self.active = False
+        self.listening = False
+        self.statements = 0
+        self.rows_written = 0
+        self.failed_stage = None
+        self.report = None
+
+    def count_statement(self, conn, cursor, statement, parameters, context, executemany):
+        # rows of an executemany are counted by their parameter sets - psycopg2 runs them as pages of
+        # execute_values(), after which rowcount only holds the last page's rows
+        # (so a bulk UPDATE / DELETE counts the rows it targets, matched or not)
+        self.statements += 1
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verb not in self.WRITE_VERBS:
+            return
+        if executemany and isinstance(parameters, (list, tuple)):
+            self.rows_written += len(parameters)
+        elif cursor.rowcount > 0:
+            self.rows_written += cursor.rowcount
+
+    def start(self, action, **details):
+        if not self.listening:
+            event.listen(Engine, "after_cursor_execute", self.count_statement)
+            self.listening = True
+        self.active = True
+        self.statements = 0
+        self.rows_written = 0
+        self.failed_stage = None
+        self.t0, self.cpu0 = time.perf_counter(), time.process_time()
+        self.report = {
+            # fmt: off
+            "action"    : action,
+            "details"   : details,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "stages"    : [],
+            # fmt: on
+        }
+
+    def record(self, stage, version, fn, args, kwargs):
+        statements0, rows0, rss0 = self.statements, self.rows_written, peak_rss_mb()
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            # innermost stage raising is the one that failed - outer stages re-raise the same error
+            if self.failed_stage is None:
+                self.failed_stage = {"stage": stage, "version": version}
+            raise
+        finally:
+            rss1 = peak_rss_mb()
+            self.report["stages"].append(
+                {
+                    # fmt: off
+                    "stage"            : stage,
+                    "version"          : version,
+                    "wall_s"           : round(time.perf_counter() - t0, 3),
+                    "cpu_s"            : round(time.process_time() - cpu0, 3),
+                    "peak_rss_delta_mb": None if rss0 is None else round(rss1 - rss0, 1),
+                    "rows_written"     : self.rows_written - rows0,
+                    "statements"       : self.statements - statements0,
+                    # fmt: on
+                }
+            )
+
+    def finish(self, succeeded=True):
+        self.active = False
+        self.report.update(
+            {
+                # fmt: off
+                "succeeded"   : succeeded,
+                "failed_stage": None if succeeded else self.failed_stage,
+                "wall_s"      : round(time.perf_counter() - self.t0, 3),
+                "cpu_s"       : round(time.process_time() - self.cpu0, 3),
+                "peak_rss_mb" : None if resource is None else round(peak_rss_mb(), 1),
+                "rows_written": self.rows_written,
+                "statements"  : self.statements,
+                # fmt: on
+            }
+        )
+        return self.report
+
+
+build_report = BuildReport()
+
 
 def messaged_timer(msg):
     # Decorator factory that makes this nice print-out for running long actions
     # ___________Building Technique Table
     # \_  15.0s_/
+    # stages are also measured into build_report when a build action has started it
     def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
         def wrapper(*args, **kwargs):
             print(f"___________{msg}")
             t0 = time.time()
-            result = fn(*args, **kwargs)
+            if build_report.active:
+                version = signature.bind_partial(*args, **kwargs).arguments.get("version")
+                result = build_report.record(msg, version, fn, args, kwargs)
+            else:
+                result = fn(*args, **kwargs)
             elapsed = time.time() - t0
             print(f"\\_{elapsed:>6.1f}s_/")  # allows up to thousands to display, long enough
             return result
@@ -20,6 +143,52 @@ def messaged_timer(msg):
     return decorator
 
 
+def write_build_report(report_path, compare_path=None, succeeded=True):
+    # ends the build report, writes it to report_path, and optionally prints a comparison to a previous report
+    report = build_report.finish(succeeded)
+    if report_path is not None:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Build report written to: {report_path}")
+    if compare_path is not None:
+        with open(compare_path, "r") as f:
+            print_report_comparison(json.load(f), report)
+
+
+def write_build_report_at_exit(report_path, compare_path=None):
+    # failed builds sys.exit() partway - their report is still written on the way out, marked as failed
+    # (a build that completes writes its report itself, ending it, so nothing is written here)
+    def write_unfinished():
+        if build_report.active:
+            print("\n------------------------------------------------\n")
+            write_build_report(report_path, compare_path, succeeded=False)
+
+    atexit.register(write_unfinished)
+
+
+def print_report_comparison(previous, current):
+    # lines up stages by (stage, version) and prints wall time / row changes from previous -> current
+    def stage_key(stage):
+        return f"{stage['stage']} ({stage['version']})" if stage["version"] else stage["stage"]
+
+    prev_stages = {stage_key(stage): stage for stage in previous["stages"]}
+
+    print("\nComparison to previous report:")
+    print(f"{'Stage':<72} {'Prev s':>8} {'Now s':>8} {'Change':>8} {'Rows +/-':>10}")
+    for stage in current["stages"]:
+        key = stage_key(stage)
+        prev = prev_stages.pop(key, None)
+        if prev is None:
+            print(f"{key[:72]:<72} {'-':>8} {stage['wall_s']:>8.2f} {'new':>8} {'':>10}")
+            continue
+        change = f"{(stage['wall_s'] - prev['wall_s']) / prev['wall_s']:+.0%}" if prev["wall_s"] else "-"
+        rows = stage["rows_written"] - prev["rows_written"]
+        print(f"{key[:72]:<72} {prev['wall_s']:>8.2f} {stage['wall_s']:>8.2f} {change:>8} {rows:>+10}")
+    for key, prev in prev_stages.items():
+        print(f"{key[:72]:<72} {prev['wall_s']:>8.2f} {'-':>8} {'gone':>8} {'':>10}")
+    print(f"{'Total':<72} {previous['wall_s']:>8.2f} {current['wall_s']:>8.2f}")
+
+
 def get_config_option_map():
     # gives config options from conf.py indexed by their names
     return {opt.__name__: opt for opt in conf_configs}
@@ -4,11 +4,13 @@ from flask import Flask
 from app.models import db
 
 from app.utils.db.util import get_config_option_map, option_selector
+from app.utils.db import dump_writer
 
-from datetime import datetime, date
+from sqlalchemy import select
+
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 import os
-import json
 
 import sys
 
@@ -63,54 +65,46 @@ tables = [
 ]
 
 
-def table_to_dict(table, db):  # Union[Model, Table] -> str (table name), list-of-dicts (table data)
+def table_rows(table, engine):  # Union[Model, Table] -> generator of dicts (table data)
+    # streams rows through a server-side cursor, holding a batch of rows in memory at a time
+    table = getattr(table, "__table__", table)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(select(table))
+        for row in result.yield_per(dump_writer.YIELD_PER):
+            yield dict(row._mapping)
+
 
+def dump_table(table, dir, engine, fmt="json", compression="none"):
     # this part cannot fail
     if hasattr(table, "__table__"):
         name = table.__table__.name  # Model
     else:
         name = table.name  # Table
 
-    # try getting data, query can fail if a table isn't initialized db-side
-    try:
-
-        if hasattr(table, "__table__"):  # Model
-            cols = table.__table__.columns.keys()
-            rows = table.query.all()
-            data = [{col: getattr(row, col) for col in cols} for row in rows]
-
-        else:  # Table
-            cols = table.columns.keys()
-            rows = db.session.query(table).all()
-            data = [{cols[i]: cell for i, cell in enumerate(row)} for row in rows]
+    json_path = dump_writer.dump_path(os.path.join(dir, name), fmt, compression)
 
+    # query can fail if a table isn't initialized db-side
+    try:
+        count = dump_writer.write_entries(json_path, table_rows(table, engine), fmt, compression)
     except Exception:
         print(f"Failed to get data for database table {name}. Please ensure it is initialized.")
-        data = None
-
-    return name, data
-
-
-def json_dump_filter(item):
-    if isinstance(item, (datetime, date)):
-        return item.isoformat()
-    return item
-
+        print(f"Skipping creation of JSON file for {name}\n")
+        if os.path.isfile(json_path):
+            os.remove(json_path)
+        return
 
-def dump_tables(dir, db):
-    for table in tables:
-        name, data = table_to_dict(table, db)
+    print(f'Dumped table "{name}" ({count} rows) to {json_path}')
 
-        # failed to get data -> skip this table
-        if data is None:
-            print(f"Skipping creation of JSON file for {name}\n")
-            continue
 
-        json_path = os.path.join(dir, f"{name}.json")
+def dump_tables(dir, db, fmt="json", compression="none", jobs=1):
+    # each table streams over its own connection, so tables can be dumped in parallel
+    engine = db.engine
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(dump_table, table, dir, engine, fmt, compression) for table in tables]
 
-        print(f'Dumping table "{name}" to {json_path}')
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=4, default=json_dump_filter)
+        # re-raises anything a dump failed on that dump_table() didn't handle itself
+        for future in futures:
+            future.result()
 
 
 def main():
@@ -118,6 +112,8 @@ def main():
     # optional avenue of command-line instead of text-ui
     parser = argparse.ArgumentParser("Dumps Reports from the DB to a JSON file.")
     parser.add_argument("--config", help="The database configuration to use (from app/conf.py).")
+    dump_writer.add_dump_args(parser)
+    parser.add_argument("--jobs", type=int, default=1, help="Number of tables to dump in parallel.")
     args = parser.parse_args()
 
     # perform config selection, can fail on bad cmdline pick
@@ -142,7 +138,7 @@ def main():
         prog_dir = os.path.dirname(os.path.realpath(__file__))
         json_dir = os.path.join(prog_dir, "jsons/tables/")
 
-        dump_tables(json_dir, db)
+        dump_tables(json_dir, db, args.format, args.compress, args.jobs)
 
 
 if __name__ == "__main__":
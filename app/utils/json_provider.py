@@ -0,0 +1,62 @@
+try:
+    import orjson
+except ImportError:  # optional - the stdlib json module is used without it
+    orjson = None
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+# datetimes / dataclasses are passed through to Flask's default() to keep its formats
+ORJSON_OPTIONS = (
+    (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    if orjson is not None
+    else None
+)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when installed, and otherwise as Flask's default does
+
+    - output matches the default provider's compact form: sorted keys, and the same handling of
+      dates (HTTP date strings), UUIDs, dataclasses, Decimals and Markup
+    - non-ASCII is written as UTF-8 rather than \\u escapes (identical once parsed)
+    - anything orjson rejects (e.g. ints beyond 64-bit) falls back to the stdlib encoder
+    """
+
+    def dumps_bytes(self, obj):
+        """Serializes to compact UTF-8 JSON bytes - to be cached and sent via json_bytes_response()"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass
+        return super().dumps(obj, separators=(",", ":")).encode()
+
+    def dumps(self, obj, **kwargs):
+        # only the default (compact) form has a fast path, anything customized is left to json.dumps
+        if (orjson is None) or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if (orjson is None) or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # debug / non-compact output stays with the default (indented) response
+        if (orjson is None) or (self.compact is False) or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def json_bytes_response(body, status=200):
+    """Response for an already serialized JSON body (bytes), skipping serialization entirely"""
+    return current_app.response_class(body, status=status, mimetype=current_app.json.mimetype)
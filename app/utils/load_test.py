@@ -0,0 +1,452 @@
+# standalone script to load-test a running Decider by replaying weighted user journeys against it
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+# journeys of a simulated user, and how often each is picked relative to the others
+JOURNEY_WEIGHTS = {
+    "question_tree": 5,
+    "mini_search": 3,
+    "full_search": 2,
+    "answer_card_search": 1,
+    "cart": 1,
+}
+
+# percentiles reported per route
+PERCENTILES = (50, 90, 95, 99)
+
+CSRF_TOKEN_P = re.compile(r"const csrfToken = \"([^\"]+)\";")
+
+
+class Client:
+    # one simulated user - a keep-alive connection, session cookie, and CSRF token (for POSTs) of its own
+    # (logged in, when given credentials - needed unless the instance is in kiosk mode)
+    def __init__(self, base_url, insecure=False):
+        url = urlsplit(base_url)
+        self.https = url.scheme == "https"
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.context = ssl._create_unverified_context() if (self.https and insecure) else None
+        self.conn = None
+        self.cookies = {}
+        self.csrf_token = ""
+        self.location = None  # Location of the last response (redirects aren't followed)
+
+    def connect(self):
+        if self.https:
+            self.conn = http.client.HTTPSConnection(self.netloc, timeout=60, context=self.context)
+        else:
+            self.conn = http.client.HTTPConnection(self.netloc, timeout=60)
+
+    def request(self, method, path, params=None, json_body=None, form=None):
+        # (status, body) - the body is decompressed, as browsers would ask for it compressed
+        if params:
+            path = f"{path}?{urlencode(params, doseq=True)}"
+        headers = {"Accept-Encoding": "gzip"}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers.update({"Content-Type": "application/json", "X-CSRFToken": self.csrf_token})
+        elif form is not None:
+            body = urlencode({**form, "csrf_token": self.csrf_token}).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+
+        for attempt in range(2):
+            if self.conn is None:
+                self.connect()
+            try:
+                self.conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # server closed the kept-alive connection - reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+        for cookie in response.headers.get_all("Set-Cookie") or []:
+            name, _, value = cookie.split(";")[0].partition("=")
+            self.cookies[name.strip()] = value.strip()
+        self.location = response.headers.get("Location")
+        if response.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return response.status, data
+
+    def read_csrf_token(self, body):
+        # pages (of base.html) carry the session's CSRF token - a redirect (e.g. GET /) has none
+        match = CSRF_TOKEN_P.search(body.decode(errors="replace"))
+        if match:
+            self.csrf_token = match.group(1)
+        return match is not None
+
+    def login(self, email, password):
+        # login page (for a CSRF token) -> login form POST, which redirects back to the login page on failure
+        status, body = self.request("GET", "/login")
+        if (status != 200) or (not self.read_csrf_token(body)):
+            raise Exception(f"/login responded with HTTP {status} - is the instance in kiosk mode (no logins)?")
+        status, _ = self.request("POST", "/login", form={"email": email, "password": password})
+        if (status != 302) or urlsplit(self.location or "").path.endswith("/login"):
+            raise Exception(f"Failed to log in as {email}")
+
+
+class Results:
+    # latencies (seconds) and error counts per route, shared by all users
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, seconds, ok):
+        with self.lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Scenario data - real IDs / names of the instance's installed versions
+
+
+def load_scenario_data(client, versions=None):
+    # {version: {"tactics": [tact_id, ..], "techniques": [(tact_id, tech_id, tech_name), ..]}} - from the API
+    status, body = client.request("GET", "/api/versions")
+    if (status == 302) and urlsplit(client.location or "").path.endswith("/login"):
+        raise Exception("/api/versions redirected to the login page - pass --email / --password (not in kiosk mode)")
+    if status != 200:
+        raise Exception(f"/api/versions responded with HTTP {status}")
+    installed = json.loads(body)
+    versions = [v for v in installed if (versions is None) or (v in versions)]
+    if not versions:
+        raise Exception(f"None of the requested versions are installed (installed: {', '.join(installed)})")
+
+    data = {}
+    for version in versions:
+        status, body = client.request(
+            "GET", "/api/tactics", params={"version": version, "fields[]": ["tactic_id", "techniques"]}
+        )
+        if status != 200:
+            raise Exception(f"/api/tactics for {version} responded with HTTP {status}")
+        tactics = json.loads(body)
+        data[version] = dict(
+            tactics=[tactic["tactic_id"] for tactic in tactics],
+            techniques=[
+                (tactic["tactic_id"], tech["technique_id"], tech["technique_name"])
+                for tactic in tactics
+                for tech in tactic["techniques"]
+            ],
+        )
+    return data
+
+
+def search_words(techniques):
+    # lower-cased words (4+ letters) of Technique names, for building search queries
+    words = set()
+    for _, _, name in techniques:
+        words.update(w.lower() for w in re.findall(r"[A-Za-z]{4,}", name))
+    return sorted(words)
+
+
+def boolean_query(rng, words):
+    # a search in the syntax of the full search box: AND (adjacent) / | / ~ / ( ) / "phrases" / prefix*
+    a, b, c = rng.sample(words, 3) if len(words) >= 3 else (words * 3)[:3]
+    return rng.choice(
+        [
+            a,
+            f"{a} {b}",
+            f"{a} | {b}",
+            f'"{a} {b}"',
+            f"{a[:4]}*",
+            f"({a} | {b}) ~{c}",
+            f"{a} ({b} | {c[:4]}*)",
+        ]
+    )
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Journeys - each step is timed under a route name (URL rule, not the concrete URL)
+
+
+def timed(client, results, route, method, path, params=None, json_body=None, expect=(200,)):
+    t0 = time.perf_counter()
+    try:
+        status, body = client.request(method, path, params=params, json_body=json_body)
+        ok = status in expect
+    except (http.client.HTTPException, OSError):
+        status, body, ok = None, b"", False
+    results.record(route, time.perf_counter() - t0, ok)
+    return status, body
+
+
+def journey_question_tree(client, results, rng, version, data):
+    # start -> Tactic -> Technique -> (Sub-Technique) success page, with the answer cards each page fetches
+    tact_id, tech_id, _ = rng.choice([t for t in data["techniques"] if "." not in t[1]])
+    subs = [t[1] for t in data["techniques"] if (t[0] == tact_id) and t[1].startswith(f"{tech_id}.")]
+
+    timed(client, results, "GET /question/<version>", "GET", f"/question/{version}")
+    timed(client, results, "GET /api/answers/ (start)", "GET", "/api/answers/", {"index": "start", "version": version})
+    timed(client, results, "GET /question/<version>/<tactic>", "GET", f"/question/{version}/{tact_id}")
+    timed(
+        client,
+        results,
+        "GET /api/answers/ (tactic)",
+        "GET",
+        "/api/answers/",
+        {"index": tact_id, "version": version},
+    )
+    timed(
+        client, results, "GET /question/<version>/<tactic>/<tech>", "GET", f"/question/{version}/{tact_id}/{tech_id}"
+    )
+    if subs:
+        timed(
+            client,
+            results,
+            "GET /api/answers/ (technique)",
+            "GET",
+            "/api/answers/",
+            {"index": tech_id, "tactic": tact_id, "version": version},
+        )
+        sub_id = rng.choice(subs).split(".")[1]
+        timed(
+            client,
+            results,
+            "GET /question/<version>/<tactic>/<tech>/<sub>",
+            "GET",
+            f"/question/{version}/{tact_id}/{tech_id}/{sub_id}",
+        )
+
+
+def journey_mini_search(client, results, rng, version, data):
+    # typing a Technique name / ID into the quick-jump box - a request per keystroke, after the 2nd
+    _, tech_id, name = rng.choice(data["techniques"])
+    typed = rng.choice([name, tech_id])
+    for end in range(2, len(typed) + 1):
+        timed(
+            client,
+            results,
+            "POST /search/mini/<version>",
+            "POST",
+            f"/search/mini/{version}",
+            json_body={"search": typed[:end]},
+        )
+
+
+def journey_full_search(client, results, rng, version, data):
+    timed(client, results, "GET /search/page", "GET", "/search/page", {"version": version})
+    words = search_words(data["techniques"])
+    for _ in range(rng.randint(1, 3)):
+        params = {"version": version, "search": boolean_query(rng, words)}
+        if rng.random() < 0.3:
+            params["tactics"] = rng.sample(data["tactics"], min(2, len(data["tactics"])))
+        timed(client, results, "GET /search/full", "GET", "/search/full", params)
+
+
+def journey_answer_card_search(client, results, rng, version, data):
+    tact_id = rng.choice(data["tactics"])
+    words = search_words([t for t in data["techniques"] if t[0] == tact_id]) or search_words(data["techniques"])
+    timed(
+        client,
+        results,
+        "GET /search/answer_cards",
+        "GET",
+        "/search/answer_cards",
+        {"version": version, "index": tact_id, "search": rng.choice(words)},
+    )
+
+
+def journey_cart(client, results, rng, version, data):
+    # cart of a few entries -> CoOccurrence suggestions + sorting it for the report
+    entries = rng.sample(data["techniques"], min(rng.randint(2, 8), len(data["techniques"])))
+    cart = {"version": version, "entries": [{"index": tech_id, "tactic": tact_id} for tact_id, tech_id, _ in entries]}
+
+    timed(client, results, "GET /suggestions/<version>", "GET", f"/suggestions/{version}")
+    timed(
+        client,
+        results,
+        "GET /api/cooccurrences",
+        "GET",
+        "/api/cooccurrences",
+        {"version": version, "tech_ids": [tech_id for _, tech_id, _ in entries]},
+    )
+    timed(client, results, "POST /api/sort_cart", "POST", "/api/sort_cart", json_body=cart)
+
+
+JOURNEYS = {
+    "question_tree": journey_question_tree,
+    "mini_search": journey_mini_search,
+    "full_search": journey_full_search,
+    "answer_card_search": journey_answer_card_search,
+    "cart": journey_cart,
+}
+
+
+def run_user(base_url, insecure, credentials, results, scenario_data, deadline, seed, think_time):
+    rng = random.Random(seed)
+    client = Client(base_url, insecure)
+
+    if credentials:
+        t0 = time.perf_counter()
+        try:
+            client.login(*credentials)
+        except Exception as ex:
+            results.record("POST /login", time.perf_counter() - t0, False)
+            print(f"A user failed to log in - due to:\n{ex}")
+            return
+        results.record("POST /login", time.perf_counter() - t0, True)
+
+    # start page gives the session its CSRF token (needed by POST routes) - / only redirects here
+    version = rng.choice(list(scenario_data.keys()))
+    status, body = timed(client, results, "GET /question/<version>", "GET", f"/question/{version}")
+    client.read_csrf_token(body)
+
+    names = list(JOURNEY_WEIGHTS.keys())
+    weights = [JOURNEY_WEIGHTS[name] for name in names]
+    while time.monotonic() < deadline:
+        version = rng.choice(list(scenario_data.keys()))
+        JOURNEYS[rng.choices(names, weights)[0]](client, results, rng, version, scenario_data[version])
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def summarize(results, elapsed):
+    routes = {}
+    for route, latencies in sorted(results.latencies.items()):
+        latencies = sorted(latencies)
+        routes[route] = dict(
+            requests=len(latencies),
+            errors=results.errors[route],
+            rps=round(len(latencies) / elapsed, 2),
+            mean_ms=round(1000 * sum(latencies) / len(latencies), 2),
+            **{f"p{pct}_ms": round(1000 * percentile(latencies, pct), 2) for pct in PERCENTILES},
+            max_ms=round(1000 * latencies[-1], 2),
+        )
+    total = sum(r["requests"] for r in routes.values())
+    return dict(
+        elapsed_seconds=round(elapsed, 2),
+        requests=total,
+        errors=sum(r["errors"] for r in routes.values()),
+        rps=round(total / elapsed, 2),
+        routes=routes,
+    )
+
+
+def print_summary(summary):
+    header = f"{'route':<50}{'reqs':>8}{'errs':>6}{'rps':>9}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(header)
+    print("-" * len(header))
+    for route, r in summary["routes"].items():
+        print(
+            f"{route:<50}{r['requests']:>8}{r['errors']:>6}{r['rps']:>9}"
+            + "".join(f"{r[f'p{p}_ms']:>10}" for p in PERCENTILES)
+        )
+    print("-" * len(header))
+    print(
+        f"Total: {summary['requests']} requests ({summary['errors']} errors) "
+        f"in {summary['elapsed_seconds']}s - {summary['rps']} requests/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        "Load-tests a running Decider by replaying weighted user journeys (built from its installed versions' IDs)."
+    )
+    parser.add_argument("--url", default="http://localhost", help="Base URL of the instance to test.")
+    parser.add_argument("--users", type=int, default=8, help="Number of concurrent simulated users.")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run for.")
+    parser.add_argument("--versions", nargs="*", help="ATT&CK versions to browse (defaults to all installed).")
+    parser.add_argument("--think-time", type=float, default=0, help="Mean seconds a user pauses between journeys.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the users' random choices (for repeatable runs).")
+    parser.add_argument("--insecure", action="store_true", help="Skip HTTPS certificate verification.")
+    parser.add_argument("--email", help="Log each user in as this user (needed unless the instance is in kiosk mode).")
+    parser.add_argument("--password", help="Password of --email.")
+    parser.add_argument("--output", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    if (args.email is None) != (args.password is None):
+        print("--email and --password are given together. Exiting.")
+        sys.exit(1)
+    credentials = (args.email, args.password) if args.email else None
+
+    try:
+        client = Client(args.url, args.insecure)
+        if credentials:
+            client.login(*credentials)
+        scenario_data = load_scenario_data(client, args.versions)
+    except Exception as ex:
+        print(f"Failed to read the installed versions' Tactics / Techniques from {args.url} - due to:\n{ex}")
+        sys.exit(1)
+
+    print(f"Testing {args.url} with {args.users} users for {args.duration}s - versions: {', '.join(scenario_data)}")
+    print("\n------------------------------------------------\n")
+
+    results = Results()
+    t0 = time.monotonic()
+    deadline = t0 + args.duration
+    users = [
+        threading.Thread(
+            target=run_user,
+            args=(
+                args.url,
+                args.insecure,
+                credentials,
+                results,
+                scenario_data,
+                deadline,
+                args.seed + n,
+                args.think_time,
+            ),
+            daemon=True,
+        )
+        for n in range(args.users)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+
+    summary = summarize(results, time.monotonic() - t0)
+    print_summary(summary)
+
+    if args.output:
+        summary.update(
+            url=args.url,
+            users=args.users,
+            think_time=args.think_time,
+            seed=args.seed,
+            versions=list(scenario_data),
+            journey_weights=JOURNEY_WEIGHTS,
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            machine=dict(node=platform.node(), python=platform.python_version(), cpus=os.cpu_count()),
+        )
+        with open(args.output, "w") as fhandle:
+            json.dump(summary, fhandle, indent=4)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import copy
+import json
+import logging
+import queue
+import time
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line - request fields are those set by decider.py's record_factory"""
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "user_email", "route_title"):
+            value = getattr(record, field, "")
+            if value:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class ThreadQueueHandler(QueueHandler):
+    # the listener is a thread of this process, so records aren't pickled - only the message is merged now, as its
+    # args could change before the listener gets to it - formatting / tracebacks happen there
+    # (merged into a copy, as QueueHandler.prepare does - other handlers / filters still see the original record)
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LogQueue:
+    """Moves the root logger's handlers behind a queue - records are written by a background thread
+
+    - logging calls on the request path only build the record and enqueue it
+    - the listener thread doesn't survive a fork: stop() before forking (flushes), start() in each forked process
+    """
+
+    def __init__(self):
+        self.handlers = []
+        self.handler = None
+        self.listener = None
+
+    def install(self, root=None):
+        root = root or logging.getLogger()
+        self.handlers = list(root.handlers)
+        self.handler = ThreadQueueHandler(queue.SimpleQueue())
+        for handler in self.handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        self.start()
+        atexit.register(self.stop)  # writes out what's still queued
+
+    def start(self):
+        # a fresh queue each time - one inherited through a fork may hold records, or a lock, of the parent
+        self.handler.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
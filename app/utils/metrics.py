@@ -0,0 +1,223 @@
+from collections import Counter
+import json
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# upper bounds (seconds) of the request latency histogram buckets - +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def worker_rss():
+    # current resident memory (bytes) of this process - peak RSS where /proc isn't available, None on Windows
+    try:
+        with open("/proc/self/statm", "r") as fhandle:
+            return int(fhandle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Metrics:
+    """Request metrics of this process, shared with the other (uWSGI worker) processes through a file store
+
+    - each process keeps its own counts in memory and writes them to store_dir/<pid>.json, at most every
+      flush_interval seconds - the exposition (render()) sums the files of all processes
+    - counts of exited workers are kept (counters stay monotonic), their RSS gauge is dropped
+    - collectors are functions returning totals of this process, read at flush: {metric name: {label: value}}
+      (see COLLECTED_METRICS, label "" for none)
+    """
+
+    def __init__(self, store_dir, flush_interval=5.0):
+        self.store_dir = store_dir
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+        self.collectors = []
+        self.requests = Counter()  # (endpoint, method, status) -> requests
+        self.latency = {}  # endpoint -> [count per bucket (+Inf last), sum of seconds]
+        self.db_seconds = Counter()  # endpoint -> seconds
+        self.db_queries = Counter()  # endpoint -> statements
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def observe(self, endpoint, method, status, seconds, db_seconds=0.0, db_queries=0):
+        with self.lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            buckets, _ = self.latency.setdefault(endpoint, [[0] * (len(LATENCY_BUCKETS) + 1), 0.0])
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self.latency[endpoint][1] += seconds
+            self.db_seconds[endpoint] += db_seconds
+            self.db_queries[endpoint] += db_queries
+
+    def snapshot(self):
+        # this process' totals, in the (JSON) form written to the store
+        with self.lock:
+            snapshot = dict(
+                pid=os.getpid(),
+                requests=[[*key, n] for key, n in self.requests.items()],
+                latency=[[endpoint, list(buckets), total] for endpoint, (buckets, total) in self.latency.items()],
+                db=[[endpoint, self.db_seconds[endpoint], self.db_queries[endpoint]] for endpoint in self.db_seconds],
+            )
+        collected = {}
+        for collector in self.collectors:
+            for name, values in collector().items():
+                collected.setdefault(name, {}).update(values)
+        snapshot["collected"] = collected
+        snapshot["rss"] = worker_rss()
+        return snapshot
+
+    def flush(self, force=False):
+        # (over)writes this process' file - atomically, so readers never see a partial one
+        now = time.monotonic()
+        if not (force or (now - self.last_flush >= self.flush_interval)):
+            return
+        self.last_flush = now
+
+        path = os.path.join(self.store_dir, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "w") as fhandle:
+            json.dump(self.snapshot(), fhandle)
+        os.replace(f"{path}.tmp", path)
+
+    def snapshots(self):
+        # every process' last written totals, from the store only
+        snapshots = {}
+        for file_name in os.listdir(self.store_dir):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.store_dir, file_name), "r") as fhandle:
+                    snapshot = json.load(fhandle)
+            except (OSError, ValueError):
+                continue
+            snapshots.setdefault(snapshot["pid"], snapshot)
+        return list(snapshots.values())
+
+    def render(self):
+        """Prometheus text exposition of all processes' metrics"""
+        # write this process' file first and sum the files alone - mixing its live counts with the others' files
+        # would let the next scrape (served by another worker) see this one's older file: counters going backwards
+        self.flush(force=True)
+
+        requests = Counter()
+        latency = {}
+        db_seconds = Counter()
+        db_queries = Counter()
+        collected = {}
+        rss = {}
+
+        for snapshot in self.snapshots():
+            for endpoint, method, status, n in snapshot["requests"]:
+                requests[(endpoint, method, status)] += n
+            for endpoint, buckets, total in snapshot["latency"]:
+                merged = latency.setdefault(endpoint, [[0] * len(buckets), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+                merged[1] += total
+            for endpoint, seconds, queries in snapshot["db"]:
+                db_seconds[endpoint] += seconds
+                db_queries[endpoint] += queries
+            for name, values in snapshot["collected"].items():
+                for label, value in values.items():
+                    collected.setdefault(name, Counter())[label] += value
+            if (snapshot["rss"] is not None) and ((snapshot["pid"] == os.getpid()) or pid_alive(snapshot["pid"])):
+                rss[snapshot["pid"]] = snapshot["rss"]
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels)
+                lines.append(f"{name}{suffix}{{{label_text}}} {value}" if labels else f"{name}{suffix} {value}")
+
+        metric(
+            "decider_requests_total",
+            "counter",
+            "Requests handled, by endpoint, method and status code.",
+            [("", [("endpoint", e), ("method", m), ("status", s)], n) for (e, m, s), n in sorted(requests.items())],
+        )
+
+        histogram = []
+        for endpoint, (buckets, total) in sorted(latency.items()):
+            cumulative = 0
+            for bound, n in zip([*LATENCY_BUCKETS, "+Inf"], buckets):
+                cumulative += n
+                histogram.append(("_bucket", [("endpoint", endpoint), ("le", str(bound))], cumulative))
+            histogram.append(("_sum", [("endpoint", endpoint)], round(total, 6)))
+            histogram.append(("_count", [("endpoint", endpoint)], cumulative))
+        metric("decider_request_duration_seconds", "histogram", "Request latency, by endpoint.", histogram)
+
+        metric(
+            "decider_request_db_seconds_total",
+            "counter",
+            "Time spent running SQL statements in requests, by endpoint.",
+            [("", [("endpoint", e)], round(seconds, 6)) for e, seconds in sorted(db_seconds.items())],
+        )
+        metric(
+            "decider_request_db_queries_total",
+            "counter",
+            "SQL statements run in requests, by endpoint.",
+            [("", [("endpoint", e)], n) for e, n in sorted(db_queries.items())],
+        )
+
+        for name, values in sorted(collected.items()):
+            kind, help_text, label_name = COLLECTED_METRICS.get(name, ("counter", name, None))
+            metric(
+                name,
+                kind,
+                help_text,
+                [
+                    ("", [(label_name, label)] if label else [], round(value, 6))
+                    for label, value in sorted(values.items())
+                ],
+            )
+
+        metric(
+            "decider_worker_rss_bytes",
+            "gauge",
+            "Resident memory of each live process.",
+            [("", [("pid", str(pid))], n) for pid, n in sorted(rss.items())],
+        )
+
+        return "\n".join(lines) + "\n"
+
+
+# metrics gathered by collectors: name -> (type, help, name of the label the collector keys its values by / None)
+COLLECTED_METRICS = {
+    "decider_cache_hits_total": ("counter", "Cache hits, by cache.", "cache"),
+    "decider_cache_misses_total": ("counter", "Cache misses, by cache.", "cache"),
+    "decider_db_pool_checkouts_total": ("counter", "DB connections checked out of the pool.", None),
+    "decider_db_pool_wait_seconds_total": ("counter", "Time spent checking out DB connections.", None),
+    "decider_db_pool_timeouts_total": ("counter", "DB connection checkouts that timed out.", None),
+    "decider_db_pool_connects_total": ("counter", "DB connections opened.", None),
+    "decider_db_pool_invalidations_total": ("counter", "DB connections dropped as broken.", None),
+}
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
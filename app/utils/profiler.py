@@ -0,0 +1,89 @@
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # optional - only needed for sampling profiles (flame graph HTML)
+    SamplingProfiler = None
+
+import atexit
+import cProfile
+import os
+import pstats
+import threading
+import time
+
+
+class RequestProfiler:
+    """Profiles single requests on demand, and keeps per-endpoint aggregates over time windows
+
+    - cProfile (deterministic) -> out_dir/<request_id>.prof, for pstats / snakeviz
+    - pyinstrument (sampling, when installed) -> out_dir/<request_id>.html, a flame graph
+    - cProfile runs are also added to their endpoint's aggregate, written to out_dir/aggregate/ as each window ends
+      (and at process exit)
+    - one profile at a time per process (cProfile can't run on concurrent threads) - others run unprofiled
+    """
+
+    def __init__(self, out_dir, window=300):
+        self.out_dir = out_dir
+        self.window = window
+        self.busy = threading.Lock()
+        self.lock = threading.Lock()
+        self.window_start = time.time()
+        self.aggregates = {}  # endpoint -> pstats.Stats
+        os.makedirs(os.path.join(out_dir, "aggregate"), exist_ok=True)
+
+        # the last window of a process has no later request to write it - so it's written at exit
+        atexit.register(self.flush_at_exit)
+
+    def start(self, sampling=False):
+        # the started profiler, or None if another request is being profiled
+        if not self.busy.acquire(blocking=False):
+            return None
+        try:
+            profiler = SamplingProfiler() if (sampling and SamplingProfiler is not None) else cProfile.Profile()
+            if isinstance(profiler, cProfile.Profile):
+                profiler.enable()
+            else:
+                profiler.start()
+            return profiler
+        except Exception:
+            self.busy.release()
+            raise
+
+    def stop(self, profiler, request_id, endpoint):
+        # writes the profile, returns its path
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+                path = os.path.join(self.out_dir, f"{request_id}.prof")
+                profiler.dump_stats(path)
+                self.aggregate(endpoint, profiler)
+            else:
+                profiler.stop()
+                path = os.path.join(self.out_dir, f"{request_id}.html")
+                with open(path, "w") as fhandle:
+                    fhandle.write(profiler.output_html())
+            return path
+        finally:
+            self.busy.release()
+
+    def aggregate(self, endpoint, profiler):
+        with self.lock:
+            if time.time() - self.window_start >= self.window:
+                self.flush_aggregates()
+
+            if endpoint in self.aggregates:
+                self.aggregates[endpoint].add(profiler)
+            else:
+                self.aggregates[endpoint] = pstats.Stats(profiler)
+
+    def flush_aggregates(self):
+        # aggregate/<window start>_<pid>_<endpoint>.prof per endpoint profiled in the window - then a new one starts
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.window_start))
+        for endpoint, stats in self.aggregates.items():
+            stats.dump_stats(os.path.join(self.out_dir, "aggregate", f"{stamp}_{os.getpid()}_{endpoint}.prof"))
+        self.aggregates = {}
+        self.window_start = time.time()
+
+    def flush_at_exit(self):
+        with self.lock:
+            if self.aggregates:
+                self.flush_aggregates()
@@ -1,9 +1,11 @@
-from flask import Flask, session, redirect, request, g, jsonify, has_app_context
+from flask import Flask, session, redirect, request, g, jsonify, has_app_context, send_from_directory
 from flask.globals import current_app
 from flask.helpers import url_for
+from werkzeug.security import safe_join
 from flask.templating import render_template
 from flask_login import LoginManager, current_user
 from flask_wtf.csrf import CSRFProtect
+from flask.signals import request_started
 from flask_principal import (
     Principal,
     identity_loaded,
@@ -13,35 +15,51 @@ from flask_principal import (
 
 from sqlalchemy_utils.types.encrypted.encrypted_type import InvalidCiphertextError
 
-from sqlalchemy.exc import OperationalError as SQLAlchOperationalError
+from sqlalchemy.exc import OperationalError as SQLAlchOperationalError, DBAPIError as SQLAlchDBAPIError
 from psycopg2 import OperationalError as psycopgOperationalError
 from app.routes.utils import ErrorDuringRoute, ErrorDuringHTMLRoute
 
 from app.models import AttackVersion, db, User
 
-from app.routes.auth import auth_
+from app.routes.auth import auth_, admin_permission, public_route
 from app.routes.profile import profile_
 from app.routes.question import question_
-from app.routes.search import search_
+from app.routes.search import search_, mini_search
 from app.routes.utils_db import VersionPicker
 from app.routes.edit import edit_
 from app.routes.docs import docs_
 from app.routes.admin import admin_
-from app.routes.api import api_
-from app.routes.misc import misc_
+from app.routes.api import api_, answers_minisearch_json
+from app.routes.misc import misc_, sort_cart
 
 from app.utils.db.util import get_config_option_map
+import app.utils.db.read as db_read
+from app.utils.build_static import load_manifest
+from app.utils.compression import CompressionMiddleware
+from app.utils.db.engine import engine_options, register_pool_events, POOL_STATS
+from app.utils.db.query_counter import register_query_events, start_count, stop_count
+from app.utils.db.slow_queries import SlowQueryLog
+from app.utils.metrics import Metrics, PROMETHEUS_CONTENT_TYPE
+from app.utils.profiler import RequestProfiler
+from app.utils.json_provider import FastJSONProvider
+from app.utils.log_pipeline import JSONFormatter, LogQueue
 
 import string
 import random
 import argparse
+import atexit
 import logging.config
 import os
 from datetime import timedelta
+import shutil
 import sys
+import tempfile
 import importlib
+import ipaddress
 import json
+import mimetypes
 import traceback
+import time
 
 from app.version import DECIDER_APP_VERSION
 
@@ -81,6 +99,7 @@ old_factory = logging.getLogRecordFactory()
 def record_factory(*args, **kwargs):
     record = old_factory(*args, **kwargs)
     record.request_id_email = ""  # start empty unless conditions met
+    record.request_id = record.user_email = record.route_title = ""
 
     # must be in app
     if not has_app_context():
@@ -91,13 +110,28 @@ def record_factory(*args, **kwargs):
     if not flask_request_id:
         return record
 
+    # identify email or anon - looked up again only when the user changes (login / logout partway into a request)
+    user_id = current_user.get_id()
+    cached_user = g.get("log_user_email")
+    if (cached_user is None) or (cached_user[0] != user_id):
+        email = current_user.email if current_user.is_authenticated else "AnonymousUser"
+        cached_user = g.log_user_email = (user_id, email)
+    user_email = cached_user[1]
+
     # if a route defines a route title, use it in logs as such "{before fields} - {route title}: {message}"
     route_title = g.get("route_title", "")
-    route_title = f"{route_title}: " if route_title else ""
 
-    # identify email or anon, add field to record
-    user_email = current_user.email if current_user.is_authenticated else "AnonymousUser"
-    record.request_id_email = f"{flask_request_id} ({user_email}) - {route_title}"
+    # field is rebuilt only when the route title (set once, partway into a route) or user changes
+    cached = g.get("log_request_id_email")
+    if (cached is None) or (cached[0] != (route_title, user_email)):
+        route_title_text = f"{route_title}: " if route_title else ""
+        cached = g.log_request_id_email = (
+            (route_title, user_email),
+            f"{flask_request_id} ({user_email}) - {route_title_text}",
+        )
+
+    record.request_id_email = cached[1]
+    record.request_id, record.user_email, record.route_title = flask_request_id, user_email, route_title
     return record
 
 
@@ -113,11 +147,31 @@ def make_request_id():
 
 logger = logging.getLogger(__name__)
 
+# handlers of the root logger, moved behind a queue by logging_setup()
+log_queue = LogQueue()
+
+
+def logging_setup(app):
+    """Applies LOG_JSON / LOG_ASYNC to the handlers from config/logging.json
+
+    - LOG_JSON: handlers write one JSON object per line (app.utils.log_pipeline.JSONFormatter)
+    - LOG_ASYNC: handlers are written to by a background thread, so requests only enqueue records
+    """
+
+    root = logging.getLogger()
+    if app.config.get("LOG_JSON"):
+        for handler in root.handlers:
+            handler.setFormatter(JSONFormatter())
+
+    if app.config.get("LOG_ASYNC") and (log_queue.handler is None):
+        log_queue.install(root)
+
 
 def app_setup(config):
     """Creates the Flask app instance itself - sets / loads configuration"""
 
     app = Flask(__name__, template_folder="./app/templates", static_folder="./app/static")
+    app.json = FastJSONProvider(app)
     app.url_map.strict_slashes = False
     app.secret_key = os.urandom(24)
     app.config.from_object(config)
@@ -130,6 +184,11 @@ def security_setup(app):
     csrf = CSRFProtect()
     csrf.init_app(app)
 
+    # read-only POSTs, exempt so that pre-rendered kiosk pages (static export) - holding no live token - can use them
+    if app.config.get("KIOSK_MODE"):
+        csrf.exempt(sort_cart)
+        csrf.exempt(mini_search)
+
     login_manager = LoginManager()
     login_manager.login_view = "auth_.login"
     login_manager.init_app(app)
@@ -140,6 +199,91 @@ def security_setup(app):
         return User.query.filter_by(session_token=session_token).first()
 
 
+def db_setup(app):
+    """Connects the app to the DB - pooling / connection limits come from the config's DB_* settings
+
+    - see app/utils/db/engine.py, SQLALCHEMY_ENGINE_OPTIONS set by a config still take precedence
+    - pool statistics are logged every DB_POOL_STATS_INTERVAL seconds (checked as requests end)
+    """
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    db.init_app(app)
+    with app.app_context():
+        register_pool_events(db.engine, app.config)
+
+    interval = app.config.get("DB_POOL_STATS_INTERVAL")
+    if not interval:
+        return
+    last_logged = [time.monotonic()]
+
+    @app.teardown_request
+    def log_pool_stats(ex):
+        now = time.monotonic()
+        if now - last_logged[0] >= interval:
+            last_logged[0] = now
+            logger.info(f"DB pool stats: {POOL_STATS.snapshot(db.engine.pool)}")
+
+
+def query_counting_setup(app):
+    """Counts the SQL statements (and DB time) of each request - logged under the request's ID
+
+    - DEBUG: every request's count / time
+    - WARNING: requests over QUERY_BUDGET statements, or repeating one QUERY_REPEAT_LIMIT+ times (likely an N+1)
+    - counting starts on request_started, so the statements of every before_request (e.g. identity loading) count
+    """
+
+    if not app.config.get("QUERY_COUNTING"):
+        return
+
+    with app.app_context():
+        register_query_events(db.engine)
+
+    @request_started.connect_via(app)
+    def start_query_count(sender, **extra):
+        g.query_count = start_count()
+
+    @app.teardown_request
+    def log_query_count(ex):
+        count = g.pop("query_count", None)
+        if count is None:
+            return
+        stop_count(count)
+
+        summary = f"{request.method} {request.path} ran {count.count} SQL statements in {count.seconds * 1000:.1f}ms"
+        repeated = count.repeated(app.config["QUERY_REPEAT_LIMIT"])
+        if repeated:
+            statement, n = repeated[0]
+            logger.warning(f"{summary} - possible N+1, ran {n}x: {' '.join(statement.split())[:300]}")
+        elif count.count > app.config["QUERY_BUDGET"]:
+            logger.warning(f"{summary} - over the budget of {app.config['QUERY_BUDGET']}")
+        else:
+            logger.debug(summary)
+
+
+def slow_query_setup(app):
+    """Opt-in (SLOW_QUERY_LOG) log of statements slower than SLOW_QUERY_THRESHOLD seconds
+
+    - each entry has the statement, its parameters, and the request ID / route it ran in
+    - SLOW_QUERY_EXPLAIN_SAMPLE of the slow reads are EXPLAINed (ANALYZE, BUFFERS) in the background, plan logged
+    """
+
+    if not app.config.get("SLOW_QUERY_LOG"):
+        return
+
+    slow_query_log = SlowQueryLog(
+        app.config["SLOW_QUERY_LOG"],
+        app.config["SLOW_QUERY_THRESHOLD"],
+        explain_sample=app.config["SLOW_QUERY_EXPLAIN_SAMPLE"],
+        explain_timeout=app.config["SLOW_QUERY_EXPLAIN_TIMEOUT"],
+    )
+    with app.app_context():
+        slow_query_log.register(db.engine)
+    app.extensions["slow_query_log"] = slow_query_log
+
+
 def register_blueprints(app):
     """Register application blueprints"""
     app.register_blueprint(auth_)
@@ -273,6 +417,239 @@ def context_setup(app):
         return dict(frontend_conf=FRONTEND_CONF)
 
 
+def static_assets_setup(app):
+    """Serves static assets fingerprinted by app.utils.build_static
+
+    - templates resolve assets via static_url("js/decider.js") -> /static/js/decider.<hash>.js
+    - assets without a hashed copy (or when the build step wasn't run) keep their plain URL
+    - hashed assets are cached far-future + immutable, as a change to them changes their URL
+    - .br / .gz variants are sent when present and accepted by the client
+    """
+
+    manifest = load_manifest(app.static_folder)
+    hashed = set(manifest.values())
+
+    def static_url(filename):
+        return url_for("static", filename=manifest.get(filename, filename))
+
+    app.add_template_global(static_url)
+
+    def send_static(filename):
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        for encoding, ext in (("br", ".br"), ("gzip", ".gz")):
+            variant = safe_join(app.static_folder, filename + ext)
+            if request.accept_encodings[encoding] and (variant is not None) and os.path.isfile(variant):
+                response = send_from_directory(app.static_folder, filename + ext, mimetype=mimetype)
+                response.content_encoding = encoding
+                break
+        else:
+            response = send_from_directory(app.static_folder, filename)
+        response.vary.add("Accept-Encoding")
+
+        if filename in hashed:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = 365 * 24 * 60 * 60
+            response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = send_static
+
+
+def compression_setup(app):
+    """Compresses responses (gzip / br) per Accept-Encoding, for those of at least COMPRESS_MIN_SIZE bytes"""
+
+    if app.config.get("COMPRESS_RESPONSES"):
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app,
+            min_size=app.config["COMPRESS_MIN_SIZE"],
+            cache_bytes=app.config["COMPRESS_CACHE_BYTES"],
+        )
+
+
+def metrics_setup(app):
+    """Collects request / DB / cache / memory metrics - served in Prometheus text format at METRICS_PATH
+
+    - summed across uWSGI workers through per-process files in METRICS_DIR (see app/utils/metrics.py)
+    - METRICS_DIR defaults to a temporary folder made here - in the master, so all forked workers share it
+      (set it explicitly under lazy-apps, where each worker runs this)
+    - only addresses / networks in METRICS_ALLOWED_IPS, or logged-in admins, get metrics - others get a 404
+    """
+
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    store_dir = app.config.get("METRICS_DIR")
+    if store_dir:
+        # a restart starts counting over - as Prometheus expects of a restarted target
+        os.makedirs(store_dir, exist_ok=True)
+        for file_name in os.listdir(store_dir):
+            if file_name.endswith((".json", ".tmp")):
+                os.remove(os.path.join(store_dir, file_name))
+    else:
+        store_dir = tempfile.mkdtemp(prefix="decider-metrics-")
+
+        # removed on exit of the process that made it (the uWSGI master) - not of the workers sharing it
+        owner_pid = os.getpid()
+
+        def remove_store_dir():
+            if os.getpid() == owner_pid:
+                shutil.rmtree(store_dir, ignore_errors=True)
+
+        atexit.register(remove_store_dir)
+
+    metrics = Metrics(store_dir, flush_interval=app.config["METRICS_FLUSH_INTERVAL"])
+    app.extensions["metrics"] = metrics
+
+    def cache_metrics():
+        minisearch = answers_minisearch_json.cache_info()
+        hits = {"answers_minisearch": minisearch.hits}
+        misses = {"answers_minisearch": minisearch.misses}
+        if isinstance(app.wsgi_app, CompressionMiddleware) and (app.wsgi_app.cache is not None):
+            hits["compressed_bodies"] = app.wsgi_app.cache.hits
+            misses["compressed_bodies"] = app.wsgi_app.cache.misses
+        return {"decider_cache_hits_total": hits, "decider_cache_misses_total": misses}
+
+    def pool_metrics():
+        stats = POOL_STATS.snapshot()
+        return {
+            "decider_db_pool_checkouts_total": {"": stats["checkouts"]},
+            "decider_db_pool_wait_seconds_total": {"": stats["wait_seconds"]},
+            "decider_db_pool_timeouts_total": {"": stats["timeouts"]},
+            "decider_db_pool_connects_total": {"": stats["connects"]},
+            "decider_db_pool_invalidations_total": {"": stats["invalidations"]},
+        }
+
+    metrics.add_collector(cache_metrics)
+    metrics.add_collector(pool_metrics)
+
+    @request_started.connect_via(app)
+    def start_request_timer(sender, **extra):
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        start = g.get("request_start")
+        if start is None:
+            return response
+
+        count = g.get("query_count")
+        metrics.observe(
+            request.endpoint or "none",
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            db_seconds=count.seconds if count is not None else 0.0,
+            db_queries=count.count if count is not None else 0,
+        )
+        try:
+            metrics.flush()
+        except OSError:
+            logger.exception(f"Failed to write metrics to {store_dir}")
+        return response
+
+    allowed_networks = [ipaddress.ip_network(net, strict=False) for net in app.config["METRICS_ALLOWED_IPS"]]
+
+    @public_route
+    def metrics_page():
+        address = ipaddress.ip_address(request.remote_addr) if request.remote_addr else None
+        allowed = (address is not None) and any(address in network for network in allowed_networks)
+        if not (allowed or (current_user.is_authenticated and admin_permission.can())):
+            logger.warning("Metrics requested by a disallowed client - sending 404 page")
+            return render_template("status_codes/404.html"), 404
+
+        response = app.response_class(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+        response.cache_control.no_store = True
+        return response
+
+    app.add_url_rule(app.config["METRICS_PATH"], "metrics", metrics_page, methods=["GET"])
+
+
+def profiling_setup(app):
+    """Development / staging only (PROFILING_ENABLED) - profiles the requests asking for it
+
+    - asked for by the PROFILE_HEADER header or PROFILE_QUERY_ARG query arg: "1" (cProfile) / "sampling" (pyinstrument)
+    - profiles go to PROFILE_DIR named by request ID, which is sent back in the X-Decider-Profile-Id header
+    - cProfile runs are also aggregated per endpoint over PROFILE_WINDOW seconds (see app/utils/profiler.py)
+    """
+
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+
+    request_profiler = RequestProfiler(app.config["PROFILE_DIR"], window=app.config["PROFILE_WINDOW"])
+
+    @request_started.connect_via(app)
+    def start_profile(sender, **extra):
+        mode = request.headers.get(app.config["PROFILE_HEADER"]) or request.args.get(app.config["PROFILE_QUERY_ARG"])
+        if mode:
+            g.profiler = request_profiler.start(sampling=(mode == "sampling"))
+            if g.profiler is None:
+                logger.info("Another request is being profiled - running this one unprofiled")
+
+    def stop_profile():
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return None
+        request_id = g.get("request_id", make_request_id())
+        path = request_profiler.stop(profiler, request_id, request.endpoint or "none")
+        logger.info(f"Profiled {request.method} {request.path} to {path}")
+        return request_id
+
+    @app.after_request
+    def save_profile(response):
+        request_id = stop_profile()
+        if request_id is not None:
+            response.headers["X-Decider-Profile-Id"] = request_id
+        return response
+
+    # in case after_request was never reached
+    @app.teardown_request
+    def save_unfinished_profile(ex):
+        stop_profile()
+
+
+def prefork_setup(app):
+    """Prepares the app for uWSGI's pre-forked (lazy-apps = false) multi-process deployment
+
+    - caches are warmed once here, in the master, so workers share them copy-on-write
+    - the master's DB connections are closed before forking, and each worker drops (w/o closing) the pool it
+      inherited - so no connection is ever shared between processes
+    - the async log writer (LOG_ASYNC) is stopped before forking, and each worker starts its own
+    - does nothing outside of uWSGI (uwsgidecorators is only importable under it)
+    """
+
+    try:
+        from uwsgidecorators import postfork
+    except ImportError:
+        return
+
+    if app.config.get("WARM_CACHES") and app.config.get("KIOSK_MODE"):
+        try:
+            with app.test_request_context():
+                for version in db_read.attack.versions():
+                    answers_minisearch_json(("start", "", version))
+            logger.info("Warmed caches before fork")
+        except Exception:
+            logger.exception("Failed to warm caches before fork - workers will fill them on demand")
+
+    with app.app_context():
+        db.engine.dispose()
+
+    # the log writing thread isn't carried over a fork - flushed here, started anew in each worker
+    if log_queue.listener is not None:
+        log_queue.stop()
+
+    @postfork
+    def dispose_inherited_pool():
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+    @postfork
+    def start_log_writer():
+        if log_queue.handler is not None:
+            log_queue.start()
+
+
 def error_handlers(app):
     """
     Register handlers for errors / exceptions produced during the operation of the Flask app
@@ -293,9 +670,26 @@ def error_handlers(app):
         Error Wrapper           Response to Use
         ErrorDuringHTMLRoute -> HTTP Code Template
         ErrorDuringAJAXRoute -> jsonify(message=""), code
+
+        A GET that lost its DB connection (e.g. Postgres restarted) is run once more, on a fresh connection
         """
         base_ex = wrap_ex.__cause__
 
+        # Dropped DB connection - the pool was invalidated, so an idempotent request can be safely retried
+        if (
+            isinstance(base_ex, SQLAlchDBAPIError)
+            and base_ex.connection_invalidated
+            and (request.method in ("GET", "HEAD"))
+            and (not g.get("db_retried"))
+        ):
+            g.db_retried = True
+            logger.warning("Database connection was dropped - retrying the request")
+            db.session.rollback()
+            try:
+                return current_app.dispatch_request()
+            except ErrorDuringRoute as retry_ex:
+                wrap_ex, base_ex = retry_ex, retry_ex.__cause__
+
         # DB Issue
         if isinstance(base_ex, (psycopgOperationalError, SQLAlchOperationalError)):
             logger.exception("Database error occurred")
@@ -376,14 +770,22 @@ def error_handlers(app):
 def create_app(config):
     logger.debug("Creating the App.")
     app = app_setup(config)
+    logging_setup(app)
 
     Principal(app)
     security_setup(app)
-    db.init_app(app)
+    db_setup(app)
+    query_counting_setup(app)
+    slow_query_setup(app)
     register_blueprints(app)
     set_mode(app)
     context_setup(app)
+    static_assets_setup(app)
+    compression_setup(app)
+    metrics_setup(app)
+    profiling_setup(app)
     error_handlers(app)
+    prefork_setup(app)
 
     return app
 
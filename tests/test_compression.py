@@ -0,0 +1,83 @@
+from flask import Flask, Response, request
+
+from app.utils.compression import CompressionMiddleware
+
+import gzip
+import json
+
+import pytest
+
+BIG_BODY = json.dumps({"answers": [{"id": f"T{i:04d}", "content": "some answer text"} for i in range(100)]}).encode()
+SMALL_BODY = b'{"id": "T1234"}'
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/big")
+    def big():
+        response = Response(BIG_BODY, mimetype="application/json")
+        response.set_etag("big-etag")
+        return response.make_conditional(request)
+
+    @app.route("/small")
+    def small():
+        return Response(SMALL_BODY, mimetype="application/json")
+
+    @app.route("/no-transform")
+    def no_transform():
+        response = Response(BIG_BODY, mimetype="application/json")
+        response.cache_control.no_transform = True
+        return response
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=1024)
+    return app.test_client()
+
+
+def get(client, path, **headers):
+    return client.get(path, headers={"Accept-Encoding": "gzip", **headers})
+
+
+def test_compressed_content_length(client):
+    response = get(client, "/big")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert int(response.headers["Content-Length"]) == len(response.data) < len(BIG_BODY)
+    assert gzip.decompress(response.data) == BIG_BODY
+
+
+def test_vary_accept_encoding(client):
+    assert "Accept-Encoding" in get(client, "/big").headers["Vary"]
+    assert "Accept-Encoding" in get(client, "/small").headers["Vary"]
+    assert "Accept-Encoding" in client.get("/big").headers["Vary"]
+
+
+def test_etag_weakened_and_revalidates(client):
+    etag = get(client, "/big").headers["ETag"]
+    assert etag == 'W/"big-etag"'
+
+    response = get(client, "/big", **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.data == b""
+
+
+def test_uncompressed_without_accept_encoding(client):
+    response = client.get("/big")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"big-etag"'
+    assert response.data == BIG_BODY
+
+
+def test_small_body_passes_through(client):
+    response = get(client, "/small")
+    assert "Content-Encoding" not in response.headers
+    assert int(response.headers["Content-Length"]) == len(SMALL_BODY)
+    assert response.data == SMALL_BODY
+
+
+def test_no_transform_passes_through(client):
+    response = get(client, "/no-transform")
+    assert "Content-Encoding" not in response.headers
+    assert int(response.headers["Content-Length"]) == len(BIG_BODY)
+    assert response.data == BIG_BODY